@@ -2,15 +2,28 @@
 from flask import Flask
 from flask_cors import cross_origin
 from .config import Config
-from .extensions import db, migrate, jwt, cors, limiter, mail
+from .extensions import db, jwt, cors, limiter, mail
+from .utils.codec import FastJSONProvider
+from .utils.startup import running_cli
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.json = FastJSONProvider(app)
+
+    # Trust X-Forwarded-For from our load balancer so per-IP limits see real clients
+    if app.config.get("PROXY_FIX_X_FOR"):
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["PROXY_FIX_X_FOR"])
+
+    # CLI-only parts (Flask-Migrate pulls in alembic) are skipped by web workers
+    cli = running_cli()
 
     # Initialize extensions
     db.init_app(app)
-    migrate.init_app(app, db)
+    if cli:
+        from flask_migrate import Migrate
+        Migrate(app, db)
     jwt.init_app(app)
     cors.init_app(app, 
                   origins=["http://localhost:3000", "http://localhost:5173"],
@@ -20,29 +33,81 @@ def create_app():
     mail.init_app(app)
 
     # Import models (important for migrations)
-    from app.models import User, Category, Product, RefreshToken
+    from app.models import User, Category, Product, RefreshToken, Tag, Color
+
 
+    # Opt-in request/DB/cache metrics, served at /metrics
+    if app.config.get("METRICS_ENABLED"):
+        from .utils.metrics import init_metrics
+        init_metrics(app)
+
+    # Opt-in SQL profiling: N+1 detection and slow-query log
+    if app.config.get("SQL_PROFILER_ENABLED"):
+        from .utils.profiler import init_profiler
+        init_profiler(app)
+
+    # Register JWT callbacks
+    register_jwt_callbacks()
 
     # Register blueprints
     register_blueprints(app)
 
     # Register CLI commands
-    register_commands(app)
+    if cli:
+        register_commands(app)
+    else:
+        # Background refresh-token purge, if configured (web workers and `flask run`);
+        # a preloaded gunicorn master runs the only one
+        from .services.token_service import schedule_token_purge
+        schedule_token_purge(app)
 
     return app
 
 
 def register_blueprints(app):
     """Register all blueprints"""
-    from .blueprints.v1 import auth, products, categories
+    from .blueprints.v1 import auth, products, categories, cache
     app.register_blueprint(auth.bp, url_prefix="/api/v1/auth")
     app.register_blueprint(products.bp, url_prefix="/api/v1/products")
     app.register_blueprint(categories.bp, url_prefix="/api/v1/categories")
+    app.register_blueprint(cache.bp, url_prefix="/api/v1/cache")
+
+    if app.config.get("METRICS_ENABLED"):
+        from .blueprints import metrics
+        app.register_blueprint(metrics.bp)
+
+
+def register_jwt_callbacks():
+    """Check every verified token against the blocklist and the user's cached active/credential state"""
+    from flask import jsonify
+    from .services.user_status_service import UserStatusService
+    from .services.blocklist_service import get_blocklist
+
+    @jwt.token_in_blocklist_loader
+    def check_blocklist(jwt_header, jwt_data):
+        return get_blocklist().is_revoked(jwt_data['jti'])
+
+    @jwt.revoked_token_loader
+    def revoked_token(jwt_header, jwt_data):
+        return jsonify({"error": "Token has been revoked"}), 401
+
+    @jwt.user_lookup_loader
+    def load_user_status(jwt_header, jwt_data):
+        return UserStatusService.check(jwt_data)
+
+    @jwt.user_lookup_error_loader
+    def user_status_error(jwt_header, jwt_data):
+        return jsonify({"error": "User is inactive or credentials have changed"}), 401
 
 
 def register_commands(app):
     """Register CLI commands"""
-    from .seed import init_db, seed_data
+    from .seed import init_db, seed_data, reindex_search
+    from .cli import import_products, export_products, purge_tokens
     
     app.cli.add_command(init_db)
-    app.cli.add_command(seed_data)
\ No newline at end of file
+    app.cli.add_command(seed_data)
+    app.cli.add_command(reindex_search)
+    app.cli.add_command(import_products)
+    app.cli.add_command(export_products)
+    app.cli.add_command(purge_tokens)
@@ -0,0 +1,21 @@
+# app/blueprints/metrics.py
+import hmac
+from flask import Blueprint, Response, current_app, jsonify, request
+from app.extensions import limiter
+from app.utils.metrics import get_metrics
+
+bp = Blueprint("metrics", __name__)
+
+@bp.route("/metrics", methods=["GET"])
+@limiter.exempt
+def get_metrics_text():
+    metrics = get_metrics()
+    if metrics is None:
+        return jsonify({"error": "Metrics are disabled"}), 404
+
+    # Scrapers authenticate with a static bearer token when METRICS_TOKEN is set
+    token = current_app.config.get("METRICS_TOKEN")
+    if token and not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return jsonify({"error": "Unauthorized"}), 401
+
+    return Response(metrics.registry.render(), mimetype="text/plain; version=0.0.4")
@@ -1,10 +1,14 @@
 # app/blueprints/v1/auth.py - FIXED VERSION
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask import Blueprint, current_app, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt, get_current_user
 from pydantic import ValidationError
 from app.services.auth_service import AuthService
 from app.schemas.auth_schemas import RegisterSchema, LoginSchema, ChangePasswordSchema, ForgotPasswordSchema, ResetPasswordSchema
 from app.extensions import limiter
+from app.utils.codec import parse_body, validation_failed
+from app.utils.decorators import role_required
+from app.utils.passwords import PasswordHasherBusy
+from app.services.mail_service import MailQueueFull
 
 bp = Blueprint("auth", __name__)
 
@@ -12,14 +16,18 @@ bp = Blueprint("auth", __name__)
 @limiter.limit("5 per minute")
 def forgot_password():
     try:
-        data = ForgotPasswordSchema(**request.json)
+        data = parse_body(ForgotPasswordSchema)
         AuthService.forgot_password(data.email)
         return jsonify({"message": "Password reset email sent if user exists"}), 200
     except ValidationError as e:
-        return jsonify({"error": "Validation failed", "details": e.errors()}), 400
+        return validation_failed(e)
     except ValueError as e:
         # For security, do not reveal if user exists
         return jsonify({"message": "Password reset email sent if user exists"}), 200
+    except MailQueueFull:
+        # Same answer as for unknown emails; a 503 here would tell callers which addresses are registered
+        current_app.logger.warning("Mail queue full, dropped a password reset email")
+        return jsonify({"message": "Password reset email sent if user exists"}), 200
     except Exception as e:
         return jsonify({"error": "Failed to send reset email"}), 500
 
@@ -28,13 +36,15 @@ def forgot_password():
 @limiter.limit("5 per minute")
 def reset_password():
     try:
-        data = ResetPasswordSchema(**request.json)
+        data = parse_body(ResetPasswordSchema)
         AuthService.reset_password(data.token, data.new_password)
         return jsonify({"message": "Password has been reset successfully"}), 200
     except ValidationError as e:
-        return jsonify({"error": "Validation failed", "details": e.errors()}), 400
+        return validation_failed(e)
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
+    except PasswordHasherBusy as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
     except Exception as e:
         return jsonify({"error": "Failed to reset password"}), 500
 from app.models.user import User
@@ -46,7 +56,7 @@ from app.extensions import limiter
 @limiter.limit("5 per minute")
 def register():
     try:
-        data = RegisterSchema(**request.json)
+        data = parse_body(RegisterSchema)
         
         user = AuthService.register_user(
             name=data.name,
@@ -60,9 +70,11 @@ def register():
         }), 201
         
     except ValidationError as e:
-        return jsonify({"error": "Validation failed", "details": e.errors()}), 400
+        return validation_failed(e)
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
+    except PasswordHasherBusy as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
     except Exception as e:
         return jsonify({"error": "Registration failed"}), 500
 
@@ -70,7 +82,7 @@ def register():
 @limiter.limit("10 per minute")
 def login():
     try:
-        data = LoginSchema(**request.json)
+        data = parse_body(LoginSchema)
         
         user = AuthService.authenticate(data.email, data.password)
         access_token, refresh_token = AuthService.create_tokens(user)
@@ -83,9 +95,11 @@ def login():
         }), 200
         
     except ValidationError as e:
-        return jsonify({"error": "Validation failed", "details": e.errors()}), 400
+        return validation_failed(e)
     except ValueError as e:
         return jsonify({"error": str(e)}), 401
+    except PasswordHasherBusy as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
     except Exception as e:
         return jsonify({"error": "Login failed"}), 500
 
@@ -94,32 +108,45 @@ def login():
 def refresh():
     try:
         user_id_str = get_jwt_identity()  # This will be a string
-        access_token = AuthService.refresh_access_token(user_id_str)
+        access_token = AuthService.refresh_access_token(user_id_str, get_jwt()["jti"])
         
         return jsonify({
             "access_token": access_token
         }), 200
         
+    except PermissionError as e:
+        return jsonify({"error": str(e)}), 401
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
         return jsonify({"error": "Token refresh failed"}), 500
 
+@bp.route("/logout", methods=["POST"])
+@jwt_required(verify_type=False)
+def logout():
+    try:
+        # Either token type may be presented; a refresh token in the body is revoked too
+        data = request.get_json(silent=True) or {}
+        AuthService.logout(get_jwt(), refresh_token=data.get("refresh_token"))
+        
+        return jsonify({"message": "Logged out successfully"}), 200
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Logout failed"}), 500
+
 @bp.route("/me", methods=["GET"])
 @jwt_required()
 def get_profile():
     try:
-        user_id_str = get_jwt_identity()  # This will be a string
-        claims = get_jwt()
+        # Loaded (and checked active) from the user status cache by jwt_required
+        status = get_current_user()
         
-        # FIXED: Convert string ID back to int for database query
-        user_id = int(user_id_str)
-        user = User.query.get(user_id)
-        
-        if not user or not user.is_active:
+        if not status or not status['user']['is_active']:
             return jsonify({"error": "User not found"}), 404
         
-        return jsonify({"user": user.to_dict()}), 200
+        return jsonify({"user": status['user']}), 200
         
     except ValueError:
         return jsonify({"error": "Invalid user ID"}), 400
@@ -130,7 +157,7 @@ def get_profile():
 @jwt_required()
 def change_password():
     try:
-        data = ChangePasswordSchema(**request.json)
+        data = parse_body(ChangePasswordSchema)
         user_id_str = get_jwt_identity()  # This will be a string
         
         AuthService.change_password(
@@ -142,8 +169,21 @@ def change_password():
         return jsonify({"message": "Password changed successfully"}), 200
         
     except ValidationError as e:
-        return jsonify({"error": "Validation failed", "details": e.errors()}), 400
+        return validation_failed(e)
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
+    except PasswordHasherBusy as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
+    except Exception as e:
+        return jsonify({"error": "Password change failed"}), 500
+
+@bp.route("/users/<int:user_id>/deactivate", methods=["POST"])
+@role_required("Admin")
+def deactivate_user(user_id):
+    try:
+        AuthService.deactivate_user(user_id)
+        return jsonify({"message": "User deactivated successfully"}), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
     except Exception as e:
-        return jsonify({"error": "Password change failed"}), 500
\ No newline at end of file
+        return jsonify({"error": "User deactivation failed"}), 500
\ No newline at end of file
@@ -0,0 +1,25 @@
+# app/blueprints/v1/cache.py
+from flask import Blueprint, jsonify
+from app.services.cache_service import get_cache
+from app.utils.jwt_cache import get_token_cache
+from app.services.blocklist_service import get_blocklist
+from app.utils.decorators import role_required
+
+bp = Blueprint("cache", __name__)
+
+@bp.route("/stats", methods=["GET"])
+@role_required("Admin")
+def get_cache_stats():
+    # Counters are per worker process
+    token_cache = get_token_cache()
+    return jsonify({
+        "cache": get_cache().stats(),
+        "tokens": token_cache.stats() if token_cache else None,
+        "blocklist": get_blocklist().stats()
+    }), 200
+
+@bp.route("/", methods=["DELETE"])
+@role_required("Admin")
+def clear_cache():
+    get_cache().clear()
+    return jsonify({"message": "Cache cleared"}), 200
@@ -4,18 +4,20 @@ from flask_jwt_extended import jwt_required
 from pydantic import ValidationError
 from app.services.category_service import CategoryService
 from app.schemas.category_schemas import CategoryCreateSchema, CategoryUpdateSchema
-from app.utils.decorators import role_required
+from app.utils.codec import parse_body, validation_failed
+from app.utils.decorators import role_required, conditional
 
 bp = Blueprint("categories", __name__)
 
 @bp.route("/", methods=["GET"])
 @jwt_required()
+@conditional(lambda: CategoryService.get_validators())
 def get_categories():
     try:
-        categories = CategoryService.get_all_categories()
+        categories = CategoryService.list_categories_data()
         
         return jsonify({
-            "categories": [category.to_dict() for category in categories]
+            "categories": categories
         }), 200
         
     except Exception as e:
@@ -23,14 +25,15 @@ def get_categories():
 
 @bp.route("/<int:category_id>", methods=["GET"])
 @jwt_required()
+@conditional(lambda category_id: CategoryService.get_validators())
 def get_category(category_id):
     try:
-        category = CategoryService.get_category_by_id(category_id)
+        category = CategoryService.get_category_data(category_id)
         
         if not category:
             return jsonify({"error": "Category not found"}), 404
         
-        return jsonify({"category": category.to_dict()}), 200
+        return jsonify({"category": category}), 200
         
     except Exception as e:
         return jsonify({"error": "Failed to fetch category"}), 500
@@ -40,7 +43,7 @@ def get_category(category_id):
 def create_category():
     try:
         # Validate input data
-        data = CategoryCreateSchema(**request.json)
+        data = parse_body(CategoryCreateSchema)
         
         # Create category
         category = CategoryService.create_category(name=data.name)
@@ -51,7 +54,7 @@ def create_category():
         }), 201
         
     except ValidationError as e:
-        return jsonify({"error": "Validation failed", "details": e.errors()}), 400
+        return validation_failed(e)
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
@@ -62,7 +65,7 @@ def create_category():
 def update_category(category_id):
     try:
         # Validate input data
-        data = CategoryUpdateSchema(**request.json)
+        data = parse_body(CategoryUpdateSchema)
         
         # Update category
         category = CategoryService.update_category(
@@ -76,7 +79,7 @@ def update_category(category_id):
         }), 200
         
     except ValidationError as e:
-        return jsonify({"error": "Validation failed", "details": e.errors()}), 400
+        return validation_failed(e)
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
@@ -85,8 +88,13 @@ def update_category(category_id):
 @bp.route("/<int:category_id>", methods=["DELETE"])
 @role_required("Admin")
 def delete_category(category_id):
+    # Optional ?chunk_size=N commits the product cascade in batches for very large categories
+    chunk_size = request.args.get('chunk_size', type=int)
+    if 'chunk_size' in request.args and (chunk_size is None or chunk_size < 1):
+        return jsonify({"error": "chunk_size must be a positive integer"}), 400
+
     try:
-        CategoryService.delete_category(category_id)
+        CategoryService.delete_category(category_id, chunk_size=chunk_size)
         
         return jsonify({"message": "Category deleted successfully"}), 200
         
@@ -1,44 +1,67 @@
 # app/blueprints/v1/products.py
-from flask import Blueprint, request, jsonify
+import io
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from pydantic import ValidationError
 from app.services.product_service import ProductService
-from app.schemas.product_schemas import ProductCreateSchema, ProductUpdateSchema
-from app.utils.decorators import role_required
+from app.services.import_service import ProductImportService, PARSERS
+from app.services.export_service import ProductExportService, ENCODERS, CONTENT_TYPES, parse_updated_since
+from app.schemas.product_schemas import ProductCreateSchema, ProductUpdateSchema, ProductBulkSchema
+from app.utils.codec import parse_body, validation_failed
+from app.utils.decorators import role_required, conditional
+from app.utils.streaming import stream_json_list
 
 bp = Blueprint("products", __name__)
 
 @bp.route("/", methods=["GET"])
 @jwt_required()
+@conditional(lambda: ProductService.get_list_validators())
 def get_products():
     try:
         category = request.args.get('category')
         search = request.args.get('search')
-        
-        if category:
-            products = ProductService.get_products_by_category(category)
-        elif search:
-            products = ProductService.search_products(search)
-        else:
-            products = ProductService.get_all_products()
-        
-        return jsonify({
-            "products": [product.to_dict() for product in products]
-        }), 200
-        
+        cursor = request.args.get('cursor')
+        limit = request.args.get('limit', type=int)
+        if 'limit' in request.args and limit is None:
+            raise ValueError("limit must be a positive integer")
+        tags = request.args.getlist('tag')
+        colors = request.args.getlist('color')
+
+        # Streaming mode: the whole result, serialized row by row in bounded batches
+        if request.args.get('stream', '').lower() in ('1', 'true'):
+            if cursor is not None or limit is not None:
+                raise ValueError("stream cannot be combined with cursor or limit")
+            products = ProductService.iter_products(category=category, search=search, tags=tags, colors=colors)
+            return Response(
+                stream_with_context(stream_json_list("products", products, lambda product: product.to_dict())),
+                mimetype="application/json"
+            )
+
+        return jsonify(ProductService.list_products_data(
+            category=category,
+            search=search,
+            cursor=cursor,
+            limit=limit,
+            tags=tags,
+            colors=colors
+        )), 200
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Failed to fetch products"}), 500
 
 @bp.route("/<int:product_id>", methods=["GET"])
 @jwt_required()
+@conditional(lambda product_id: ProductService.get_product_validators(product_id))
 def get_product(product_id):
     try:
-        product = ProductService.get_product_by_id(product_id)
+        product = ProductService.get_product_data(product_id)
         
         if not product:
             return jsonify({"error": "Product not found"}), 404
         
-        return jsonify({"product": product.to_dict()}), 200
+        return jsonify({"product": product}), 200
         
     except Exception as e:
         return jsonify({"error": "Failed to fetch product"}), 500
@@ -48,7 +71,7 @@ def get_product(product_id):
 def create_product():
     try:
         # Validate input data
-        data = ProductCreateSchema(**request.json)
+        data = parse_body(ProductCreateSchema)
         user_id = get_jwt_identity()
         
         # Create product
@@ -67,18 +90,116 @@ def create_product():
         }), 201
         
     except ValidationError as e:
-        return jsonify({"error": "Validation failed", "details": e.errors()}), 400
+        return validation_failed(e)
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Product creation failed"}), 500
 
+@bp.route("/export", methods=["GET"])
+@role_required("Admin")
+def export_products():
+    try:
+        fmt = request.args.get('format', 'ndjson')
+        if fmt not in ENCODERS:
+            return jsonify({"error": f"Unsupported format '{fmt}'", "formats": sorted(ENCODERS)}), 400
+        compress = request.args.get('gzip', '').lower() in ('1', 'true')
+
+        chunks = ProductExportService.export(
+            fmt,
+            category_name=request.args.get('category'),
+            updated_since=parse_updated_since(request.args.get('updated_since')),
+            compress=compress
+        )
+
+        filename = f"products.{fmt}.gz" if compress else f"products.{fmt}"
+        return Response(
+            stream_with_context(chunks),
+            mimetype="application/gzip" if compress else CONTENT_TYPES[fmt],
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Product export failed"}), 500
+
+@bp.route("/import", methods=["POST"])
+@role_required("Admin")
+def import_products():
+    try:
+        # Either a multipart upload in "file" or the raw request body
+        upload = request.files.get('file')
+        if upload is not None:
+            stream, filename, content_type = upload.stream, upload.filename or '', upload.mimetype
+        else:
+            stream, filename, content_type = request.stream, '', request.mimetype
+
+        fmt = request.args.get('format')
+        if fmt is None:
+            fmt = 'csv' if filename.endswith('.csv') or content_type == 'text/csv' else 'ndjson'
+        if fmt not in PARSERS:
+            return jsonify({"error": f"Unsupported format '{fmt}'", "formats": sorted(PARSERS)}), 400
+
+        rows = PARSERS[fmt](io.TextIOWrapper(stream, encoding='utf-8', newline=''))
+        report = ProductImportService.import_products(rows, uploader_id=int(get_jwt_identity()))
+        if "aborted" in report:
+            # Batches before the failing line were committed; the report says where to resume
+            return jsonify({
+                "error": "Import stopped early",
+                "report": report
+            }), 500
+
+        return jsonify({
+            "message": "Import finished",
+            "report": report
+        }), 200
+
+    except UnicodeDecodeError:
+        return jsonify({"error": "Import file must be UTF-8 encoded"}), 400
+    except Exception as e:
+        return jsonify({"error": "Product import failed"}), 500
+
+@bp.route("/bulk", methods=["POST"])
+@role_required("Admin")
+def bulk_products():
+    try:
+        # Validate input data
+        data = parse_body(ProductBulkSchema)
+        filters = {
+            "ids": data.filter.ids,
+            "category_name": data.filter.category_name,
+            "tags": data.filter.tags,
+            "colors": data.filter.colors
+        }
+
+        if data.delete:
+            affected = ProductService.bulk_delete(**filters)
+            return jsonify({"message": "Products deleted successfully", "affected": affected}), 200
+
+        affected = ProductService.bulk_update(
+            **filters,
+            price=data.update.price,
+            price_change_percent=data.update.price_change_percent,
+            add_tags=data.update.add_tags,
+            remove_tags=data.update.remove_tags,
+            new_category_name=data.update.category_name
+        )
+        return jsonify({"message": "Products updated successfully", "affected": affected}), 200
+
+    except ValidationError as e:
+        return validation_failed(e)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Bulk product operation failed"}), 500
+
 @bp.route("/<int:product_id>", methods=["PUT"])
 @role_required("Admin")
 def update_product(product_id):
     try:
         # Validate input data
-        data = ProductUpdateSchema(**request.json)
+        data = parse_body(ProductUpdateSchema)
         
         # Update product
         product = ProductService.update_product(
@@ -96,7 +217,7 @@ def update_product(product_id):
         }), 200
         
     except ValidationError as e:
-        return jsonify({"error": "Validation failed", "details": e.errors()}), 400
+        return validation_failed(e)
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
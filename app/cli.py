@@ -0,0 +1,70 @@
+# app/cli.py
+import sys
+from flask.cli import with_appcontext
+import click
+from app.models.user import User
+from app.services.import_service import ProductImportService, PARSERS, DEFAULT_BATCH_SIZE
+from app.services.export_service import ProductExportService, ENCODERS, parse_updated_since
+from app.services.token_service import RefreshTokenService, DEFAULT_PURGE_BATCH_SIZE
+
+@click.command("import-products")
+@click.argument("source", type=click.File("r", encoding="utf-8"))
+@click.option("--format", "fmt", type=click.Choice(sorted(PARSERS)), default=None,
+              help="Input format (defaults to the file extension).")
+@click.option("--batch-size", default=DEFAULT_BATCH_SIZE, show_default=True,
+              help="Rows per insert batch and commit.")
+@click.option("--uploader-email", default="admin@gmail.com", show_default=True,
+              help="User recorded as the uploader of every imported product.")
+@with_appcontext
+def import_products(source, fmt, batch_size, uploader_email):
+    """Bulk import products from an NDJSON or CSV file ('-' for stdin)."""
+    fmt = fmt or ("csv" if source.name.endswith(".csv") else "ndjson")
+    uploader = User.query.filter_by(email=uploader_email, is_active=True).first()
+    if not uploader:
+        raise click.ClickException(f"No active user with email {uploader_email}")
+
+    report = ProductImportService.import_products(PARSERS[fmt](source), uploader.id, batch_size=batch_size)
+
+    for error in report["errors"]:
+        click.echo(f"line {error['line']}: {error['error']}", err=True)
+    click.echo(f"✅ Imported {report['imported']} of {report['total']} rows ({report['failed']} failed)")
+    if report["failed"]:
+        sys.exit(1)
+
+
+@click.command("export-products")
+@click.argument("output", type=click.File("wb"), default="-")
+@click.option("--format", "fmt", type=click.Choice(sorted(ENCODERS)), default=None,
+              help="Output format (defaults to the file extension, else ndjson).")
+@click.option("--category", default=None, help="Only export products in this category.")
+@click.option("--updated-since", default=None, help="Only export products updated at or after this ISO timestamp.")
+@click.option("--gzip", "compress", is_flag=True, default=None,
+              help="Gzip the output (implied by a .gz file name).")
+@click.option("--batch-size", default=DEFAULT_BATCH_SIZE, show_default=True,
+              help="Rows fetched from the server-side cursor at a time.")
+@with_appcontext
+def export_products(output, fmt, category, updated_since, compress, batch_size):
+    """Stream active products to an NDJSON or CSV file ('-' for stdout)."""
+    name = output.name if isinstance(output.name, str) else ""
+    if compress is None:
+        compress = name.endswith(".gz")
+    fmt = fmt or ("csv" if name.removesuffix(".gz").endswith(".csv") else "ndjson")
+    try:
+        updated_since = parse_updated_since(updated_since)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--updated-since")
+
+    for chunk in ProductExportService.export(fmt, category_name=category, updated_since=updated_since,
+                                             compress=compress, batch_size=batch_size):
+        output.write(chunk)
+    output.flush()
+
+
+@click.command("purge-tokens")
+@click.option("--batch-size", default=DEFAULT_PURGE_BATCH_SIZE, show_default=True,
+              help="Rows deleted per batch and commit.")
+@with_appcontext
+def purge_tokens(batch_size):
+    """Delete expired and revoked refresh tokens."""
+    purged = RefreshTokenService.purge(batch_size=batch_size)
+    click.echo(f"✅ Purged {purged} refresh tokens")
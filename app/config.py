@@ -1,5 +1,6 @@
 # app/config.py
 import os
+import tempfile
 from datetime import timedelta
 from dotenv import load_dotenv
 
@@ -21,12 +22,41 @@ class Config:
         'pool_recycle': 300,
     }
 
+    # Search (auto picks fts5 on SQLite, mysql FULLTEXT on MySQL, like elsewhere)
+    SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto")
+
+    # Cache (per-worker LRU plus an optional shared tier: redis://... or memory://)
+    CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_LOCAL_MAXSIZE = int(os.getenv("CACHE_LOCAL_MAXSIZE", 2048))
+    CACHE_LOCAL_TTL = float(os.getenv("CACHE_LOCAL_TTL", 5))
+    CACHE_SHARED_URL = os.getenv("CACHE_SHARED_URL", os.getenv("REDIS_URL", ""))
+    CACHE_SHARED_TTL = int(os.getenv("CACHE_SHARED_TTL", 300))
+
     # JWT
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "super-secret-jwt")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(seconds=int(os.getenv("ACCESS_TOKEN_EXPIRES", 900)))  # 15 minutes
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(seconds=int(os.getenv("REFRESH_TOKEN_EXPIRES", 2592000)))  # 30 days
     JWT_BLACKLIST_ENABLED = True
     JWT_BLACKLIST_TOKEN_CHECKS = ['access', 'refresh']
+    # Verified tokens remembered per worker (0 disables); user status is cached in the app cache
+    AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", 4096))
+    # Seconds between in-process purges of expired/revoked refresh tokens (0: run `flask purge-tokens` from cron)
+    TOKEN_PURGE_INTERVAL = int(os.getenv("TOKEN_PURGE_INTERVAL", 0))
+    TOKEN_PURGE_BATCH_SIZE = int(os.getenv("TOKEN_PURGE_BATCH_SIZE", 5000))
+    # Revoked token jtis (redis://... shared by all workers, or memory:// for one process),
+    # screened per worker by a Bloom filter resynced at most every BLOCKLIST_SYNC_INTERVAL seconds
+    BLOCKLIST_URL = os.getenv("BLOCKLIST_URL", os.getenv("REDIS_URL", "memory://"))
+    BLOCKLIST_BLOOM_CAPACITY = int(os.getenv("BLOCKLIST_BLOOM_CAPACITY", 100000))
+    BLOCKLIST_BLOOM_ERROR_RATE = float(os.getenv("BLOCKLIST_BLOOM_ERROR_RATE", 0.001))
+    BLOCKLIST_SYNC_INTERVAL = float(os.getenv("BLOCKLIST_SYNC_INTERVAL", 1))
+
+    # Password hashing (Werkzeug method string; older hashes are upgraded on login)
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    # Worker processes per app process for hashing/verification (0 hashes inline)
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    # Jobs allowed to queue per app process before requests get a 503
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 32))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", 10))
 
     # CORS
     CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:5173").split(",")
@@ -38,10 +68,47 @@ class Config:
     MAIL_USERNAME = os.getenv("MAIL_USERNAME")
     MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
     MAIL_DEFAULT_SENDER = os.getenv("MAIL_DEFAULT_SENDER")
+    # Background delivery: bounded queue, sender threads holding SMTP connections open while busy
+    MAIL_ASYNC = os.getenv("MAIL_ASYNC", "true").lower() == "true"
+    MAIL_QUEUE_SIZE = int(os.getenv("MAIL_QUEUE_SIZE", 1000))
+    MAIL_WORKERS = int(os.getenv("MAIL_WORKERS", 2))
+    MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", 20))
+    MAIL_MAX_RETRIES = int(os.getenv("MAIL_MAX_RETRIES", 5))
+    MAIL_RETRY_BACKOFF = float(os.getenv("MAIL_RETRY_BACKOFF", 2))
+    MAIL_IDLE_TIMEOUT = float(os.getenv("MAIL_IDLE_TIMEOUT", 30))
 
     # Rate limiting
     RATELIMIT_DEFAULT = os.getenv("RATE_LIMIT_DEFAULT", "100 per hour")
-    RATELIMIT_STORAGE_URL = os.getenv("REDIS_URL", "memory://")
+    # Counters shared by all workers on the host via a local SQLite file (tmpfs works too);
+    # set RATELIMIT_STORAGE_URI=redis://... to share them across hosts instead
+    RATELIMIT_STORAGE_URI = os.getenv(
+        "RATELIMIT_STORAGE_URI", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'im-ratelimit.sqlite')}"
+    )
+    RATELIMIT_STRATEGY = os.getenv("RATELIMIT_STRATEGY", "sliding-window-counter")
+    # Let requests through rather than fail them if the counter store is unavailable
+    RATELIMIT_SWALLOW_ERRORS = os.getenv("RATELIMIT_SWALLOW_ERRORS", "true").lower() == "true"
+    # Number of trusted proxies in front of the app; the client IP is then read from X-Forwarded-For
+    PROXY_FIX_X_FOR = int(os.getenv("PROXY_FIX_X_FOR", 0))
+
+    # Metrics (Prometheus text format at /metrics)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+    # Bearer token scrapers must send; unset leaves /metrics open (keep it off the public ingress)
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+    # Directory where each worker process writes its snapshot so any worker can answer a scrape
+    # for all of them; empty reports only the answering process. Clear it when the server starts.
+    METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR", "")
+    METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", 5))
+
+    # SQL profiler (off by default): per-request statement counts, likely N+1s and slow queries
+    SQL_PROFILER_ENABLED = os.getenv("SQL_PROFILER_ENABLED", "false").lower() == "true"
+    # Share of requests profiled; keep it low in production
+    SQL_PROFILER_SAMPLE_RATE = float(os.getenv("SQL_PROFILER_SAMPLE_RATE", 1.0))
+    # Same statement this many times in one request is logged as a likely N+1
+    SQL_PROFILER_N_PLUS_ONE = int(os.getenv("SQL_PROFILER_N_PLUS_ONE", 5))
+    # Statements slower than this are logged (with parameter types, not values) even if unsampled
+    SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", 200))
+    # Add an X-SQL-Profile summary header to profiled responses
+    SQL_PROFILER_HEADER = os.getenv("SQL_PROFILER_HEADER", "false").lower() == "true"
 
 
 class DevelopmentConfig(Config):
@@ -1,14 +1,12 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
 from flask_mail import Mail
+from app.utils.jwt_cache import CachingJWTManager
+from app.utils.rate_limit import identity_or_ip
 
 db = SQLAlchemy()
-migrate = Migrate()
-jwt = JWTManager()
+jwt = CachingJWTManager()
 cors = CORS()
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=identity_or_ip)
 mail = Mail()
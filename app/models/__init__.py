@@ -3,5 +3,8 @@ from .user import User
 from .category import Category
 from .product import Product
 from .refresh_token import RefreshToken
+from .tag import Tag, ProductTag
+from .color import Color, ProductColor
+from .table_version import TableVersion
 
-__all__ = ["User", "Category", "Product", "RefreshToken"]
\ No newline at end of file
+__all__ = ["User", "Category", "Product", "RefreshToken", "Tag", "ProductTag", "Color", "ProductColor", "TableVersion"]
\ No newline at end of file
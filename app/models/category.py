@@ -1,6 +1,7 @@
 # app/models/category.py
 from datetime import datetime
 from app.extensions import db
+from app.models.indexes import lower_name_index
 
 class Category(db.Model):
     __tablename__ = "categories"
@@ -10,11 +11,21 @@ class Category(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
 
+    __table_args__ = (
+        db.Index('ix_categories_is_active_name', 'is_active', 'name'),
+        *lower_name_index('ix_categories_name_lower', name),
+    )
+
     # Relationship to products
     products = db.relationship('Product', back_populates='category', lazy='dynamic')
 
+    # Populated by CategoryService queries via with_expression(); None when not loaded
+    active_product_count = db.query_expression()
+
     @property
     def product_count(self):
+        if self.active_product_count is not None:
+            return self.active_product_count
         return self.products.filter_by(is_active=True).count()
 
     def to_dict(self):
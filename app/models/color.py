@@ -0,0 +1,34 @@
+# app/models/color.py
+from app.extensions import db
+from app.models.tag import resolve_named_rows
+
+class Color(db.Model):
+    __tablename__ = "colors"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), nullable=False, unique=True)
+
+    @staticmethod
+    def resolve(names):
+        """Return Color rows for names in order, creating any that don't exist yet"""
+        return resolve_named_rows(Color, names)
+
+    def __repr__(self):
+        return f"<Color {self.name}>"
+
+
+class ProductColor(db.Model):
+    __tablename__ = "product_colors"
+
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), primary_key=True)
+    color_id = db.Column(db.Integer, db.ForeignKey('colors.id'), primary_key=True)
+    position = db.Column(db.Integer, nullable=False, default=0)
+
+    color = db.relationship('Color', lazy='joined')
+
+    __table_args__ = (
+        db.Index('ix_product_colors_color_id_product_id', 'color_id', 'product_id'),
+    )
+
+    def __repr__(self):
+        return f"<ProductColor product_id={self.product_id} color_id={self.color_id}>"
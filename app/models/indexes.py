@@ -0,0 +1,28 @@
+# app/models/indexes.py
+from app.extensions import db
+
+
+def supports_functional_indexes(dialect):
+    """MySQL gained functional key parts in 8.0.13; MariaDB has none"""
+    if dialect.name == 'mysql':
+        if getattr(dialect, 'is_mariadb', False):
+            return False
+        return (dialect.server_version_info or (0,)) >= (8, 0, 13)
+    return True
+
+
+def lower_name_index(name, column):
+    """
+    Index lower(column) for the case-insensitive duplicate checks in the services.
+
+    Backends without functional indexes get a plain index on the column under
+    the same name instead, which their case-insensitive collations can use.
+    """
+    return (
+        db.Index(name, db.func.lower(column), info={'functional': True}).ddl_if(
+            callable_=lambda ddl, target, bind, **kw: supports_functional_indexes(kw['dialect'])
+        ),
+        db.Index(name, column, info={'functional': False}).ddl_if(
+            callable_=lambda ddl, target, bind, **kw: not supports_functional_indexes(kw['dialect'])
+        ),
+    )
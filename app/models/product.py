@@ -1,7 +1,9 @@
 # app/models/product.py
 from datetime import datetime
 from app.extensions import db
-import json
+from app.models.tag import Tag, ProductTag
+from app.models.color import Color, ProductColor
+from app.models.indexes import lower_name_index
 
 class Product(db.Model):
     __tablename__ = "products"
@@ -9,37 +11,58 @@ class Product(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     price = db.Column(db.Numeric(10, 2), nullable=False)
-    colors_json = db.Column(db.Text)  # Store colors as JSON string
-    tags_json = db.Column(db.Text)    # Store tags as JSON string
     rating_rate = db.Column(db.Float, default=0.0)
     rating_count = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
+    # Bumped by every UPDATE (ORM or set-based); the ETag and cache version, since
+    # updated_at only has second precision on MySQL
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1',
+                        onupdate=db.literal_column('version + 1'))
 
     # Foreign keys
     category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False)
     uploader_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
 
+    __table_args__ = (
+        # Newest-first listing, overall and per category (keyset on created_at, id)
+        db.Index('ix_products_is_active_created_at', 'is_active', 'created_at'),
+        db.Index('ix_products_category_id_is_active_created_at', 'category_id', 'is_active', 'created_at'),
+        db.Index('ix_products_uploader_id', 'uploader_id'),
+        *lower_name_index('ix_products_name_lower', name),
+    )
+
     # Relationships
     category = db.relationship('Category', back_populates='products')
     uploader = db.relationship('User', foreign_keys=[uploader_id], back_populates='uploaded_products')
+    # Selectin-loaded: one extra query per list, not per product
+    color_links = db.relationship('ProductColor', order_by=ProductColor.position,
+                                  cascade='all, delete-orphan', lazy='selectin')
+    tag_links = db.relationship('ProductTag', order_by=ProductTag.position,
+                                cascade='all, delete-orphan', lazy='selectin')
 
     @property
     def colors(self):
-        return json.loads(self.colors_json) if self.colors_json else []
+        return [link.color.name for link in self.color_links]
 
     @colors.setter
     def colors(self, value):
-        self.colors_json = json.dumps(value) if value else None
+        self.color_links = [
+            ProductColor(color=color, position=position)
+            for position, color in enumerate(Color.resolve(value or []))
+        ]
 
     @property
     def tags(self):
-        return json.loads(self.tags_json) if self.tags_json else []
+        return [link.tag.name for link in self.tag_links]
 
     @tags.setter
     def tags(self, value):
-        self.tags_json = json.dumps(value) if value else None
+        self.tag_links = [
+            ProductTag(tag=tag, position=position)
+            for position, tag in enumerate(Tag.resolve(value or []))
+        ]
 
     def to_dict(self):
         return {
@@ -1,5 +1,6 @@
 
 # app/models/refresh_token.py - FIXED VERSION
+import hashlib
 from datetime import datetime, timedelta
 from app.extensions import db
 
@@ -7,16 +8,20 @@ class RefreshToken(db.Model):
     __tablename__ = "refresh_tokens"
 
     id = db.Column(db.Integer, primary_key=True)
-    # FIXED: Use VARCHAR with specific length instead of TEXT for unique constraint
-    token = db.Column(db.String(500), unique=True, nullable=False, index=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    # sha256 of the token's jti; the JWT itself is never stored
+    token_hash = db.Column(db.CHAR(64), unique=True, nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    expires_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
     is_revoked = db.Column(db.Boolean, default=False)
 
     # Relationships
     user = db.relationship('User', backref=db.backref('refresh_tokens', lazy='dynamic'))
 
+    @staticmethod
+    def hash_token(jti):
+        return hashlib.sha256(jti.encode()).hexdigest()
+
     @property
     def is_expired(self):
         return datetime.utcnow() > self.expires_at
@@ -29,4 +34,4 @@ class RefreshToken(db.Model):
         self.is_revoked = True
 
     def __repr__(self):
-        return f"<RefreshToken user_id={self.user_id}>"
\ No newline at end of file
+        return f"<RefreshToken user_id={self.user_id}>"
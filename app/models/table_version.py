@@ -0,0 +1,87 @@
+# app/models/table_version.py
+import logging
+from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+# session.info key holding the table names the open transaction has changed
+PENDING_BUMPS = 'table_version_bumps'
+
+class TableVersion(db.Model):
+    """
+    Change counter per table, bumped after every service write commits so readers can validate cheaply.
+
+    Writers only mark tables in their session; the counters are incremented in
+    a short transaction of their own once the write has committed, so concurrent
+    writers don't queue on these few rows for the length of their transactions.
+    Readers can briefly see committed data under the previous version, which is
+    safe: entries cached under it stop being read once the bump lands.
+    """
+    __tablename__ = "table_versions"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    @staticmethod
+    def bump(*names):
+        """Mark the given tables changed; their versions move when the current transaction commits"""
+        db.session.info.setdefault(PENDING_BUMPS, set()).update(names)
+
+    @staticmethod
+    def apply(connection, names):
+        """Increment the versions of the given tables on a connection, creating missing rows"""
+        table = TableVersion.__table__
+        now = datetime.utcnow()
+        # A fixed order, so concurrent bumps of several tables can't deadlock
+        for name in sorted(names):
+            updated = connection.execute(
+                table.update().where(table.c.name == name).values(version=table.c.version + 1, updated_at=now)
+            ).rowcount
+            if not updated:
+                connection.execute(table.insert().values(name=name, version=1, updated_at=now))
+
+    @staticmethod
+    def current(*names):
+        """Return {name: (version, updated_at)} for the given tables in one query"""
+        rows = db.session.query(TableVersion.name, TableVersion.version, TableVersion.updated_at).filter(
+            TableVersion.name.in_(names)
+        ).all()
+        versions = {name: (0, None) for name in names}
+        versions.update({name: (version, updated_at) for name, version, updated_at in rows})
+        return versions
+
+    def __repr__(self):
+        return f"<TableVersion {self.name}={self.version}>"
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_bumps(session):
+    names = session.info.pop(PENDING_BUMPS, None)
+    if not names:
+        return
+    engine = session.get_bind(mapper=TableVersion.__mapper__)
+    for attempt in range(2):
+        try:
+            with engine.begin() as connection:
+                TableVersion.apply(connection, names)
+            return
+        except IntegrityError:
+            # Another writer created a missing row first; it exists on the retry
+            if attempt == 0:
+                continue
+        except Exception:
+            pass
+        # The write itself is committed; cached reads stay stale until the next bump or their TTL
+        logger.exception("Bumping table versions %s failed", sorted(names))
+        return
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_bumps(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_BUMPS, None)
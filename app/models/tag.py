@@ -0,0 +1,57 @@
+# app/models/tag.py
+from app.extensions import db
+
+class Tag(db.Model):
+    __tablename__ = "tags"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False, unique=True)
+
+    @staticmethod
+    def resolve(names):
+        """Return Tag rows for names in order, creating any that don't exist yet"""
+        return resolve_named_rows(Tag, names)
+
+    def __repr__(self):
+        return f"<Tag {self.name}>"
+
+
+class ProductTag(db.Model):
+    __tablename__ = "product_tags"
+
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), primary_key=True)
+    tag_id = db.Column(db.Integer, db.ForeignKey('tags.id'), primary_key=True)
+    position = db.Column(db.Integer, nullable=False, default=0)
+
+    # Loaded with the link so reading product.tags never issues a query per tag
+    tag = db.relationship('Tag', lazy='joined')
+
+    __table_args__ = (
+        db.Index('ix_product_tags_tag_id_product_id', 'tag_id', 'product_id'),
+    )
+
+    def __repr__(self):
+        return f"<ProductTag product_id={self.product_id} tag_id={self.tag_id}>"
+
+
+def resolve_named_rows(model, names):
+    """Look up name rows for a model in one query and add the missing ones to the session"""
+    unique_names = list(dict.fromkeys(name for name in names if name))
+    if not unique_names:
+        return []
+
+    # Key by lowercase so case-insensitive collations (MySQL) don't create duplicates
+    existing = {
+        row.name.lower(): row
+        for row in model.query.filter(model.name.in_(unique_names)).all()
+    }
+    rows = []
+    for name in unique_names:
+        row = existing.get(name.lower())
+        if row is None:
+            row = model(name=name)
+            db.session.add(row)
+            existing[name.lower()] = row
+        if row not in rows:
+            rows.append(row)
+    return rows
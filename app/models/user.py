@@ -1,6 +1,7 @@
+import hashlib
 from datetime import datetime
 from app.extensions import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.utils.passwords import get_password_hasher
 
 class User(db.Model):
     __tablename__ = "users"
@@ -17,10 +18,18 @@ class User(db.Model):
     uploaded_products = db.relationship('Product', foreign_keys='Product.uploader_id', back_populates='uploader', lazy='dynamic')
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = get_password_hasher().hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return get_password_hasher().verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return get_password_hasher().needs_rehash(self.password_hash)
+
+    @property
+    def credentials_stamp(self):
+        """Short digest of the password hash; changes whenever the password does"""
+        return hashlib.sha256(self.password_hash.encode()).hexdigest()[:16]
 
     def to_dict(self):
         return {
@@ -9,7 +9,7 @@ class RegisterSchema(BaseModel):
     password: str = Field(..., min_length=6, max_length=128, description="Password with minimum 6 characters")
     confirm_password: Optional[str] = Field(None, description="Password confirmation")
 
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "defer_build": True}
 
     @field_validator("password")
     @classmethod
@@ -27,7 +27,7 @@ class RegisterSchema(BaseModel):
 
 class ForgotPasswordSchema(BaseModel):
     email: EmailStr = Field(..., description="User email address")
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "defer_build": True}
 
 
 class ResetPasswordSchema(BaseModel):
@@ -35,7 +35,7 @@ class ResetPasswordSchema(BaseModel):
     new_password: str = Field(..., min_length=6, max_length=128, description="New password")
     confirm_new_password: Optional[str] = Field(None, description="New password confirmation")
 
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "defer_build": True}
 
     @field_validator("new_password")
     @classmethod
@@ -55,7 +55,7 @@ class LoginSchema(BaseModel):
     email: EmailStr = Field(..., description="User email address")
     password: str = Field(..., min_length=1, description="User password")
 
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "defer_build": True}
 
 
 class ChangePasswordSchema(BaseModel):
@@ -63,7 +63,7 @@ class ChangePasswordSchema(BaseModel):
     new_password: str = Field(..., min_length=6, max_length=128, description="New password")
     confirm_new_password: Optional[str] = Field(None, description="New password confirmation")
 
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "defer_build": True}
 
     @field_validator("new_password")
     @classmethod
@@ -87,4 +87,4 @@ class UserOutSchema(BaseModel):
     created_at: Optional[datetime] = None
     is_active: bool = True
 
-    model_config = {"extra": "forbid", "from_attributes": True}
\ No newline at end of file
+    model_config = {"extra": "forbid", "defer_build": True, "from_attributes": True}
\ No newline at end of file
@@ -6,13 +6,13 @@ from datetime import datetime
 class CategoryCreateSchema(BaseModel):
     name: str = Field(..., min_length=1, max_length=100, description="Category name")
 
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "defer_build": True}
 
 
 class CategoryUpdateSchema(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
 
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "defer_build": True}
 
 
 class CategoryOutSchema(BaseModel):
@@ -21,4 +21,4 @@ class CategoryOutSchema(BaseModel):
     productCount: int
     created_at: Optional[datetime] = None
 
-    model_config = {"extra": "forbid", "from_attributes": True}
\ No newline at end of file
+    model_config = {"extra": "forbid", "defer_build": True, "from_attributes": True}
\ No newline at end of file
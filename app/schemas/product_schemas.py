@@ -1,5 +1,5 @@
 # app/schemas/product_schemas.py
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import List, Optional
 from datetime import datetime
 import decimal
@@ -11,7 +11,7 @@ class ProductCreateSchema(BaseModel):
     tags: List[str] = Field(default_factory=list, description="Product tags")
     category_name: str = Field(..., min_length=1, description="Category name")
 
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "defer_build": True}
 
     @field_validator("colors")
     @classmethod
@@ -38,7 +38,7 @@ class ProductUpdateSchema(BaseModel):
     tags: Optional[List[str]] = None
     category_name: Optional[str] = Field(None, min_length=1)
 
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "defer_build": True}
 
     @field_validator("colors")
     @classmethod
@@ -71,4 +71,51 @@ class ProductOutSchema(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    model_config = {"extra": "forbid", "from_attributes": True}
\ No newline at end of file
+    model_config = {"extra": "forbid", "defer_build": True, "from_attributes": True}
+
+class ProductBulkFilterSchema(BaseModel):
+    ids: Optional[List[int]] = Field(None, min_length=1, description="Product IDs")
+    category_name: Optional[str] = Field(None, min_length=1)
+    tags: List[str] = Field(default_factory=list, description="Products must carry every tag")
+    colors: List[str] = Field(default_factory=list, description="Products must come in every color")
+
+    model_config = {"extra": "forbid", "defer_build": True}
+
+    @model_validator(mode="after")
+    def require_criterion(self):
+        if not (self.ids or self.category_name or self.tags or self.colors):
+            raise ValueError("At least one filter is required")
+        return self
+
+
+class ProductBulkChangesSchema(BaseModel):
+    price: Optional[float] = Field(None, gt=0, description="New price for every product")
+    price_change_percent: Optional[float] = Field(None, gt=-100, description="Relative price change, e.g. -10 for 10% off")
+    add_tags: List[str] = Field(default_factory=list)
+    remove_tags: List[str] = Field(default_factory=list)
+    category_name: Optional[str] = Field(None, min_length=1, description="Move products to this category")
+
+    model_config = {"extra": "forbid", "defer_build": True}
+
+    @model_validator(mode="after")
+    def validate_changes(self):
+        if self.price is not None and self.price_change_percent is not None:
+            raise ValueError("Use either price or price_change_percent, not both")
+        if not (self.price is not None or self.price_change_percent is not None
+                or self.add_tags or self.remove_tags or self.category_name):
+            raise ValueError("At least one change is required")
+        return self
+
+
+class ProductBulkSchema(BaseModel):
+    filter: ProductBulkFilterSchema
+    update: Optional[ProductBulkChangesSchema] = None
+    delete: bool = False
+
+    model_config = {"extra": "forbid", "defer_build": True}
+
+    @model_validator(mode="after")
+    def one_operation(self):
+        if self.delete == (self.update is not None):
+            raise ValueError("Provide exactly one of update or delete")
+        return self
@@ -1,11 +1,56 @@
 # app/seed.py
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import List, Optional, Tuple
 from flask.cli import with_appcontext
 import click
 from app.extensions import db
+from app.models.category import Category
+from app.models.product import Product
+from app.models.tag import Tag, ProductTag
+from app.models.color import Color, ProductColor
+from app.models.user import User
+from app.models.table_version import TableVersion
+from app.models.indexes import supports_functional_indexes
 from app.services.category_service import CategoryService
 from app.services.auth_service import AuthService
 from app.services.product_service import ProductService
-from app.services.auth_service import AuthService 
+from app.services.search_service import get_search_backend
+from app.services.cache_service import get_cache, PRODUCT_LISTS, CATEGORY_LISTS
+
+# Vocabulary for synthetic catalogs; names past these lists are numbered
+CATEGORY_NAMES = ["Mobiles", "Laptops", "Accessories", "Tablets", "Monitors", "Audio",
+                  "Cameras", "Wearables", "Gaming", "Networking", "Storage", "Printers"]
+BRANDS = ["Apple", "Samsung", "Sony", "Dell", "Lenovo", "Asus", "Acer", "LG", "Xiaomi",
+          "OnePlus", "Google", "Microsoft", "Logitech", "Canon", "Nikon", "HP"]
+MODEL_NAMES = ["Pro", "Max", "Air", "Ultra", "Mini", "Plus", "Lite", "Edge", "Neo", "Prime"]
+TAG_NAMES = BRANDS + ["Flagship", "Budget", "Premium", "Wireless", "Refurbished", "5G", "OLED",
+                      "Gaming", "Portable", "Noise Cancelling", "Camera", "Business", "Student"]
+# The colors ProductCreateSchema accepts
+COLOR_NAMES = ["Black", "White", "Yellow", "Green", "Blue", "Red", "Silver", "Gold",
+               "Deep Purple", "Lavender", "Cream", "Space Gray", "Starlight", "Midnight"]
+# Every generated user can log in with this
+SEED_USER_PASSWORD = "password123"
+DEFAULT_SEED_CHUNK_SIZE = 10000
+
+
+def parse_range(value: str) -> Tuple[int, int]:
+    """'1-4' -> (1, 4); '2' -> (2, 2)"""
+    low, _, high = value.partition("-")
+    low, high = int(low), int(high or low)
+    if low < 0 or high < low:
+        raise ValueError(f"Invalid range '{value}'")
+    return low, high
+
+
+def _range_option(ctx, param, value):
+    try:
+        return parse_range(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
 
 @click.command("init-db")
 @with_appcontext
@@ -20,18 +65,50 @@ def init_db():
     click.echo("✅ Database initialized successfully")
 
 @click.command("seed-data")
+@click.option("--products", default=0, show_default=True,
+              help="Synthetic products to generate on top of the default data.")
+@click.option("--categories", default=0, show_default=True,
+              help="Synthetic categories to add; products are spread over every active category.")
+@click.option("--users", default=0, show_default=True,
+              help=f"Synthetic users to add (password '{SEED_USER_PASSWORD}').")
+@click.option("--tags", "tag_vocabulary", default=200, show_default=True,
+              help="Distinct tags drawn from.")
+@click.option("--tags-per-product", default="0-3", show_default=True, callback=_range_option,
+              help="Extra tags per product besides its brand, as MIN-MAX.")
+@click.option("--tag-skew", default=1.0, show_default=True,
+              help="Zipf exponent for tag popularity (0 is uniform).")
+@click.option("--colors-per-product", default="1-4", show_default=True, callback=_range_option,
+              help="Colors per product, as MIN-MAX.")
+@click.option("--seed", "random_seed", default=None, type=int, help="Random seed, for a reproducible dataset.")
+@click.option("--chunk-size", default=DEFAULT_SEED_CHUNK_SIZE, show_default=True,
+              help="Rows generated, inserted and committed at a time.")
+@click.option("--defer-indexes/--keep-indexes", default=True, show_default=True,
+              help="Drop secondary indexes during the load and rebuild them afterwards.")
 @with_appcontext
-def seed_data():
-    """Seed default data."""
+def seed_data(products, categories, users, tag_vocabulary, tags_per_product, tag_skew,
+              colors_per_product, random_seed, chunk_size, defer_indexes):
+    """Seed default data, plus optional synthetic categories, users and products in bulk."""
     seed_default_data()
-    click.echo("✅ Default data seeded successfully")
+    if not (products or categories or users):
+        click.echo("✅ Default data seeded successfully")
+        return
+
+    report = seed_catalog(
+        products=products, categories=categories, users=users, tag_vocabulary=tag_vocabulary,
+        tags_per_product=tags_per_product, tag_skew=tag_skew, colors_per_product=colors_per_product,
+        random_seed=random_seed, chunk_size=chunk_size, defer_indexes=defer_indexes, echo=click.echo
+    )
+    click.echo(f"✅ Seeded {report['products']} products, {report['categories']} categories and "
+               f"{report['users']} users in {report['seconds']:.1f}s "
+               f"({report['products'] / max(report['seconds'], 1e-9) * 60:,.0f} products/min)")
 
-@click.command('seed-data')
+@click.command("reindex-search")
 @with_appcontext
-def seed_data():
-    """Seeds the database with initial data."""
-    CategoryService.seed_default_categories()
-    AuthService.create_admin_user() 
+def reindex_search():
+    """Rebuild the product search index from active products."""
+    backend = get_search_backend()
+    count = backend.rebuild()
+    click.echo(f"✅ Search index rebuilt ({backend.name}): {count} products")
 
 def seed_default_data():
     """Seed default categories, admin user, and sample products."""
@@ -97,4 +174,227 @@ def seed_sample_products(admin_id):
             )
         except ValueError:
             # Product already exists, skip
-            continue
\ No newline at end of file
+            continue
+
+
+def seed_catalog(products: int = 0, categories: int = 0, users: int = 0, tag_vocabulary: int = 200,
+                 tags_per_product: Tuple[int, int] = (0, 3), tag_skew: float = 1.0,
+                 colors_per_product: Tuple[int, int] = (1, 4), random_seed: Optional[int] = None,
+                 chunk_size: int = DEFAULT_SEED_CHUNK_SIZE, defer_indexes: bool = True,
+                 uploader_email: str = "admin@gmail.com", echo=print) -> dict:
+    """
+    Generate a synthetic catalog with bulk inserts.
+
+    Rows are generated and inserted chunk_size at a time (one executemany per
+    table and one commit per chunk), so memory stays flat at any size. Product
+    ids are allocated up front, so link rows need no read-back, and names embed
+    the id, so there's nothing to de-duplicate. The bypassed service work is
+    done once at the end: search index rebuild, table versions and cache
+    invalidation. With defer_indexes, secondary indexes on the product tables
+    are dropped for the load and rebuilt in one pass afterwards.
+    """
+    started = time.monotonic()
+    rng = random.Random(random_seed)
+    uploader = User.query.filter_by(email=uploader_email).first()
+    if uploader is None:
+        raise ValueError(f"No user with email {uploader_email}; seed the default data first")
+
+    category_ids = _seed_categories(categories)
+    user_count = _seed_users(users, chunk_size)
+    if not products:
+        _finish_seed()
+        return {'products': 0, 'categories': categories, 'users': user_count,
+                'seconds': time.monotonic() - started}
+    if not category_ids:
+        raise ValueError("No active categories to put products in")
+
+    tag_ids = _ensure_named_rows(Tag, TAG_NAMES[:tag_vocabulary] + [
+        f"tag-{index}" for index in range(len(TAG_NAMES), tag_vocabulary)
+    ])
+    brand_tag_ids = _ensure_named_rows(Tag, BRANDS)
+    color_ids = _ensure_named_rows(Color, COLOR_NAMES)
+    # Popularity falls off as 1/rank^skew, so a few tags are on most products
+    tag_weights = list(accumulate(1 / (rank + 1) ** tag_skew for rank in range(len(tag_ids))))
+
+    engine = db.engine
+    first_id = (db.session.query(db.func.max(Product.id)).scalar() or 0) + 1
+    db.session.commit()
+    now = datetime.utcnow()
+    year = 365 * 86400
+
+    with engine.connect() as connection:
+        restore = _bulk_session(connection)
+        deferred = _drop_secondary_indexes(connection) if defer_indexes else []
+        try:
+            for chunk_start in range(first_id, first_id + products, chunk_size):
+                chunk_end = min(chunk_start + chunk_size, first_id + products)
+                product_rows, tag_links, color_links = [], [], []
+                for product_id in range(chunk_start, chunk_end):
+                    brand = rng.randrange(len(BRANDS))
+                    category = rng.choice(category_ids)
+                    created_at = now - timedelta(seconds=rng.randrange(year))
+                    product_rows.append({
+                        'id': product_id,
+                        'name': f"{BRANDS[brand]} {rng.choice(MODEL_NAMES)} {product_id}",
+                        'price': round(rng.uniform(5, 3000), 2),
+                        'rating_rate': round(rng.uniform(0, 5), 1),
+                        'rating_count': rng.randrange(5000),
+                        'created_at': created_at,
+                        'updated_at': created_at,
+                        'is_active': True,
+                        'category_id': category,
+                        'uploader_id': uploader.id,
+                    })
+                    tags = [brand_tag_ids[brand]]
+                    extra_tags = rng.randint(*tags_per_product) if tag_ids else 0
+                    for tag_id in rng.choices(tag_ids, cum_weights=tag_weights, k=extra_tags):
+                        if tag_id not in tags:
+                            tags.append(tag_id)
+                    tag_links.extend({'product_id': product_id, 'tag_id': tag_id, 'position': position}
+                                     for position, tag_id in enumerate(tags))
+                    colors = rng.sample(color_ids, min(rng.randint(*colors_per_product), len(color_ids)))
+                    color_links.extend({'product_id': product_id, 'color_id': color_id, 'position': position}
+                                       for position, color_id in enumerate(colors))
+
+                with connection.begin():
+                    connection.execute(db.insert(Product), product_rows)
+                    connection.execute(db.insert(ProductTag), tag_links)
+                    if color_links:
+                        connection.execute(db.insert(ProductColor), color_links)
+                echo(f"  {chunk_end - first_id}/{products} products")
+        finally:
+            try:
+                if deferred:
+                    echo(f"Rebuilding {len(deferred)} indexes...")
+                    _create_indexes(connection, deferred)
+            finally:
+                restore()
+
+    _finish_seed(new_ids=(first_id, first_id + products - 1))
+    return {'products': products, 'categories': categories, 'users': user_count,
+            'seconds': time.monotonic() - started}
+
+
+def _seed_categories(count: int) -> List[int]:
+    """Add count categories not already present; returns every active category id"""
+    existing = {name.lower() for (name,) in db.session.query(Category.name)}
+    names, index = [], 0
+    while len(names) < count:
+        name = CATEGORY_NAMES[index] if index < len(CATEGORY_NAMES) else f"Category {index + 1}"
+        if name.lower() not in existing:
+            names.append(name)
+        index += 1
+    if names:
+        now = datetime.utcnow()
+        db.session.execute(db.insert(Category), [{'name': name, 'created_at': now, 'is_active': True}
+                                                 for name in names])
+    db.session.commit()
+    return [category_id for (category_id,) in
+            db.session.query(Category.id).filter_by(is_active=True).order_by(Category.id)]
+
+
+def _seed_users(count: int, chunk_size: int) -> int:
+    """Add count users sharing one password hash (hashing each would dominate the run)"""
+    if not count:
+        return 0
+    probe = User()
+    probe.set_password(SEED_USER_PASSWORD)
+    password_hash = probe.password_hash
+    start = (db.session.query(db.func.max(User.id)).scalar() or 0) + 1
+    now = datetime.utcnow()
+    for chunk_start in range(start, start + count, chunk_size):
+        db.session.execute(db.insert(User), [
+            {'name': f"Seed User {n}", 'email': f"seed{n}@example.com", 'password_hash': password_hash,
+             'role': 'User', 'created_at': now, 'is_active': True}
+            for n in range(chunk_start, min(chunk_start + chunk_size, start + count))
+        ])
+        db.session.commit()
+    return count
+
+
+def _ensure_named_rows(model, names: List[str]) -> List[int]:
+    """Ids for names in order, inserting the missing ones"""
+    rows = dict(db.session.query(db.func.lower(model.name), model.id).filter(model.name.in_(names)))
+    missing = [name for name in dict.fromkeys(names) if name.lower() not in rows]
+    if missing:
+        db.session.execute(db.insert(model), [{'name': name} for name in missing])
+        rows = dict(db.session.query(db.func.lower(model.name), model.id).filter(model.name.in_(names)))
+    db.session.commit()
+    return [rows[name.lower()] for name in names]
+
+
+def _bulk_session(connection):
+    """Relax durability/constraint checks on the loading connection; returns a function that restores them"""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        synchronous = connection.exec_driver_sql("PRAGMA synchronous").scalar()
+        connection.exec_driver_sql("PRAGMA synchronous = OFF")
+        connection.commit()
+        return lambda: connection.exec_driver_sql(f"PRAGMA synchronous = {synchronous}")
+    if dialect == 'mysql':
+        connection.exec_driver_sql("SET SESSION unique_checks = 0, foreign_key_checks = 0")
+        connection.commit()
+        return lambda: connection.exec_driver_sql("SET SESSION unique_checks = 1, foreign_key_checks = 1")
+    return lambda: None
+
+
+def _drop_secondary_indexes(connection) -> list:
+    """Drop the non-unique indexes on the product tables; returns them for _create_indexes"""
+    dropped = []
+    with connection.begin():
+        for table in (Product.__table__, ProductTag.__table__, ProductColor.__table__):
+            existing = _index_names(connection, table.name)
+            for index in table.indexes:
+                # Only drop what's there, so exactly those are recreated
+                if index.unique or index.name not in existing or not _deferrable(index, connection.dialect):
+                    continue
+                index.drop(connection)
+                dropped.append(index)
+    return dropped
+
+
+def _index_names(connection, table_name: str) -> set:
+    # Reflection skips expression-based indexes on SQLite, so ask the catalogs directly there and on MySQL
+    if connection.dialect.name == 'sqlite':
+        return set(connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?", (table_name,)
+        ).scalars())
+    if connection.dialect.name == 'mysql':
+        return set(connection.exec_driver_sql(
+            "SELECT DISTINCT index_name FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = %s", (table_name,)
+        ).scalars())
+    return {index['name'] for index in db.inspect(connection).get_indexes(table_name)}
+
+
+def _deferrable(index, dialect) -> bool:
+    # lower_name_index() declares a functional and a plain variant under one name; only one exists
+    if 'functional' in index.info and index.info['functional'] != supports_functional_indexes(dialect):
+        return False
+    # InnoDB refuses to drop the index backing a foreign key
+    if dialect.name != 'mysql':
+        return True
+    leading = index.expressions[0]
+    return not getattr(leading, 'foreign_keys', None)
+
+
+def _create_indexes(connection, indexes: list):
+    with connection.begin():
+        for index in indexes:
+            index.create(connection)
+        if connection.dialect.name == 'sqlite':
+            # Fresh statistics so the planner keeps choosing the listing indexes
+            connection.exec_driver_sql("ANALYZE")
+    if connection.dialect.name == 'mysql':
+        for table in (Product.__table__, ProductTag.__table__, ProductColor.__table__):
+            connection.exec_driver_sql(f"ANALYZE TABLE {table.name}")
+        connection.commit()
+
+
+def _finish_seed(new_ids: Optional[Tuple[int, int]] = None):
+    """The per-write bookkeeping the bulk path skipped, done once; only the new id range is indexed"""
+    if new_ids:
+        get_search_backend().index_id_range(*new_ids)
+    TableVersion.bump('products', 'categories')
+    db.session.commit()
+    get_cache().invalidate(tags=[PRODUCT_LISTS, CATEGORY_LISTS])
@@ -1,15 +1,20 @@
 import hashlib
+import uuid
 from datetime import datetime, timedelta
-from flask_jwt_extended import create_access_token, create_refresh_token
+from flask_jwt_extended import create_access_token, create_refresh_token, decode_token
 from app.extensions import db
 from app.models.user import User
-from app.models.refresh_token import RefreshToken
+from app.services.user_status_service import UserStatusService
+from app.services.token_service import RefreshTokenService
+from app.services.blocklist_service import get_blocklist
+from app.utils.passwords import PasswordHasherBusy
 from sqlalchemy.exc import IntegrityError
 
 from flask_mail import Message
 from flask import current_app, url_for
 from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 from app.extensions import mail
+from app.services.mail_service import send_mail
 
 class AuthService:
     @staticmethod
@@ -34,7 +39,8 @@ class AuthService:
             recipients=[user.email],
             body=f"Hello {user.name},\n\nTo reset your password, click the following link (valid for 1 hour):\n{reset_url}\n\nIf you did not request this, please ignore this email."
         )
-        mail.send(msg)
+        # Returns once queued; delivery and retries happen on the mail dispatcher threads
+        send_mail(msg)
 
     @staticmethod
     def forgot_password(email):
@@ -54,8 +60,10 @@ class AuthService:
         if not user:
             raise ValueError("User not found")
         user.set_password(new_password)
-        RefreshToken.query.filter_by(user_id=user.id).delete()
+        RefreshTokenService.revoke_all(user.id)
         db.session.commit()
+        UserStatusService.invalidate(user.id)
+        RefreshTokenService.forget_user(user.id)
         return True
     
     @staticmethod
@@ -77,6 +85,9 @@ class AuthService:
         except IntegrityError:
             db.session.rollback()
             raise ValueError("User with this email already exists")
+        except PasswordHasherBusy:
+            db.session.rollback()
+            raise
         except Exception as e:
             db.session.rollback()
             raise ValueError(f"Registration failed: {str(e)}")
@@ -88,6 +99,12 @@ class AuthService:
         
         if not user or not user.check_password(password):
             raise ValueError("Invalid email or password")
+
+        # Upgrade hashes made with an outdated PASSWORD_HASH_METHOD while we have the plaintext
+        if user.password_needs_rehash():
+            user.set_password(password)
+            db.session.commit()
+            UserStatusService.invalidate(user.id)
         
         return user
 
@@ -104,61 +121,53 @@ class AuthService:
                 'role': user.role,
                 'email': user.email,
                 'name': user.name,
-                'user_id': user.id  # Keep numeric ID in claims for convenience
+                'user_id': user.id,  # Keep numeric ID in claims for convenience
+                'cred': user.credentials_stamp
             }
         )
         
+        # Our own jti so the session row can be keyed by it without decoding the token again
+        jti = str(uuid.uuid4())
+        expires_delta = current_app.config["JWT_REFRESH_TOKEN_EXPIRES"]
         refresh_token = create_refresh_token(
             identity=user_id_str,  # Must be string
+            expires_delta=expires_delta,
             additional_claims={
-                'user_id': user.id
+                'jti': jti,
+                'user_id': user.id,
+                'cred': user.credentials_stamp
             }
         )
         
-        # Store refresh token hash in database
-        expires_at = datetime.utcnow() + timedelta(days=30)
-        
-        # Clean up old tokens for this user (keep only latest)
-        RefreshToken.query.filter_by(user_id=user.id).delete()
-        
-        # Use the hash approach if using the RefreshToken with token_hash field
-        if hasattr(RefreshToken, 'hash_token'):
-            token_hash = RefreshToken.hash_token(refresh_token)
-            refresh_token_obj = RefreshToken(
-                token_hash=token_hash,
-                user_id=user.id,
-                expires_at=expires_at
-            )
-        else:
-            # Use direct token storage (make sure your model supports this)
-            refresh_token_obj = RefreshToken(
-                token=refresh_token,
-                user_id=user.id,
-                expires_at=expires_at
-            )
-        
-        db.session.add(refresh_token_obj)
+        # One row per device session; expired and revoked rows are removed by purge-tokens
+        RefreshTokenService.add(user.id, jti, datetime.utcnow() + expires_delta)
         db.session.commit()
         
         return access_token, refresh_token
 
     @staticmethod
-    def refresh_access_token(user_id_str):
+    def refresh_access_token(user_id_str, jti):
         """Create new access token from refresh token"""
         # FIXED: Convert string back to int for database query
         user_id = int(user_id_str) if isinstance(user_id_str, str) else user_id_str
+
+        if not RefreshTokenService.is_active(jti, user_id):
+            raise PermissionError("Refresh token has been revoked")
         
-        user = User.query.filter_by(id=user_id, is_active=True).first()
-        if not user:
+        # Served from the user status cache rather than a SELECT per refresh
+        status = UserStatusService.get(user_id)
+        if not status or not status['user']['is_active']:
             raise ValueError("User not found")
+        user = status['user']
         
         access_token = create_access_token(
-            identity=str(user.id),  # Must be string
+            identity=str(user['id']),  # Must be string
             additional_claims={
-                'role': user.role,
-                'email': user.email,
-                'name': user.name,
-                'user_id': user.id
+                'role': user['role'],
+                'email': user['email'],
+                'name': user['name'],
+                'user_id': user['id'],
+                'cred': status['stamp']
             }
         )
         
@@ -167,20 +176,29 @@ class AuthService:
     @staticmethod
     def revoke_refresh_token(token):
         """Revoke a refresh token"""
-        if hasattr(RefreshToken, 'hash_token'):
-            token_hash = RefreshToken.hash_token(token)
-            refresh_token = RefreshToken.query.filter_by(token_hash=token_hash).first()
-        else:
-            refresh_token = RefreshToken.query.filter_by(token=token).first()
-            
+        try:
+            claims = decode_token(token, allow_expired=True)
+        except Exception:
+            return False
+        if claims.get('type') != 'refresh':
+            return False
+        return RefreshTokenService.revoke(claims['jti'])
+
+    @staticmethod
+    def logout(claims, refresh_token=None):
+        """Block the presented token until it expires, and end the refresh session if given one"""
+        get_blocklist().revoke(claims['jti'], claims['exp'])
+        if claims.get('type') == 'refresh':
+            RefreshTokenService.revoke(claims['jti'])
         if refresh_token:
-            if hasattr(refresh_token, 'revoke'):
-                refresh_token.revoke()
-            else:
-                db.session.delete(refresh_token)
-            db.session.commit()
-            return True
-        return False
+            try:
+                refresh_claims = decode_token(refresh_token, allow_expired=True)
+            except Exception:
+                raise ValueError("Invalid refresh token")
+            if refresh_claims.get('type') != 'refresh' or refresh_claims.get('sub') != claims.get('sub'):
+                raise ValueError("Invalid refresh token")
+            RefreshTokenService.revoke(refresh_claims['jti'])
+        return True
 
     @staticmethod
     def change_password(user_id_str, current_password, new_password):
@@ -193,8 +211,23 @@ class AuthService:
         if not user.check_password(current_password):
             raise ValueError("Current password is incorrect")
         user.set_password(new_password)
-        RefreshToken.query.filter_by(user_id=user_id).delete()
+        RefreshTokenService.revoke_all(user_id)
+        db.session.commit()
+        UserStatusService.invalidate(user_id)
+        RefreshTokenService.forget_user(user_id)
+        return True
+
+    @staticmethod
+    def deactivate_user(user_id):
+        """Deactivate a user and revoke all their refresh tokens"""
+        user = User.query.filter_by(id=user_id, is_active=True).first()
+        if not user:
+            raise ValueError("User not found")
+        user.is_active = False
+        RefreshTokenService.revoke_all(user_id)
         db.session.commit()
+        UserStatusService.invalidate(user_id)
+        RefreshTokenService.forget_user(user_id)
         return True
 
     @staticmethod
@@ -0,0 +1,197 @@
+# app/services/blocklist_service.py
+import hashlib
+import logging
+import math
+import threading
+import time
+from typing import Iterable, List
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no deletes; rebuild to drop entries)"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, value: str):
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class MemoryBlocklistStore:
+    """In-process stand-in for the shared store (memory://), for tests and single-process runs"""
+
+    def __init__(self):
+        self._entries = {}  # jti -> expires_at (epoch seconds)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def add(self, jti: str, expires_at: float):
+        with self._lock:
+            self._entries[jti] = expires_at
+            self._generation += 1
+
+    def contains(self, jti: str) -> bool:
+        expires_at = self._entries.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def generation(self) -> int:
+        return self._generation
+
+    def active(self) -> List[str]:
+        now = time.time()
+        with self._lock:
+            for jti in [jti for jti, expires_at in self._entries.items() if expires_at <= now]:
+                del self._entries[jti]
+            return list(self._entries)
+
+
+class RedisBlocklistStore:
+    """
+    Revoked jtis as Redis keys that expire with the token.
+
+    A sorted set (score = expiry) lists the live entries for rebuilding
+    worker filters, and a counter tells workers when to rebuild.
+    """
+
+    prefix = "im:blocklist:"
+
+    def __init__(self, url: str):
+        import redis
+        self._redis = redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+
+    def add(self, jti: str, expires_at: float):
+        now = time.time()
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.set(self.prefix + "jti:" + jti, 1, ex=max(1, math.ceil(expires_at - now)))
+        pipe.zadd(self.prefix + "index", {jti: expires_at})
+        pipe.zremrangebyscore(self.prefix + "index", "-inf", now)
+        pipe.incr(self.prefix + "generation")
+        pipe.execute()
+
+    def contains(self, jti: str) -> bool:
+        return bool(self._redis.exists(self.prefix + "jti:" + jti))
+
+    def generation(self) -> int:
+        return int(self._redis.get(self.prefix + "generation") or 0)
+
+    def active(self) -> List[str]:
+        return [member.decode() for member in
+                self._redis.zrangebyscore(self.prefix + "index", time.time(), "+inf")]
+
+
+class TokenBlocklist:
+    """
+    Revoked-token check with a per-worker Bloom filter in front of the shared store.
+
+    A jti the filter has never seen is answered locally, so the common case
+    costs no I/O. Filter hits (real or false positives) are confirmed against
+    the store. Each worker rebuilds its filter from the store's live entries
+    when the store's generation changes, checked at most every sync_interval
+    seconds, so a revocation made by another worker applies within that window.
+    """
+
+    # After a store error, wait this long before syncing again
+    ERROR_BACKOFF = 30
+
+    def __init__(self, store, capacity: int = 100_000, error_rate: float = 0.001, sync_interval: float = 1):
+        self.store = store
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._generation = None
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+        self.prefilter_negatives = self.store_lookups = self.store_errors = 0
+
+    def revoke(self, jti: str, expires_at: float):
+        """Block a jti until its token's expiry (epoch seconds); already-expired tokens are ignored"""
+        if expires_at <= time.time():
+            return
+        self.store.add(jti, expires_at)
+        with self._lock:
+            self._bloom.add(jti)
+
+    def is_revoked(self, jti: str) -> bool:
+        self._maybe_sync()
+        if jti not in self._bloom:
+            self.prefilter_negatives += 1
+            return False
+        self.store_lookups += 1
+        try:
+            return self.store.contains(jti)
+        except Exception as e:
+            # Only tokens that already hit the filter get here; reject rather than risk a revoked one
+            self.store_errors += 1
+            logger.warning("Blocklist lookup failed, rejecting token: %s", e)
+            return True
+
+    def _maybe_sync(self):
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        with self._lock:
+            if now < self._next_sync:
+                return
+            self._next_sync = now + self.sync_interval
+        try:
+            generation = self.store.generation()
+            if generation != self._generation:
+                self._rebuild(self.store.active())
+                self._generation = generation
+        except Exception as e:
+            self.store_errors += 1
+            self._next_sync = now + self.ERROR_BACKOFF
+            logger.warning("Blocklist sync failed, retrying in %ss: %s", self.ERROR_BACKOFF, e)
+
+    def _rebuild(self, jtis: Iterable[str]):
+        jtis = list(jtis)
+        # Grow past the configured capacity rather than let the false-positive rate climb
+        bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        with self._lock:
+            self._bloom = bloom
+
+    def stats(self) -> dict:
+        return {
+            'store': type(self.store).__name__,
+            'filter_bits': self._bloom.size,
+            'filter_hashes': self._bloom.hashes,
+            'prefilter_negatives': self.prefilter_negatives,
+            'store_lookups': self.store_lookups,
+            'store_errors': self.store_errors,
+        }
+
+
+def get_blocklist() -> TokenBlocklist:
+    """Return the token blocklist for the current app, building it from config on first use"""
+    blocklist = current_app.extensions.get('token_blocklist')
+    if blocklist is None:
+        config = current_app.config
+        url = config.get('BLOCKLIST_URL') or 'memory://'
+        store = MemoryBlocklistStore() if url.startswith('memory://') else RedisBlocklistStore(url)
+        blocklist = TokenBlocklist(
+            store,
+            capacity=config.get('BLOCKLIST_BLOOM_CAPACITY', 100_000),
+            error_rate=config.get('BLOCKLIST_BLOOM_ERROR_RATE', 0.001),
+            sync_interval=config.get('BLOCKLIST_SYNC_INTERVAL', 1)
+        )
+        current_app.extensions['token_blocklist'] = blocklist
+    return blocklist
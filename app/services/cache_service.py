@@ -0,0 +1,412 @@
+# app/services/cache_service.py
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+from flask import current_app
+from app.utils.codec import encode, decode
+
+logger = logging.getLogger(__name__)
+
+# Tags for list payloads, invalidated whenever any row behind them changes
+PRODUCT_LISTS = "products:lists"
+CATEGORY_LISTS = "categories:lists"
+
+
+def product_key(product_id: int) -> str:
+    return f"product:{product_id}"
+
+
+def category_key(category_id: int) -> str:
+    return f"category:{category_id}"
+
+
+def user_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def list_key(namespace: str, **params) -> str:
+    """Stable cache key for a list query and its parameters"""
+    encoded = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return f"{namespace}:list:{hashlib.sha1(encoded.encode()).hexdigest()}"
+
+
+class LocalCache:
+    """Thread-safe in-process LRU with a per-entry TTL and a size bound"""
+
+    def __init__(self, maxsize: int = 2048, ttl: float = 5):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tags = {}                # tag -> set of keys
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value, tags: Iterable[str] = ()):
+        tags = tuple(tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, keys: Iterable[str]):
+        with self._lock:
+            for key in keys:
+                self._remove(key)
+
+    def invalidate_tags(self, tags: Iterable[str]):
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def stats(self) -> dict:
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+
+class MemorySharedCache:
+    """In-memory stand-in for the shared tier (memory://), for tests and single-process runs"""
+
+    def __init__(self, ttl: float = 300):
+        self.ttl = ttl
+        self._store = LocalCache(maxsize=1_000_000, ttl=ttl)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        return self._store.get(key)
+
+    def generation(self) -> int:
+        return self._generation
+
+    def set(self, key: str, value, tags: Iterable[str] = (), generation: Optional[int] = None) -> bool:
+        # Round-trip through JSON so values behave exactly as they would from Redis
+        value = decode(encode(value))
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            self._store.set(key, value, tags)
+            return True
+
+    def invalidate(self, keys: Iterable[str] = (), tags: Iterable[str] = ()):
+        with self._lock:
+            self._generation += 1
+            self._store.delete(keys)
+            self._store.invalidate_tags(tags)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._store.clear()
+
+
+class RedisSharedCache:
+    """
+    Shared tier on Redis; tag membership is kept in Redis sets.
+
+    Every invalidation bumps a generation counter, and a set made with the
+    generation read before loading is dropped if it moved, so a worker can't
+    put back a row another worker has just invalidated.
+    """
+
+    prefix = "im:cache:"
+    # Keys per DEL command when invalidating
+    DELETE_BATCH = 1000
+    # KEYS: entry, generation, tag sets; ARGV: expected generation, value, ttl, entry key without prefix
+    SET_IF_GENERATION = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+for i = 3, #KEYS do
+    redis.call('SADD', KEYS[i], ARGV[4])
+    redis.call('EXPIRE', KEYS[i], ARGV[3])
+end
+return 1
+"""
+
+    def __init__(self, url: str, ttl: float = 300):
+        import redis
+        self.ttl = int(ttl)
+        self._redis = redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+        self._set_if_generation = self._redis.register_script(self.SET_IF_GENERATION)
+
+    def get(self, key: str):
+        raw = self._redis.get(self.prefix + key)
+        return decode(raw) if raw is not None else None
+
+    def generation(self) -> int:
+        return int(self._redis.get(self.prefix + "generation") or 0)
+
+    def set(self, key: str, value, tags: Iterable[str] = (), generation: Optional[int] = None) -> bool:
+        if generation is not None:
+            return bool(self._set_if_generation(
+                keys=[self.prefix + key, self.prefix + "generation",
+                      *(self.prefix + "tag:" + tag for tag in tags)],
+                args=[generation, encode(value), self.ttl, key]
+            ))
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.set(self.prefix + key, encode(value), ex=self.ttl)
+        for tag in tags:
+            pipe.sadd(self.prefix + "tag:" + tag, key)
+            pipe.expire(self.prefix + "tag:" + tag, self.ttl)
+        pipe.execute()
+        return True
+
+    def invalidate(self, keys: Iterable[str] = (), tags: Iterable[str] = ()):
+        self._redis.incr(self.prefix + "generation")
+        doomed = [self.prefix + key for key in keys]
+        for tag in tags:
+            tag_key = self.prefix + "tag:" + tag
+            doomed.append(tag_key)
+            doomed.extend(self.prefix + member.decode() for member in self._redis.smembers(tag_key))
+        pipe = self._redis.pipeline(transaction=False)
+        for start in range(0, len(doomed), self.DELETE_BATCH):
+            pipe.delete(*doomed[start:start + self.DELETE_BATCH])
+        pipe.execute()
+
+    def clear(self):
+        self._redis.incr(self.prefix + "generation")
+        for key in self._redis.scan_iter(self.prefix + "*"):
+            if key != (self.prefix + "generation").encode():
+                self._redis.delete(key)
+
+
+class TwoTierCache:
+    """
+    Read-through cache: a per-worker LRU in front of an optional shared tier.
+
+    Writes invalidate both tiers by key and by tag. Entries read with a
+    version need no invalidation: the write moves the version, and the old
+    entries, unreachable, age out with their TTL. Other workers' local
+    entries are only bounded by the local TTL, so keep it short.
+    Cached values are shared between requests and must be treated as read-only.
+    """
+
+    # After a shared-tier error, skip it for this long instead of failing every request
+    SHARED_BACKOFF = 30
+    # Past this many missed key invalidations, the shared tier is cleared instead of replaying them
+    PENDING_LIMIT = 10000
+
+    def __init__(self, local: LocalCache, shared=None):
+        self.local = local
+        self.shared = shared
+        self.shared_hits = self.shared_misses = self.shared_errors = 0
+        self._shared_down_until = 0.0
+        # Bumped on every invalidation so a load that raced a write isn't cached
+        self._generation = 0
+        # Invalidations the shared tier missed, replayed before it is read again
+        self._pending_keys, self._pending_tags, self._pending_clear = set(), set(), False
+        self._pending_lock = threading.Lock()
+
+    def get_or_load(self, key: str, loader: Callable, tags: Iterable[str] = (), version=None,
+                    shared: bool = True):
+        """
+        Return the cached value for key, calling loader on a miss (None results aren't cached).
+
+        With a version (a table version, an updated_at), the entry is stored
+        under key@version: a write that moves the version makes older entries
+        unreachable in every worker, whether or not they were invalidated.
+        shared=False keeps the entry in this worker's tier only.
+        """
+        if version is not None:
+            key = f"{key}@{version}"
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        shared_generation = None
+        if shared and self._shared_available():
+            value = self._shared_call('get', key)
+            if value is not None:
+                self.shared_hits += 1
+                self.local.set(key, value, tags)
+                return value
+            if time.monotonic() >= self._shared_down_until:
+                # Read before loading; the shared set is dropped if any worker invalidates meanwhile
+                shared_generation = self._shared_call('generation')
+            if shared_generation is not None:
+                self.shared_misses += 1
+
+        generation = self._generation
+        value = loader()
+        if value is not None and generation == self._generation:
+            self.local.set(key, value, tags)
+            if shared_generation is not None:
+                self._shared_call('set', key, value, tags, shared_generation)
+        return value
+
+    def invalidate(self, keys: Iterable[str] = (), tags: Iterable[str] = ()):
+        keys, tags = list(keys), list(tags)
+        self._generation += 1
+        self.local.delete(keys)
+        self.local.invalidate_tags(tags)
+        if self.shared is None or not (keys or tags):
+            return
+        if self._shared_available():
+            try:
+                self.shared.invalidate(keys, tags)
+                return
+            except Exception as e:
+                self._shared_failed('invalidate', e)
+        self._defer(keys, tags)
+
+    def clear(self):
+        self._generation += 1
+        self.local.clear()
+        if self.shared is None:
+            return
+        if self._shared_available():
+            try:
+                self.shared.clear()
+                return
+            except Exception as e:
+                self._shared_failed('clear', e)
+        self._defer(clear=True)
+
+    def stats(self) -> dict:
+        return {
+            'local': self.local.stats(),
+            'shared': None if self.shared is None else {
+                'backend': type(self.shared).__name__,
+                'hits': self.shared_hits,
+                'misses': self.shared_misses,
+                'errors': self.shared_errors,
+                'pending_invalidations': len(self._pending_keys) + len(self._pending_tags)
+                                         + int(self._pending_clear),
+            },
+        }
+
+    def _shared_available(self) -> bool:
+        if self.shared is None or time.monotonic() < self._shared_down_until:
+            return False
+        return self._replay_pending()
+
+    def _shared_call(self, method: str, *args):
+        try:
+            return getattr(self.shared, method)(*args)
+        except Exception as e:
+            self._shared_failed(method, e)
+            return None
+
+    def _shared_failed(self, method: str, error: Exception):
+        self.shared_errors += 1
+        self._shared_down_until = time.monotonic() + self.SHARED_BACKOFF
+        logger.warning("Shared cache %s failed, bypassing for %ss: %s", method, self.SHARED_BACKOFF, error)
+
+    def _defer(self, keys: Iterable[str] = (), tags: Iterable[str] = (), clear: bool = False):
+        """Record an invalidation the shared tier missed, so stale entries aren't served once it's back"""
+        with self._pending_lock:
+            self._pending_keys.update(keys)
+            self._pending_tags.update(tags)
+            if clear or len(self._pending_keys) > self.PENDING_LIMIT:
+                self._pending_clear = True
+                self._pending_keys.clear()
+                self._pending_tags.clear()
+
+    def _replay_pending(self) -> bool:
+        """Apply missed invalidations; False (backing off again) if the shared tier still fails"""
+        if not (self._pending_clear or self._pending_keys or self._pending_tags):
+            return True
+        with self._pending_lock:
+            try:
+                if self._pending_clear:
+                    self.shared.clear()
+                elif self._pending_keys or self._pending_tags:
+                    self.shared.invalidate(list(self._pending_keys), list(self._pending_tags))
+            except Exception as e:
+                self._shared_failed('invalidate', e)
+                return False
+            logger.info("Replayed missed shared cache invalidations")
+            self._pending_keys.clear()
+            self._pending_tags.clear()
+            self._pending_clear = False
+            return True
+
+
+class NullCache:
+    """Used when CACHE_ENABLED is off: every read goes to the loader"""
+
+    def get_or_load(self, key: str, loader: Callable, tags: Iterable[str] = (), version=None,
+                    shared: bool = True):
+        return loader()
+
+    def invalidate(self, keys: Iterable[str] = (), tags: Iterable[str] = ()):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self) -> dict:
+        return {'local': None, 'shared': None}
+
+
+def _build_shared(url: Optional[str], ttl: float):
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        return MemorySharedCache(ttl=ttl)
+    return RedisSharedCache(url, ttl=ttl)
+
+
+def get_cache():
+    """Return the cache for the current app, building it from config on first use"""
+    cache = current_app.extensions.get('cache')
+    if cache is None:
+        config = current_app.config
+        if not config.get('CACHE_ENABLED', True):
+            cache = NullCache()
+        else:
+            cache = TwoTierCache(
+                LocalCache(maxsize=config.get('CACHE_LOCAL_MAXSIZE', 2048),
+                           ttl=config.get('CACHE_LOCAL_TTL', 5)),
+                _build_shared(config.get('CACHE_SHARED_URL'), config.get('CACHE_SHARED_TTL', 300))
+            )
+        current_app.extensions['cache'] = cache
+    return cache
@@ -1,8 +1,14 @@
 # app/services/category_service.py
+from datetime import datetime
 from typing import List, Optional
 from app.extensions import db
 from app.models.category import Category
+from app.models.product import Product
+from app.models.table_version import TableVersion
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import with_expression
+from app.services.cache_service import get_cache, category_key, PRODUCT_LISTS, CATEGORY_LISTS
+from app.services.search_service import get_search_backend
 
 class CategoryService:
     
@@ -20,8 +26,10 @@ class CategoryService:
             
             category = Category(name=name)
             db.session.add(category)
+            TableVersion.bump('categories')
             db.session.commit()
-            
+
+            get_cache().invalidate(tags=[CATEGORY_LISTS])
             return category
             
         except IntegrityError:
@@ -58,29 +66,104 @@ class CategoryService:
     #         raise
 
     @staticmethod
-    def delete_category(category_id: int) -> bool:
-        """Soft delete a category and its products"""
+    def delete_category(category_id: int, chunk_size: Optional[int] = None) -> bool:
+        """
+        Soft delete a category and its products.
+
+        Products are deactivated with set-based UPDATEs instead of being loaded.
+        By default it's one UPDATE in one transaction; with chunk_size, products
+        are deactivated and committed chunk_size at a time and the category is
+        flipped last, so an interrupted delete can simply be re-run.
+        """
         try:
             category = Category.query.filter_by(id=category_id, is_active=True).first()
             if not category:
                 raise ValueError("Category not found")
-            
-            # Soft delete category and its products
+
+            active_products = db.select(Product.id).where(
+                Product.category_id == category_id,
+                Product.is_active == True
+            )
+            search = get_search_backend()
+            if chunk_size:
+                while True:
+                    chunk = db.session.scalars(active_products.order_by(Product.id).limit(chunk_size)).all()
+                    if not chunk:
+                        break
+                    CategoryService._deactivate_products(Product.id.in_(chunk))
+                    search.reindex_products(chunk)
+                    TableVersion.bump('products')
+                    db.session.commit()
+                    CategoryService._invalidate()
+            else:
+                CategoryService._deactivate_products(
+                    db.and_(Product.category_id == category_id, Product.is_active == True)
+                )
+
             category.is_active = False
-            for product in category.products:
-                product.is_active = False
-            
+            # By category rather than by an id snapshot, so products added while
+            # the delete ran leave the index along with the rest
+            search.remove_category(category_id)
+            TableVersion.bump('categories', 'products')
             db.session.commit()
+
+            CategoryService._invalidate()
             return True
             
         except Exception as e:
             db.session.rollback()
             raise
 
+    @staticmethod
+    def _deactivate_products(condition):
+        """One set-based UPDATE for the matching products"""
+        Product.query.filter(condition).update(
+            {'is_active': False, 'updated_at': datetime.utcnow()}, synchronize_session=False
+        )
+
+    @staticmethod
+    def _invalidate():
+        # productCount and the category lists change along with every product; single
+        # products and categories are cached under versions the write has moved
+        get_cache().invalidate(tags=[PRODUCT_LISTS, CATEGORY_LISTS])
+
     @staticmethod
     def get_category_by_id(category_id: int) -> Optional[Category]:
         """Get category by ID"""
-        return Category.query.filter_by(id=category_id, is_active=True).first()
+        return CategoryService._with_product_counts(
+            Category.query.filter_by(id=category_id, is_active=True)
+        ).first()
+
+    @staticmethod
+    def get_validators():
+        """
+        (etag source, last modified) for category reads.
+
+        Categories embed productCount, so product writes change them too.
+        """
+        versions = TableVersion.current('categories', 'products')
+        changed = [at for _, at in versions.values() if at is not None]
+        return (f"categories:{versions['categories'][0]}:{versions['products'][0]}",
+                max(changed) if changed else None)
+
+    @staticmethod
+    def get_category_data(category_id: int) -> Optional[dict]:
+        """Get a serialized category by ID through the read-through cache, keyed by the ETag's versions"""
+        version, _ = CategoryService.get_validators()
+
+        def load():
+            category = CategoryService.get_category_by_id(category_id)
+            return category.to_dict() if category else None
+        return get_cache().get_or_load(category_key(category_id), load, version=version)
+
+    @staticmethod
+    def list_categories_data() -> List[dict]:
+        """Get all serialized active categories through the read-through cache, keyed by the ETag's versions"""
+        version, _ = CategoryService.get_validators()
+
+        def load():
+            return [category.to_dict() for category in CategoryService.get_all_categories()]
+        return get_cache().get_or_load("categories:list", load, tags=[CATEGORY_LISTS], version=version)
 
     @staticmethod
     def get_category_by_name(name: str) -> Optional[Category]:
@@ -90,7 +173,19 @@ class CategoryService:
     @staticmethod
     def get_all_categories() -> List[Category]:
         """Get all active categories"""
-        return Category.query.filter_by(is_active=True).order_by(Category.name).all()
+        return CategoryService._with_product_counts(
+            Category.query.filter_by(is_active=True)
+        ).order_by(Category.name).all()
+
+    @staticmethod
+    def _with_product_counts(query):
+        """Load active product counts with one grouped aggregate instead of a COUNT per category"""
+        return query.outerjoin(Product, db.and_(
+            Product.category_id == Category.id,
+            Product.is_active == True
+        )).options(
+            with_expression(Category.active_product_count, db.func.count(Product.id))
+        ).group_by(Category.id)
 
     @staticmethod
     def seed_default_categories():
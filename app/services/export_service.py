@@ -0,0 +1,160 @@
+# app/services/export_service.py
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+from app.extensions import db
+from app.models.product import Product
+from app.models.category import Category
+from app.models.user import User
+from app.models.tag import Tag, ProductTag
+from app.models.color import Color, ProductColor
+from app.services.import_service import CSV_LIST_SEPARATOR
+from app.utils.codec import encode
+
+DEFAULT_BATCH_SIZE = 1000
+# Flush to the output roughly every this many bytes
+CHUNK_SIZE = 64 * 1024
+
+CSV_COLUMNS = ['id', 'name', 'category', 'price', 'colors', 'tags', 'rating_rate', 'rating_count',
+               'uploader', 'created_at', 'updated_at']
+
+
+def encode_ndjson(rows: Iterable[dict]) -> Iterator[str]:
+    """One JSON object per line, in the same shape as the products API"""
+    for row in rows:
+        yield encode(row).decode() + "\n"
+
+
+def encode_csv(rows: Iterable[dict]) -> Iterator[str]:
+    """A header line, then one flat record per product; colors/tags cells are '|'-separated"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for row in rows:
+        writer.writerow([
+            row['id'], row['name'], row['category'], row['price'],
+            CSV_LIST_SEPARATOR.join(row['colors']), CSV_LIST_SEPARATOR.join(row['tags']),
+            row['rating']['rate'], row['rating']['count'], row['uploader'],
+            row['created_at'], row['updated_at']
+        ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+ENCODERS = {
+    'ndjson': encode_ndjson,
+    'csv': encode_csv,
+}
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def parse_updated_since(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO-8601 timestamp filter, raising ValueError on bad input"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError("updated_since must be an ISO-8601 timestamp")
+
+
+class ProductExportService:
+
+    @staticmethod
+    def export(fmt: str, category_name: Optional[str] = None, updated_since: Optional[datetime] = None,
+               compress: bool = False, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[bytes]:
+        """
+        Encode active products as NDJSON or CSV byte chunks, optionally gzipped.
+
+        The format is checked up front so bad input raises before any output.
+        """
+        if fmt not in ENCODERS:
+            raise ValueError(f"Unsupported format '{fmt}'")
+        rows = ProductExportService.iter_rows(category_name, updated_since, batch_size)
+        return ProductExportService._chunked(ENCODERS[fmt](rows), compress)
+
+    @staticmethod
+    def iter_rows(category_name: Optional[str] = None, updated_since: Optional[datetime] = None,
+                  batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[dict]:
+        """
+        Yield active products as plain dicts in id order, in constant memory.
+
+        Product rows come from a server-side cursor on a dedicated connection,
+        so MySQL can keep the result unbuffered while the session's connection
+        looks up tags and colors for each batch of ids.
+        """
+        query = db.select(
+            Product.id, Product.name, Category.name.label('category'), Product.price,
+            Product.rating_rate, Product.rating_count, User.name.label('uploader'),
+            Product.created_at, Product.updated_at
+        ).join(Category, Category.id == Product.category_id).outerjoin(
+            User, User.id == Product.uploader_id
+        ).where(Product.is_active == True).order_by(Product.id)
+        if category_name:
+            query = query.where(Category.name == category_name, Category.is_active == True)
+        if updated_since is not None:
+            query = query.where(Product.updated_at >= updated_since)
+
+        with db.engine.connect() as connection:
+            result = connection.execution_options(stream_results=True, yield_per=batch_size).execute(query)
+            for batch in result.partitions():
+                product_ids = [row.id for row in batch]
+                tags = ProductExportService._names(Tag, ProductTag, ProductTag.tag_id, product_ids)
+                colors = ProductExportService._names(Color, ProductColor, ProductColor.color_id, product_ids)
+                for row in batch:
+                    yield {
+                        'id': row.id,
+                        'name': row.name,
+                        'category': row.category,
+                        'price': float(row.price),
+                        'colors': colors.get(row.id, []),
+                        'tags': tags.get(row.id, []),
+                        'rating': {
+                            'rate': row.rating_rate,
+                            'count': row.rating_count
+                        },
+                        'uploader': row.uploader,
+                        'created_at': row.created_at.isoformat() if row.created_at else None,
+                        'updated_at': row.updated_at.isoformat() if row.updated_at else None
+                    }
+
+    @staticmethod
+    def _names(model, link_model, fk_column, product_ids: List[int]) -> dict:
+        """Map product id -> ordered names through one link table, for one batch"""
+        names = {}
+        for product_id, name in db.session.execute(
+            db.select(link_model.product_id, model.name)
+            .join(model, model.id == fk_column)
+            .where(link_model.product_id.in_(product_ids))
+            .order_by(link_model.product_id, link_model.position)
+        ):
+            names.setdefault(product_id, []).append(name)
+        return names
+
+    @staticmethod
+    def _chunked(pieces: Iterable[str], compress: bool, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        # wbits=31 writes a gzip container rather than a raw zlib stream
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+        buffer, size = [], 0
+        for piece in pieces:
+            buffer.append(piece)
+            size += len(piece)
+            if size >= chunk_size:
+                data = "".join(buffer).encode("utf-8")
+                buffer, size = [], 0
+                if compressor is not None:
+                    data = compressor.compress(data)
+                if data:
+                    yield data
+        data = "".join(buffer).encode("utf-8")
+        if compressor is not None:
+            data = compressor.compress(data) + compressor.flush()
+        if data:
+            yield data
@@ -0,0 +1,230 @@
+# app/services/import_service.py
+import csv
+import logging
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
+from pydantic import ValidationError
+from app.extensions import db
+from app.models.product import Product
+from app.models.category import Category
+from app.models.tag import Tag, ProductTag
+from app.models.color import Color, ProductColor
+from app.models.table_version import TableVersion
+from app.schemas.product_schemas import ProductCreateSchema
+from app.services.search_service import get_search_backend
+from app.services.cache_service import get_cache, PRODUCT_LISTS, CATEGORY_LISTS
+from app.utils.codec import decode
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+# Keep the report bounded on huge imports; failures past this are only counted
+MAX_REPORTED_ERRORS = 1000
+# Separator for the colors/tags cells of a CSV row
+CSV_LIST_SEPARATOR = "|"
+# Columns of an export (NDJSON or CSV) that an import assigns itself
+EXPORT_ONLY_FIELDS = ('id', 'rating', 'rating_rate', 'rating_count', 'uploader', 'created_at', 'updated_at')
+
+
+def from_export(row: dict) -> dict:
+    """Accept a row in the export shape: 'category' names the category and generated columns are ignored"""
+    row = {key: value for key, value in row.items() if key not in EXPORT_ONLY_FIELDS}
+    if 'category' in row and 'category_name' not in row:
+        row['category_name'] = row.pop('category')
+    return row
+
+
+def parse_ndjson(stream: TextIO) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yield (line, row, error) for each non-blank line of an NDJSON stream"""
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = decode(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Each line must be a JSON object"
+            continue
+        yield line_number, row, None
+
+
+def parse_csv(stream: TextIO) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yield (line, row, error) for each CSV record; colors/tags cells are '|'-separated"""
+    reader = csv.DictReader(stream)
+    for record in reader:
+        row = {key: value for key, value in record.items() if key is not None and value not in (None, "")}
+        for field in ("colors", "tags"):
+            if field in row:
+                row[field] = [item.strip() for item in row[field].split(CSV_LIST_SEPARATOR) if item.strip()]
+        yield reader.line_num, row, None
+
+
+PARSERS = {
+    'ndjson': parse_ndjson,
+    'csv': parse_csv,
+}
+
+
+class ProductImportService:
+
+    @staticmethod
+    def import_products(rows: Iterable[Tuple[int, Optional[dict], Optional[str]]], uploader_id: int,
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+        """
+        Bulk-create products from parsed (line, row, error) tuples.
+
+        Rows are validated with ProductCreateSchema, then each batch resolves
+        categories, duplicate names, tags and colors with one set-based query
+        apiece, inserts with executemany and commits. Bad rows are reported
+        and skipped; they never abort the import. If reading the input or
+        saving a batch fails, earlier batches stay committed and the report
+        is returned with "aborted" set to the line the import stopped at.
+        """
+        report = {"total": 0, "imported": 0, "failed": 0, "errors": []}
+        rows = iter(rows)
+        next_line = 1
+
+        while True:
+            try:
+                batch = list(islice(rows, batch_size))
+            except UnicodeDecodeError:
+                ProductImportService._abort(report, next_line, "Import file must be UTF-8 encoded")
+                break
+            if not batch:
+                break
+            report["total"] += len(batch)
+            next_line = batch[-1][0] + 1
+            failed, reported = report["failed"], len(report["errors"])
+            try:
+                imported = ProductImportService._import_batch(batch, uploader_id, report)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                logger.exception("Product import batch starting at line %s failed", batch[0][0])
+                # Nothing in the batch was saved: count all of it as failed, once
+                report["failed"] = failed + len(batch)
+                del report["errors"][reported:]
+                ProductImportService._abort(report, batch[0][0],
+                                            "Batch could not be saved; it and the rows after it were not imported")
+                break
+            report["imported"] += imported
+            if imported:
+                # Per batch, so committed rows are visible even if a later batch fails
+                get_cache().invalidate(tags=[PRODUCT_LISTS, CATEGORY_LISTS])
+
+        report["errors"].sort(key=lambda error: error["line"])
+        return report
+
+    @staticmethod
+    def _import_batch(batch, uploader_id: int, report: dict):
+        valid = []
+        for line, row, error in batch:
+            if error is not None:
+                ProductImportService._fail(report, line, error)
+                continue
+            try:
+                valid.append((line, ProductCreateSchema(**from_export(row))))
+            except ValidationError as e:
+                ProductImportService._fail(report, line, e.errors(include_url=False, include_context=False,
+                                                                  include_input=False))
+            except TypeError as e:
+                ProductImportService._fail(report, line, str(e))
+        if not valid:
+            return 0
+
+        categories = {
+            category.name: category.id
+            for category in Category.query.filter(
+                Category.name.in_({data.category_name for _, data in valid}),
+                Category.is_active == True
+            )
+        }
+        existing_names = {
+            name for (name,) in db.session.query(db.func.lower(Product.name)).filter(
+                db.func.lower(Product.name).in_({data.name.lower() for _, data in valid}),
+                Product.is_active == True
+            )
+        }
+
+        accepted: List[ProductCreateSchema] = []
+        for line, data in valid:
+            if data.category_name not in categories:
+                ProductImportService._fail(report, line, f"Category '{data.category_name}' not found")
+            elif data.name.lower() in existing_names:
+                ProductImportService._fail(report, line, "Product name already exists")
+            else:
+                existing_names.add(data.name.lower())
+                accepted.append(data)
+        if not accepted:
+            return 0
+
+        now = datetime.utcnow()
+        db.session.execute(db.insert(Product), [
+            {
+                'name': data.name,
+                'price': data.price,
+                'category_id': categories[data.category_name],
+                'uploader_id': uploader_id,
+                'created_at': now,
+                'updated_at': now,
+                'is_active': True,
+            }
+            for data in accepted
+        ])
+        # executemany can't return ids on every backend; names are unique among active products
+        product_ids = dict(db.session.query(db.func.lower(Product.name), Product.id).filter(
+            db.func.lower(Product.name).in_([data.name.lower() for data in accepted]),
+            Product.is_active == True
+        ).all())
+
+        tag_ids = ProductImportService._resolve_ids(Tag, [tag for data in accepted for tag in data.tags])
+        color_ids = ProductImportService._resolve_ids(Color, [color for data in accepted for color in data.colors])
+        tag_links, color_links, documents = [], [], []
+        for data in accepted:
+            product_id = product_ids[data.name.lower()]
+            tag_links += ProductImportService._links(product_id, 'tag_id', data.tags, tag_ids)
+            color_links += ProductImportService._links(product_id, 'color_id', data.colors, color_ids)
+            documents.append({
+                'product_id': product_id,
+                'name': data.name,
+                'tags': ' '.join(data.tags),
+                'category': data.category_name
+            })
+        if tag_links:
+            db.session.execute(db.insert(ProductTag), tag_links)
+        if color_links:
+            db.session.execute(db.insert(ProductColor), color_links)
+
+        get_search_backend().index_documents(documents)
+        TableVersion.bump('products')
+        return len(accepted)
+
+    @staticmethod
+    def _resolve_ids(model, names: List[str]) -> dict:
+        """Map lowercase name -> id for a batch, creating missing rows in one flush"""
+        rows = model.resolve(names)
+        db.session.flush()
+        return {row.name.lower(): row.id for row in rows}
+
+    @staticmethod
+    def _links(product_id: int, fk_column: str, names: List[str], ids: dict) -> List[dict]:
+        links, seen = [], set()
+        for name in names:
+            row_id = ids.get(name.lower())
+            if row_id is not None and row_id not in seen:
+                seen.add(row_id)
+                links.append({'product_id': product_id, fk_column: row_id, 'position': len(links)})
+        return links
+
+    @staticmethod
+    def _abort(report: dict, line: int, error: str):
+        report["aborted"] = {"line": line, "error": error}
+
+    @staticmethod
+    def _fail(report: dict, line: int, error):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"line": line, "error": error})
@@ -0,0 +1,170 @@
+# app/services/mail_service.py
+import atexit
+import logging
+import os
+import queue
+import smtplib
+import threading
+import time
+from flask import current_app
+from flask_mail import Message
+from app.extensions import mail
+
+logger = logging.getLogger(__name__)
+
+# Rejections that won't succeed on a retry
+PERMANENT_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, AssertionError)
+
+
+class MailQueueFull(RuntimeError):
+    """The outbound mail queue is at MAIL_QUEUE_SIZE"""
+
+
+class MailDispatcher:
+    """
+    Bounded outbound queue drained by background sender threads.
+
+    Each thread keeps one SMTP connection open while there is work, sends
+    whatever is queued (up to batch_size) over it, and closes it after
+    idle_timeout seconds without mail. Failed sends are retried with
+    exponential backoff up to max_retries times; recipient/sender
+    rejections are not retried.
+    """
+
+    def __init__(self, app, maxsize: int = 1000, workers: int = 2, batch_size: int = 20,
+                 max_retries: int = 5, backoff: float = 2, idle_timeout: float = 30):
+        self.app = app
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.idle_timeout = idle_timeout
+        self._queue = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self._pid = None
+        self._scheduled_retries = 0
+        self.sent = self.failed = self.retried = 0
+
+    def enqueue(self, message: Message):
+        """Queue a message for sending; raises MailQueueFull instead of blocking"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((message, 0))
+        except queue.Full:
+            raise MailQueueFull("Mail queue is full, retry shortly")
+
+    def flush(self, timeout: float = 10) -> bool:
+        """Wait up to timeout seconds for queued mail and pending retries; True if all were handled"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks or self._scheduled_retries:
+            if self._pid != os.getpid() or time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def stats(self) -> dict:
+        return {
+            'queued': self._queue.qsize(),
+            'sent': self.sent,
+            'failed': self.failed,
+            'retried': self.retried,
+        }
+
+    def _ensure_started(self):
+        # Threads don't survive fork(), so a forked worker starts its own
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            for index in range(self.workers):
+                threading.Thread(target=self._run, name=f"mail-sender-{index}", daemon=True).start()
+            self._pid = os.getpid()
+
+    def _run(self):
+        connection = None
+        with self.app.app_context():
+            while True:
+                try:
+                    batch = [self._queue.get(timeout=self.idle_timeout)]
+                except queue.Empty:
+                    connection = self._close(connection)
+                    continue
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                for message, attempt in batch:
+                    try:
+                        if connection is None:
+                            connection = mail.connect().__enter__()
+                        connection.send(message)
+                        self.sent += 1
+                    except Exception as e:
+                        # Don't trust the connection after an error; the next message reconnects
+                        connection = self._close(connection)
+                        self._retry(message, attempt, e)
+                    finally:
+                        self._queue.task_done()
+
+    def _retry(self, message: Message, attempt: int, error: Exception):
+        if isinstance(error, PERMANENT_ERRORS) or attempt >= self.max_retries:
+            self.failed += 1
+            logger.error("Giving up on mail to %s after %s attempts: %s", message.recipients, attempt + 1, error)
+            return
+        self.retried += 1
+        delay = self.backoff * (2 ** attempt)
+        logger.warning("Mail to %s failed (%s), retrying in %ss", message.recipients, error, delay)
+        with self._lock:
+            self._scheduled_retries += 1
+        timer = threading.Timer(delay, self._requeue, (message, attempt + 1))
+        timer.daemon = True
+        timer.start()
+
+    def _requeue(self, message: Message, attempt: int):
+        try:
+            self._queue.put_nowait((message, attempt))
+        except queue.Full:
+            self.failed += 1
+            logger.error("Mail queue full, dropping retry of mail to %s", message.recipients)
+        finally:
+            with self._lock:
+                self._scheduled_retries -= 1
+
+    @staticmethod
+    def _close(connection):
+        if connection is not None:
+            try:
+                connection.__exit__(None, None, None)
+            except Exception:
+                pass
+        return None
+
+
+def get_mail_dispatcher() -> MailDispatcher:
+    """Return the mail dispatcher for the current app, building it from config on first use"""
+    dispatcher = current_app.extensions.get('mail_dispatcher')
+    if dispatcher is None:
+        config = current_app.config
+        dispatcher = MailDispatcher(
+            current_app._get_current_object(),
+            maxsize=config.get('MAIL_QUEUE_SIZE', 1000),
+            workers=config.get('MAIL_WORKERS', 2),
+            batch_size=config.get('MAIL_BATCH_SIZE', 20),
+            max_retries=config.get('MAIL_MAX_RETRIES', 5),
+            backoff=config.get('MAIL_RETRY_BACKOFF', 2),
+            idle_timeout=config.get('MAIL_IDLE_TIMEOUT', 30)
+        )
+        current_app.extensions['mail_dispatcher'] = dispatcher
+        # Give queued mail a chance to go out on a clean shutdown
+        atexit.register(dispatcher.flush, config.get('MAIL_SHUTDOWN_TIMEOUT', 10))
+    return dispatcher
+
+
+def send_mail(message: Message):
+    """Queue a message for background delivery, or send it inline when MAIL_ASYNC is off"""
+    if current_app.config.get('MAIL_ASYNC', True):
+        get_mail_dispatcher().enqueue(message)
+    else:
+        mail.send(message)
@@ -1,11 +1,19 @@
 # app/services/product_service.py
+from datetime import datetime
 from typing import List, Optional
 from app.extensions import db
 from app.models.product import Product
 from app.models.category import Category
 from app.models.user import User
+from app.models.tag import Tag, ProductTag
+from app.models.color import Color, ProductColor
+from app.models.table_version import TableVersion
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import or_
+from sqlalchemy import or_, and_, exists, literal
+from sqlalchemy.orm import joinedload, contains_eager
+from app.services.search_service import get_search_backend
+from app.services.cache_service import get_cache, product_key, list_key, PRODUCT_LISTS, CATEGORY_LISTS
+from app.utils.pagination import encode_cursor, decode_cursor, clamp_limit
 
 class ProductService:
     
@@ -38,8 +46,12 @@ class ProductService:
             product.tags = tags
             
             db.session.add(product)
+            db.session.flush()
+            get_search_backend().index_product(product)
+            TableVersion.bump('products')
             db.session.commit()
-            
+
+            get_cache().invalidate(tags=[PRODUCT_LISTS, CATEGORY_LISTS])
             return product
             
         except IntegrityError:
@@ -58,6 +70,7 @@ class ProductService:
             product = Product.query.filter_by(id=product_id, is_active=True).first()
             if not product:
                 raise ValueError("Product not found")
+            old_category_id = product.category_id
             
             # Update fields if provided
             if name is not None:
@@ -85,8 +98,19 @@ class ProductService:
                 if not category:
                     raise ValueError(f"Category '{category_name}' not found")
                 product.category_id = category.id
-            
+
+            # Tag/color-only edits touch just the link tables; the row still needs a new version
+            product.version = Product.version + 1
+            db.session.flush()
+            get_search_backend().index_product(product)
+            TableVersion.bump('products')
             db.session.commit()
+
+            # The product's own entry is keyed by its row version; only lists are dropped
+            tags = [PRODUCT_LISTS]
+            if product.category_id != old_category_id:
+                tags.append(CATEGORY_LISTS)
+            get_cache().invalidate(tags=tags)
             return product
             
         except Exception as e:
@@ -102,43 +126,374 @@ class ProductService:
                 raise ValueError("Product not found")
             
             product.is_active = False
+            get_search_backend().remove_product(product.id)
+            TableVersion.bump('products')
             db.session.commit()
+
+            get_cache().invalidate(tags=[PRODUCT_LISTS, CATEGORY_LISTS])
             return True
             
         except Exception as e:
             db.session.rollback()
             raise
 
+    # Ids per statement in bulk operations; below this a bulk change is one UPDATE
+    BULK_CHUNK_SIZE = 5000
+    # Lowest price a relative bulk change can leave; prices must stay positive
+    MIN_PRICE = 0.01
+
+    @staticmethod
+    def bulk_update(ids: Optional[List[int]] = None, category_name: Optional[str] = None,
+                    tags: Optional[List[str]] = None, colors: Optional[List[str]] = None,
+                    price: Optional[float] = None, price_change_percent: Optional[float] = None,
+                    add_tags: Optional[List[str]] = None, remove_tags: Optional[List[str]] = None,
+                    new_category_name: Optional[str] = None) -> int:
+        """
+        Apply one set of changes to every active product matching the filters.
+
+        Matching ids are selected once up front, so later statements can't change
+        which rows they hit (e.g. removing the tag being filtered on). Each change
+        is then a set-based statement per BULK_CHUNK_SIZE ids, all in one
+        transaction. Returns the number of products changed.
+        """
+        def apply(product_ids):
+            values = {'updated_at': datetime.utcnow()}
+            if price is not None:
+                values['price'] = price
+            if price_change_percent is not None:
+                # Rounding a large cut can reach 0.00; such prices stop at MIN_PRICE instead
+                new_price = db.func.round(Product.price * (1 + price_change_percent / 100.0), 2)
+                values['price'] = db.case((new_price < ProductService.MIN_PRICE, ProductService.MIN_PRICE),
+                                          else_=new_price)
+            if new_category_id is not None:
+                values['category_id'] = new_category_id
+
+            for chunk in ProductService._chunks(product_ids):
+                for tag_id in add_tag_ids:
+                    ProductService._add_tag_links(chunk, tag_id)
+                if remove_tag_ids:
+                    ProductTag.query.filter(
+                        ProductTag.product_id.in_(chunk),
+                        ProductTag.tag_id.in_(remove_tag_ids)
+                    ).delete(synchronize_session=False)
+                Product.query.filter(Product.id.in_(chunk)).update(values, synchronize_session=False)
+
+            if add_tag_ids or remove_tag_ids or new_category_id is not None:
+                for chunk in ProductService._chunks(product_ids):
+                    get_search_backend().reindex_products(chunk)
+
+        new_category_id = None
+        if new_category_name is not None:
+            category = Category.query.filter_by(name=new_category_name, is_active=True).first()
+            if not category:
+                raise ValueError(f"Category '{new_category_name}' not found")
+            new_category_id = category.id
+        add_tag_ids = [tag.id for tag in ProductService._resolve_flushed(Tag, add_tags or [])]
+        remove_tag_ids = [
+            tag.id for tag in Tag.query.filter(Tag.name.in_(remove_tags))
+        ] if remove_tags else []
+
+        return ProductService._bulk_apply(ids, category_name, tags, colors, apply,
+                                          category_changes=new_category_id is not None)
+
+    @staticmethod
+    def bulk_delete(ids: Optional[List[int]] = None, category_name: Optional[str] = None,
+                    tags: Optional[List[str]] = None, colors: Optional[List[str]] = None) -> int:
+        """Soft delete every active product matching the filters; returns the number deleted"""
+        def apply(product_ids):
+            now = datetime.utcnow()
+            for chunk in ProductService._chunks(product_ids):
+                Product.query.filter(Product.id.in_(chunk)).update(
+                    {'is_active': False, 'updated_at': now}, synchronize_session=False
+                )
+                get_search_backend().reindex_products(chunk)
+
+        return ProductService._bulk_apply(ids, category_name, tags, colors, apply, category_changes=True)
+
+    @staticmethod
+    def _bulk_apply(ids, category_name, tags, colors, apply, category_changes=False):
+        try:
+            query = db.session.query(Product.id).filter(Product.is_active == True)
+            if ids:
+                query = query.filter(Product.id.in_(ids))
+            if category_name is not None:
+                query = query.join(Category).filter(Category.name == category_name, Category.is_active == True)
+            query = ProductService._filter_attributes(query, tags, colors)
+            product_ids = [product_id for (product_id,) in query]
+            if not product_ids:
+                db.session.rollback()
+                return 0
+
+            apply(product_ids)
+            TableVersion.bump('products')
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        get_cache().invalidate(tags=[PRODUCT_LISTS, CATEGORY_LISTS] if category_changes else [PRODUCT_LISTS])
+        return len(product_ids)
+
+    @staticmethod
+    def _add_tag_links(product_ids: List[int], tag_id: int):
+        """INSERT ... SELECT a tag link, appended last, for products that don't have it yet"""
+        next_position = db.func.coalesce(
+            db.select(db.func.max(ProductTag.position) + 1)
+            .where(ProductTag.product_id == Product.id)
+            .scalar_subquery(),
+            0
+        )
+        db.session.execute(db.insert(ProductTag).from_select(
+            ['product_id', 'tag_id', 'position'],
+            db.select(Product.id, literal(tag_id), next_position).where(
+                Product.id.in_(product_ids),
+                ~exists().where(ProductTag.product_id == Product.id, ProductTag.tag_id == tag_id)
+            )
+        ))
+
+    @staticmethod
+    def _resolve_flushed(model, names: List[str]):
+        rows = model.resolve(names)
+        db.session.flush()
+        return rows
+
+    @staticmethod
+    def _chunks(values: List[int]):
+        size = ProductService.BULK_CHUNK_SIZE
+        for start in range(0, len(values), size):
+            yield values[start:start + size]
+
     @staticmethod
     def get_product_by_id(product_id: int) -> Optional[Product]:
         """Get product by ID"""
-        return Product.query.filter_by(id=product_id, is_active=True).first()
+        return Product.query.options(
+            joinedload(Product.category),
+            joinedload(Product.uploader)
+        ).filter_by(id=product_id, is_active=True).first()
+
+    @staticmethod
+    def _row_version(product_id: int):
+        """(version, updated_at) of an active product, or None"""
+        return db.session.query(Product.version, Product.updated_at).filter_by(
+            id=product_id, is_active=True
+        ).first()
+
+    @staticmethod
+    def get_product_validators(product_id: int):
+        """(etag source, last modified) for one product from its row version alone, or None if missing"""
+        row = ProductService._row_version(product_id)
+        if row is None:
+            return None
+        return f"product:{product_id}:{row.version}", row.updated_at
+
+    @staticmethod
+    def get_list_validators():
+        """(etag source, last modified) for product lists from the products/categories change versions"""
+        versions = TableVersion.current('products', 'categories')
+        (products_version, products_at), (categories_version, categories_at) = (
+            versions['products'], versions['categories']
+        )
+        changed = [at for at in (products_at, categories_at) if at is not None]
+        return (f"products:{products_version}:{categories_version}",
+                max(changed) if changed else None)
+
+    @staticmethod
+    def get_product_data(product_id: int) -> Optional[dict]:
+        """
+        Get a serialized product by ID through the read-through cache.
+
+        Entries are keyed by the product's row version, the same validator its
+        ETag is built from, so an edit can never be answered with an older body.
+        """
+        row = ProductService._row_version(product_id)
+        if row is None:
+            return None
+
+        def load():
+            product = ProductService.get_product_by_id(product_id)
+            return product.to_dict() if product else None
+        return get_cache().get_or_load(product_key(product_id), load, version=row.version)
 
     @staticmethod
-    def get_all_products() -> List[Product]:
-        """Get all active products"""
-        return Product.query.filter_by(is_active=True).order_by(Product.created_at.desc()).all()
+    def list_products_data(category: Optional[str] = None, search: Optional[str] = None,
+                           cursor: Optional[str] = None, limit: Optional[int] = None,
+                           tags: Optional[List[str]] = None, colors: Optional[List[str]] = None) -> dict:
+        """
+        Get a serialized product list through the read-through cache.
+
+        Dispatches to the category, search or full listing like the list methods;
+        paginated requests also carry next_cursor. Entries are keyed by the
+        table versions behind the list ETag.
+        """
+        tags, colors = sorted(tags or []), sorted(colors or [])
+        version, _ = ProductService.get_list_validators()
+
+        def load():
+            filters = {'cursor': cursor, 'limit': limit, 'tags': tags, 'colors': colors}
+            if category:
+                result = ProductService.get_products_by_category(category, **filters)
+            elif search:
+                result = ProductService.search_products(search, **filters)
+            else:
+                result = ProductService.get_all_products(**filters)
+
+            if cursor is None and limit is None:
+                return {"products": [product.to_dict() for product in result]}
+            products, next_cursor = result
+            return {
+                "products": [product.to_dict() for product in products],
+                "next_cursor": next_cursor
+            }
+
+        key = list_key("products", category=category, search=search, cursor=cursor,
+                       limit=limit, tags=tags, colors=colors)
+        return get_cache().get_or_load(key, load, tags=[PRODUCT_LISTS], version=version)
 
     @staticmethod
-    def get_products_by_category(category_name: str) -> List[Product]:
+    def get_all_products(cursor: Optional[str] = None, limit: Optional[int] = None,
+                         tags: Optional[List[str]] = None, colors: Optional[List[str]] = None):
+        """Get all active products (one keyset page when cursor/limit is given)"""
+        query, rank = ProductService._all_query(tags, colors)
+        return ProductService._fetch(query, cursor, limit, rank=rank)
+
+    @staticmethod
+    def get_products_by_category(category_name: str, cursor: Optional[str] = None,
+                                 limit: Optional[int] = None, tags: Optional[List[str]] = None,
+                                 colors: Optional[List[str]] = None):
         """Get products by category name"""
-        return Product.query.join(Category).filter(
+        query, rank = ProductService._category_query(category_name, tags, colors)
+        return ProductService._fetch(query, cursor, limit, rank=rank)
+
+    @staticmethod
+    def search_products(query: str, cursor: Optional[str] = None, limit: Optional[int] = None,
+                        tags: Optional[List[str]] = None, colors: Optional[List[str]] = None):
+        """Search products by name, tags, or category"""
+        search_query, rank = ProductService._search_query(query, tags, colors)
+        return ProductService._fetch(search_query, cursor, limit, rank=rank)
+
+    @staticmethod
+    def iter_products(category: Optional[str] = None, search: Optional[str] = None,
+                      tags: Optional[List[str]] = None, colors: Optional[List[str]] = None,
+                      batch_size: int = 500):
+        """
+        Iterate matching products newest-first, holding one batch in memory at a time.
+
+        Batches are keyset pages rather than one long server-side cursor, so the
+        per-batch selectin loads of tags/colors can share the connection (MySQL
+        can't run them while an unbuffered result is open). Loaded batches are
+        expunged from the session once consumed. The query is built up front so
+        bad filters raise before streaming starts.
+        """
+        if category:
+            query, _ = ProductService._category_query(category, tags, colors)
+        elif search:
+            query, _ = ProductService._search_query(search, tags, colors)
+        else:
+            query, _ = ProductService._all_query(tags, colors)
+
+        def generate():
+            cursor = None
+            while True:
+                products, cursor = ProductService._page(query, cursor, batch_size)
+                yield from products
+                db.session.expunge_all()
+                if cursor is None:
+                    return
+
+        return generate()
+
+    @staticmethod
+    def _all_query(tags: Optional[List[str]], colors: Optional[List[str]]):
+        query = Product.query.options(
+            joinedload(Product.category),
+            joinedload(Product.uploader)
+        ).filter_by(is_active=True)
+        return ProductService._filter_attributes(query, tags, colors), None
+
+    @staticmethod
+    def _category_query(category_name: str, tags: Optional[List[str]], colors: Optional[List[str]]):
+        # Reuse the category join to populate Product.category instead of lazy loading it
+        query = Product.query.join(Category).options(
+            contains_eager(Product.category),
+            joinedload(Product.uploader)
+        ).filter(
             Category.name == category_name,
             Product.is_active == True,
             Category.is_active == True
-        ).order_by(Product.created_at.desc()).all()
+        )
+        return ProductService._filter_attributes(query, tags, colors), None
 
     @staticmethod
-    def search_products(query: str) -> List[Product]:
-        """Search products by name, tags, or category"""
-        return Product.query.join(Category).filter(
-            or_(
-                Product.name.ilike(f'%{query}%'),
-                Product.tags_json.ilike(f'%{query}%'),
-                Category.name.ilike(f'%{query}%')
-            ),
+    def _search_query(text_query: str, tags: Optional[List[str]], colors: Optional[List[str]]):
+        query = Product.query.join(Category).options(
+            contains_eager(Product.category),
+            joinedload(Product.uploader)
+        ).filter(
             Product.is_active == True,
             Category.is_active == True
-        ).order_by(Product.created_at.desc()).all()
+        )
+        query = ProductService._filter_attributes(query, tags, colors)
+        return get_search_backend().search(query, text_query)
+
+    @staticmethod
+    def _filter_attributes(query, tags: Optional[List[str]], colors: Optional[List[str]]):
+        """Require every given tag and color, each resolved through its indexed link table"""
+        for tag in tags or []:
+            query = query.filter(Product.id.in_(
+                db.select(ProductTag.product_id).join(Tag).where(Tag.name == tag)
+            ))
+        for color in colors or []:
+            query = query.filter(Product.id.in_(
+                db.select(ProductColor.product_id).join(Color).where(Color.name == color)
+            ))
+        return query
+
+    @staticmethod
+    def _fetch(query, cursor: Optional[str], limit: Optional[int], rank=None):
+        """
+        Run a product list query in newest-first order, relevance-ranked first when
+        a search rank is given.
 
+        Without cursor/limit this returns the full list. Otherwise it returns a
+        (products, next_cursor) tuple for one keyset page over (rank, created_at, id),
+        so deep pages cost the same as the first and concurrent inserts never shift
+        rows between pages.
+        """
+        if cursor is None and limit is None:
+            order = [rank.order()] if rank is not None else []
+            return query.order_by(*order, Product.created_at.desc(), Product.id.desc()).all()
+
+        return ProductService._page(query, cursor, clamp_limit(limit), rank=rank)
+
+    @staticmethod
+    def _page(query, cursor: Optional[str], limit: int, rank=None):
+        """Fetch one keyset page of up to limit products and the cursor for the next one"""
+        order = [rank.order()] if rank is not None else []
+        query = query.order_by(*order, Product.created_at.desc(), Product.id.desc())
+        if cursor is not None:
+            created_at, last_id, last_score = decode_cursor(cursor)
+            after = or_(
+                Product.created_at < created_at,
+                and_(Product.created_at == created_at, Product.id < last_id)
+            )
+            if rank is not None:
+                if last_score is None:
+                    raise ValueError("Invalid cursor")
+                less_relevant = rank.score < last_score if rank.descending else rank.score > last_score
+                after = or_(less_relevant, and_(rank.score == last_score, after))
+            query = query.filter(after)
 
+        if rank is None:
+            rows = query.limit(limit + 1).all()
+            scores = None
+        else:
+            rows, scores = [], []
+            for product, score in query.add_columns(rank.score).limit(limit + 1):
+                rows.append(product)
+                scores.append(score)
+        products = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = products[-1]
+            next_cursor = encode_cursor(last.created_at, last.id, scores[limit - 1] if scores else None)
+        return products, next_cursor
@@ -0,0 +1,256 @@
+# app/services/search_service.py
+import re
+from typing import List, NamedTuple, Optional, Tuple
+from flask import current_app
+from sqlalchemy import event, text, bindparam, or_, false, Integer, Float
+from app.extensions import db
+from app.models.product import Product
+from app.models.category import Category
+from app.models.tag import Tag, ProductTag
+
+SEARCH_TABLE = "product_search"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(query: str) -> List[str]:
+    """Split a free-text query into lowercase word tokens"""
+    return [token.lower() for token in _TOKEN_RE.findall(query or "")]
+
+
+class Rank(NamedTuple):
+    """A search's relevance score column and whether higher scores are more relevant"""
+    score: object
+    descending: bool
+
+    def order(self):
+        return self.score.desc() if self.descending else self.score.asc()
+
+
+class LikeSearchBackend:
+    """Fallback backend: substring matching with no index to maintain"""
+    name = "like"
+
+    def create_schema(self, connection):
+        pass
+
+    def index_product(self, product: Product):
+        pass
+
+    def remove_product(self, product_id: int):
+        pass
+
+    def index_documents(self, documents: List[dict]):
+        pass
+
+    def reindex_products(self, product_ids: List[int]):
+        pass
+
+    def remove_category(self, category_id: int):
+        pass
+
+    def index_id_range(self, first_id: int, last_id: int) -> int:
+        return 0
+
+    def rebuild(self) -> int:
+        return 0
+
+    def search(self, query, text_query: str) -> Tuple[object, Optional[Rank]]:
+        """Filter a Product query already joined to Category; returns (query, relevance rank or None)"""
+        return query.filter(
+            or_(
+                Product.name.ilike(f'%{text_query}%'),
+                Product.id.in_(
+                    db.select(ProductTag.product_id).join(Tag).where(Tag.name.ilike(f'%{text_query}%'))
+                ),
+                Category.name.ilike(f'%{text_query}%')
+            )
+        ), None
+
+
+class _IndexedSearchBackend(LikeSearchBackend):
+    """Shared plumbing for backends that keep one index row per active product"""
+
+    def create_schema(self, connection):
+        connection.execute(text(self.create_sql))
+
+    def _document(self, product: Product) -> dict:
+        category = db.session.get(Category, product.category_id)
+        return {
+            'product_id': product.id,
+            'name': product.name,
+            'tags': ' '.join(product.tags),
+            'category': category.name if category else ''
+        }
+
+    def index_product(self, product: Product):
+        """Insert or replace the index row for a product (call after flush, before commit)"""
+        if not product.is_active:
+            return self.remove_product(product.id)
+        db.session.execute(text(self.upsert_sql), self._document(product))
+
+    def index_documents(self, documents: List[dict]):
+        """Upsert prepared {product_id, name, tags, category} rows in one executemany"""
+        if documents:
+            db.session.execute(text(self.upsert_sql), documents)
+
+    def remove_product(self, product_id: int):
+        db.session.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE {self.id_column} = :id"), {'id': product_id})
+
+    def remove_category(self, category_id: int):
+        """Drop the index rows of every product in a category"""
+        db.session.execute(
+            text(f"DELETE FROM {SEARCH_TABLE} WHERE {self.id_column} IN "
+                 "(SELECT id FROM products WHERE category_id = :category_id)"),
+            {'category_id': category_id}
+        )
+
+    def reindex_products(self, product_ids: List[int]):
+        """Refresh the index rows of the given products from the tables (inactive ones are dropped)"""
+        if not product_ids:
+            return
+        db.session.execute(
+            text(f"DELETE FROM {SEARCH_TABLE} WHERE {self.id_column} IN :ids").bindparams(
+                bindparam('ids', expanding=True)),
+            {'ids': list(product_ids)}
+        )
+        db.session.execute(
+            text(f"{self.backfill_sql} AND p.id IN :ids").bindparams(bindparam('ids', expanding=True)),
+            {'ids': list(product_ids)}
+        )
+
+    def index_id_range(self, first_id: int, last_id: int) -> int:
+        """Add index rows for freshly inserted products with ids in [first_id, last_id]"""
+        result = db.session.execute(
+            text(f"{self.backfill_sql} AND p.id BETWEEN :first_id AND :last_id"),
+            {'first_id': first_id, 'last_id': last_id}
+        )
+        return result.rowcount
+
+    def rebuild(self) -> int:
+        """Repopulate the index from every active product"""
+        db.session.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+        db.session.execute(text(self.backfill_sql))
+        db.session.commit()
+        return db.session.execute(text(f"SELECT COUNT(*) FROM {SEARCH_TABLE}")).scalar()
+
+    def search(self, query, text_query: str):
+        tokens = tokenize(text_query)
+        if not tokens:
+            return query.filter(false()), None
+
+        matches = text(self.match_sql).bindparams(
+            q=self.match_expression(tokens)
+        ).columns(product_id=Integer, score=Float).subquery('search_matches')
+
+        query = query.join(matches, Product.id == matches.c.product_id)
+        return query, Rank(matches.c.score, self.rank_descending)
+
+
+class SQLiteFTS5Backend(_IndexedSearchBackend):
+    """SQLite FTS5 virtual table keyed by product id, ranked with bm25"""
+    name = "fts5"
+    id_column = "rowid"
+
+    create_sql = (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+        "USING fts5(name, tags, category, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    upsert_sql = (
+        f"INSERT OR REPLACE INTO {SEARCH_TABLE} (rowid, name, tags, category) "
+        "VALUES (:product_id, :name, :tags, :category)"
+    )
+    backfill_sql = (
+        f"INSERT INTO {SEARCH_TABLE} (rowid, name, tags, category) "
+        "SELECT p.id, p.name, (SELECT group_concat(t.name, ' ') FROM product_tags pt "
+        "JOIN tags t ON t.id = pt.tag_id WHERE pt.product_id = p.id), c.name FROM products p "
+        "JOIN categories c ON c.id = p.category_id WHERE p.is_active = 1"
+    )
+    # Column weights favour name over tags over category
+    match_sql = (
+        f"SELECT rowid AS product_id, bm25({SEARCH_TABLE}, 10.0, 5.0, 2.0) AS score "
+        f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :q"
+    )
+
+    def match_expression(self, tokens: List[str]) -> str:
+        # Every token must match, each as a prefix
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    # bm25 scores are negative; lower means more relevant
+    rank_descending = False
+
+
+class MySQLFulltextBackend(_IndexedSearchBackend):
+    """InnoDB FULLTEXT index over a denormalized product_search table"""
+    name = "mysql"
+    id_column = "product_id"
+
+    create_sql = (
+        f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+        "product_id INT NOT NULL PRIMARY KEY, "
+        "name VARCHAR(200) NOT NULL, "
+        "tags TEXT, "
+        "category VARCHAR(100), "
+        "FULLTEXT KEY ft_product_search (name, tags, category)"
+        ") ENGINE=InnoDB"
+    )
+    upsert_sql = (
+        f"INSERT INTO {SEARCH_TABLE} (product_id, name, tags, category) "
+        "VALUES (:product_id, :name, :tags, :category) "
+        "ON DUPLICATE KEY UPDATE name = VALUES(name), tags = VALUES(tags), category = VALUES(category)"
+    )
+    backfill_sql = (
+        f"INSERT INTO {SEARCH_TABLE} (product_id, name, tags, category) "
+        "SELECT p.id, p.name, (SELECT GROUP_CONCAT(t.name SEPARATOR ' ') FROM product_tags pt "
+        "JOIN tags t ON t.id = pt.tag_id WHERE pt.product_id = p.id), c.name FROM products p "
+        "JOIN categories c ON c.id = p.category_id WHERE p.is_active = 1"
+    )
+    match_sql = (
+        "SELECT product_id, MATCH(name, tags, category) AGAINST(:q IN BOOLEAN MODE) AS score "
+        f"FROM {SEARCH_TABLE} WHERE MATCH(name, tags, category) AGAINST(:q IN BOOLEAN MODE)"
+    )
+
+    def match_expression(self, tokens: List[str]) -> str:
+        # Tokens shorter than innodb_ft_min_token_size or in the stopword list are ignored by MySQL
+        return ' '.join(f'+{token}*' for token in tokens)
+
+    rank_descending = True
+
+
+BACKENDS = {
+    LikeSearchBackend.name: LikeSearchBackend,
+    SQLiteFTS5Backend.name: SQLiteFTS5Backend,
+    MySQLFulltextBackend.name: MySQLFulltextBackend,
+}
+
+_DIALECT_DEFAULTS = {
+    'sqlite': SQLiteFTS5Backend.name,
+    'mysql': MySQLFulltextBackend.name,
+}
+
+
+def _resolve_backend_name(configured: str, dialect_name: str) -> str:
+    if configured == 'auto':
+        return _DIALECT_DEFAULTS.get(dialect_name, LikeSearchBackend.name)
+    if configured not in BACKENDS:
+        raise ValueError(f"Unknown SEARCH_BACKEND '{configured}'")
+    return configured
+
+
+def get_search_backend():
+    """Return the search backend for the current app, resolving 'auto' from the DB dialect"""
+    backend = current_app.extensions.get('product_search')
+    if backend is None:
+        name = _resolve_backend_name(current_app.config.get('SEARCH_BACKEND', 'auto'),
+                                     db.engine.dialect.name)
+        backend = BACKENDS[name]()
+        current_app.extensions['product_search'] = backend
+    return backend
+
+
+@event.listens_for(db.metadata, 'after_create')
+def _create_search_schema(target, connection, **kw):
+    """Create the search index alongside db.create_all() (migrations handle upgrades)"""
+    name = _resolve_backend_name(current_app.config.get('SEARCH_BACKEND', 'auto'),
+                                 connection.dialect.name)
+    BACKENDS[name]().create_schema(connection)
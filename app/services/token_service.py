@@ -0,0 +1,124 @@
+# app/services/token_service.py
+import logging
+import threading
+import time
+from datetime import datetime
+from app.extensions import db
+from app.models.refresh_token import RefreshToken
+from app.services.cache_service import get_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PURGE_BATCH_SIZE = 5000
+
+
+def refresh_token_key(token_hash: str) -> str:
+    return f"refresh:{token_hash}"
+
+
+def user_refresh_tokens_tag(user_id: int) -> str:
+    return f"refresh:user:{user_id}"
+
+
+class RefreshTokenService:
+    """
+    Stored refresh tokens, one row per device session.
+
+    Rows are keyed by the sha256 of the token's jti. Whether a jti is still
+    usable is read through the app cache, so /refresh usually costs no query;
+    revocations invalidate the cached state after committing.
+    """
+
+    @staticmethod
+    def add(user_id: int, jti: str, expires_at: datetime) -> RefreshToken:
+        """Stage a new session row (the caller commits)"""
+        token = RefreshToken(token_hash=RefreshToken.hash_token(jti), user_id=user_id, expires_at=expires_at)
+        db.session.add(token)
+        return token
+
+    @staticmethod
+    def is_active(jti: str, user_id: int) -> bool:
+        """True if the user's refresh token with this jti exists, isn't revoked and hasn't expired"""
+        token_hash = RefreshToken.hash_token(jti)
+
+        def load():
+            row = db.session.query(RefreshToken.expires_at, RefreshToken.is_revoked) \
+                .filter_by(token_hash=token_hash, user_id=user_id).first()
+            # Unknown or purged tokens are cached as inactive too; a jti is never reissued
+            if row is None or row.is_revoked:
+                return {'active': False}
+            return {'active': True, 'expires_at': row.expires_at.isoformat()}
+
+        state = get_cache().get_or_load(refresh_token_key(token_hash), load,
+                                        tags=[user_refresh_tokens_tag(user_id)])
+        return state['active'] and datetime.fromisoformat(state['expires_at']) > datetime.utcnow()
+
+    @staticmethod
+    def revoke(jti: str) -> bool:
+        """Revoke one session; returns False if it was unknown or already revoked"""
+        token_hash = RefreshToken.hash_token(jti)
+        try:
+            revoked = RefreshToken.query.filter_by(token_hash=token_hash, is_revoked=False).update(
+                {'is_revoked': True}, synchronize_session=False
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        get_cache().invalidate(keys=[refresh_token_key(token_hash)])
+        return bool(revoked)
+
+    @staticmethod
+    def revoke_all(user_id: int):
+        """Stage revocation of every session of a user (the caller commits, then calls forget_user)"""
+        RefreshToken.query.filter_by(user_id=user_id, is_revoked=False).update(
+            {'is_revoked': True}, synchronize_session=False
+        )
+
+    @staticmethod
+    def forget_user(user_id: int):
+        """Drop cached state for every session of a user"""
+        get_cache().invalidate(tags=[user_refresh_tokens_tag(user_id)])
+
+    @staticmethod
+    def purge(batch_size: int = DEFAULT_PURGE_BATCH_SIZE) -> int:
+        """Delete expired and revoked rows in id-bounded batches, committing each; returns rows deleted"""
+        purged = 0
+        while True:
+            ids = [row_id for (row_id,) in db.session.query(RefreshToken.id).filter(
+                db.or_(RefreshToken.expires_at <= datetime.utcnow(), RefreshToken.is_revoked == True)
+            ).limit(batch_size)]
+            if not ids:
+                return purged
+            try:
+                RefreshToken.query.filter(RefreshToken.id.in_(ids)).delete(synchronize_session=False)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            purged += len(ids)
+
+
+def schedule_token_purge(app):
+    """Purge refresh tokens every TOKEN_PURGE_INTERVAL seconds on a daemon thread (0 leaves it to cron)"""
+    interval = app.config.get('TOKEN_PURGE_INTERVAL', 0)
+    if not interval:
+        return None
+
+    def run():
+        while True:
+            time.sleep(interval)
+            with app.app_context():
+                try:
+                    purged = RefreshTokenService.purge(app.config.get('TOKEN_PURGE_BATCH_SIZE',
+                                                                      DEFAULT_PURGE_BATCH_SIZE))
+                    if purged:
+                        logger.info("Purged %s refresh tokens", purged)
+                except Exception:
+                    logger.exception("Refresh token purge failed")
+                finally:
+                    db.session.remove()
+
+    thread = threading.Thread(target=run, name="refresh-token-purge", daemon=True)
+    thread.start()
+    return thread
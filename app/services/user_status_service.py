@@ -0,0 +1,47 @@
+# app/services/user_status_service.py
+from typing import Optional
+from app.extensions import db
+from app.models.user import User
+from app.services.cache_service import get_cache, user_key
+
+
+class UserStatusService:
+    """
+    Cached active/role state for authenticated requests.
+
+    Entries live only in each worker's local tier: a stale shared entry would
+    keep a deactivated or demoted user authenticated for the shared TTL,
+    while local entries expire within CACHE_LOCAL_TTL. Anything that changes
+    a user's credentials, role or active flag must still call invalidate()
+    after committing, which applies at once in the calling worker.
+    """
+
+    @staticmethod
+    def get(user_id: int) -> Optional[dict]:
+        """{'user': user.to_dict(), 'stamp': credentials stamp} for any user, or None if missing"""
+        def load():
+            user = db.session.get(User, user_id)
+            if not user:
+                return None
+            return {'user': user.to_dict(), 'stamp': user.credentials_stamp}
+        return get_cache().get_or_load(user_key(user_id), load, shared=False)
+
+    @staticmethod
+    def invalidate(user_id: int):
+        get_cache().invalidate(keys=[user_key(user_id)])
+
+    @staticmethod
+    def check(jwt_data: dict) -> Optional[dict]:
+        """Status for a decoded token's user if they're still active and its credentials stamp matches"""
+        try:
+            user_id = int(jwt_data['sub'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        status = UserStatusService.get(user_id)
+        if status is None or not status['user']['is_active']:
+            return None
+        # Tokens issued before a password change carry the old stamp
+        stamp = jwt_data.get('cred')
+        if stamp is not None and stamp != status['stamp']:
+            return None
+        return status
@@ -0,0 +1,56 @@
+# app/utils/codec.py
+from typing import Optional, Type, TypeVar
+from flask import current_app, request
+from flask.json.provider import DefaultJSONProvider
+from pydantic import BaseModel, ValidationError
+from pydantic_core import from_json, to_json
+
+SchemaT = TypeVar('SchemaT', bound=BaseModel)
+
+
+def encode(value, indent: Optional[int] = None) -> bytes:
+    """JSON bytes; pydantic models and datetimes (ISO 8601) are encoded natively"""
+    return to_json(value, indent=indent, fallback=DefaultJSONProvider.default)
+
+
+def decode(data):
+    """Parse JSON text or bytes"""
+    return from_json(data)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider encoding and parsing with pydantic-core instead of the stdlib json module.
+
+    Keys keep insertion order instead of being sorted; dumps() options other
+    than indent and separators still go through the default provider.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        if set(kwargs) - {'indent', 'separators'}:
+            return super().dumps(obj, **kwargs)
+        return encode(obj, kwargs.get('indent')).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return decode(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = 2 if (self.compact is None and self._app.debug) or self.compact is False else None
+        return self._app.response_class(encode(obj, indent) + b"\n", mimetype=self.mimetype)
+
+
+def parse_body(schema: Type[SchemaT]) -> SchemaT:
+    """Validate the raw request body against a schema, without building an intermediate dict"""
+    return schema.model_validate_json(request.get_data())
+
+
+def validation_failed(error: ValidationError):
+    """400 response carrying the error details as pydantic encodes them"""
+    return current_app.response_class(
+        b'{"error":"Validation failed","details":' + error.json(include_url=False).encode() + b'}\n',
+        status=400,
+        mimetype="application/json"
+    )
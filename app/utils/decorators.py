@@ -1,7 +1,8 @@
 # app/utils/decorators.py - FIXED VERSION
+import hashlib
 from functools import wraps
-from flask import jsonify
-from flask_jwt_extended import verify_jwt_in_request, get_jwt
+from flask import jsonify, request, make_response
+from flask_jwt_extended import verify_jwt_in_request, get_jwt, get_current_user
 
 def role_required(*required_roles):
     """
@@ -12,8 +13,9 @@ def role_required(*required_roles):
         @wraps(fn)
         def decorator(*args, **kwargs):
             verify_jwt_in_request()
-            claims = get_jwt()
-            user_role = claims.get('role')
+            # Prefer the cached user status so role changes apply before the token expires
+            status = get_current_user()
+            user_role = status['user']['role'] if status else get_jwt().get('role')
 
             if not user_role or user_role not in required_roles:
                 return jsonify({
@@ -24,4 +26,47 @@ def role_required(*required_roles):
 
             return fn(*args, **kwargs)
         return decorator
-    return wrapper
\ No newline at end of file
+    return wrapper
+
+
+def conditional(validator):
+    """
+    Decorator adding ETag / Last-Modified validation to a GET view.
+
+    validator(*args, **kwargs) returns (etag_source, last_modified) from cheap
+    version lookups, or None to skip validation. A matching If-None-Match (or
+    If-Modified-Since when no If-None-Match is sent) gets a 304 before the
+    view runs, so no rows are loaded or serialized.
+    """
+    def wrapper(fn):
+        @wraps(fn)
+        def decorator(*args, **kwargs):
+            validators = validator(*args, **kwargs)
+            if validators is None:
+                return fn(*args, **kwargs)
+
+            etag_source, last_modified = validators
+            etag = hashlib.sha1(
+                f"{etag_source}|{request.path}?{request.query_string.decode()}".encode()
+            ).hexdigest()
+            if last_modified is not None:
+                last_modified = last_modified.replace(microsecond=0)
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains(etag)
+            else:
+                since = request.if_modified_since
+                not_modified = (since is not None and last_modified is not None
+                                and last_modified <= since.replace(tzinfo=None))
+
+            response = make_response(("", 304) if not_modified else fn(*args, **kwargs))
+            if response.status_code in (200, 304):
+                response.set_etag(etag)
+                if last_modified is not None:
+                    response.last_modified = last_modified
+                # Authenticated data: clients may store it but must revalidate
+                response.cache_control.private = True
+                response.cache_control.no_cache = True
+            return response
+        return decorator
+    return wrapper
@@ -0,0 +1,89 @@
+# app/utils/jwt_cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+from flask_jwt_extended import JWTManager
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of already-verified tokens, keyed by a hash of the encoded token.
+
+    Entries are dropped once the token's own exp passes, so a hit never extends
+    a token's life. Only signature/claim verification is skipped; blocklist and
+    user checks still run on every request.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # token hash -> (exp, decoded claims)
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def key(encoded_token: str) -> str:
+        return hashlib.sha256(encoded_token.encode()).hexdigest()
+
+    def get(self, encoded_token: str):
+        key = self.key(encoded_token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def set(self, encoded_token: str, decoded: dict):
+        exp = decoded.get('exp')
+        if exp is None:
+            # Never cache tokens without an expiry
+            return
+        key = self.key(encoded_token)
+        with self._lock:
+            self._entries[key] = (exp, dict(decoded))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {'size': len(self._entries), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses}
+
+
+class CachingJWTManager(JWTManager):
+    """
+    JWTManager that skips re-verifying a token it has already verified in this worker.
+
+    Hooks the private JWTManager._decode_jwt_from_config, which every token
+    decode in Flask-JWT-Extended 4.6 goes through; requirements.txt pins that
+    version and tests/test_jwt_cache.py fails if the hook stops being called.
+    """
+
+    def _decode_jwt_from_config(self, encoded_token: str, csrf_value=None, allow_expired: bool = False) -> dict:
+        # CSRF double-submit values differ per request, so those tokens always take the slow path
+        cache = get_token_cache()
+        if cache is None or csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        decoded = cache.get(encoded_token)
+        if decoded is None:
+            decoded = super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+            cache.set(encoded_token, decoded)
+        return decoded
+
+
+def get_token_cache():
+    """Return the verified-token LRU for the current app, or None when AUTH_TOKEN_CACHE_SIZE is 0"""
+    if 'jwt_token_cache' not in current_app.extensions:
+        size = current_app.config.get('AUTH_TOKEN_CACHE_SIZE', 4096)
+        current_app.extensions['jwt_token_cache'] = VerifiedTokenCache(size) if size else None
+    return current_app.extensions['jwt_token_cache']
@@ -0,0 +1,445 @@
+# app/utils/metrics.py
+import glob
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from flask import current_app, g, request
+from sqlalchemy import event
+
+try:
+    import fcntl
+except ImportError:  # Windows: dead workers' files are summed but never archived
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+# [statements, db seconds] for the request being handled in this context
+_request_db: ContextVar[Optional[list]] = ContextVar('request_db', default=None)
+
+
+class Metric:
+    """A named metric with fixed label names; samples are keyed by label values"""
+
+    type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = [[list(labels), self._copy(value)] for labels, value in self._samples.items()]
+        return {'type': self.type, 'help': self.documentation, 'labels': list(self.labelnames), 'samples': samples}
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, labels: Tuple = (), amount: float = 1):
+        with self._lock:
+            self._samples[labels] = self._samples.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    type = 'gauge'
+
+    def inc(self, labels: Tuple = (), amount: float = 1):
+        with self._lock:
+            self._samples[labels] = self._samples.get(labels, 0) + amount
+
+    def dec(self, labels: Tuple = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+
+class Histogram(Metric):
+    """Fixed-bucket histogram; each sample is [per-bucket counts (+Inf last), sum]"""
+
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: Tuple = ()):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            sample = self._samples.get(labels)
+            if sample is None:
+                sample = self._samples[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            sample[0][index] += 1
+            sample[1] += value
+
+    def snapshot(self) -> dict:
+        snapshot = super().snapshot()
+        snapshot['buckets'] = list(self.buckets)
+        return snapshot
+
+    @staticmethod
+    def _copy(value):
+        return [list(value[0]), value[1]]
+
+
+class MetricsRegistry:
+    """
+    Metrics for one worker process, rendered in the Prometheus text format.
+
+    Recording is an in-memory update under a per-metric lock. Collectors are
+    called at scrape time for values that already live elsewhere (cache stats).
+    With a multiprocess dir, each worker also writes its snapshot there every
+    flush_interval seconds and a scrape sums every worker's file, so it doesn't
+    matter which worker answers. Counters and histograms of exited workers are
+    kept so totals never go backwards; their gauges are dropped.
+
+    Files are named by pid plus a per-process nonce, so a new worker that
+    reuses a pid never overwrites an exited one's totals. A scrape folds the
+    files of exited workers into one archive file and deletes them, under a
+    lock so each is counted exactly once.
+    """
+
+    ARCHIVE_FILE = "metrics-archive.json"
+    LOCK_FILE = "metrics.lock"
+
+    def __init__(self, multiprocess_dir: Optional[str] = None, flush_interval: float = 5):
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_interval = flush_interval
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Metric]]] = []
+        self._lock = threading.Lock()
+        self._pid = None
+        self._file_pid = None
+        self._file_name = None
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], Iterable[Metric]]):
+        self._collectors.append(collector)
+
+    def snapshot(self) -> dict:
+        metrics = list(self._metrics.values())
+        for collector in self._collectors:
+            try:
+                metrics.extend(collector())
+            except Exception:
+                logger.exception("Metrics collector failed")
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def ensure_flushing(self):
+        """Start this process's snapshot writer, if a multiprocess dir is set (threads don't survive fork())"""
+        if not self.multiprocess_dir or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True).start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Writing metrics snapshot failed")
+
+    def file_name(self) -> str:
+        """This process's snapshot file: metrics-<pid>-<nonce>.json, renamed after fork()"""
+        if self._file_pid != os.getpid():
+            self._file_pid = os.getpid()
+            self._file_name = f"metrics-{self._file_pid}-{uuid.uuid4().hex}.json"
+        return self._file_name
+
+    def flush(self):
+        os.makedirs(self.multiprocess_dir, exist_ok=True)
+        self._write(os.path.join(self.multiprocess_dir, self.file_name()), self.snapshot())
+
+    def _write(self, path: str, snapshot: dict):
+        # Write-then-rename so a scrape never reads half a file
+        fd, tmp_path = tempfile.mkstemp(dir=self.multiprocess_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+
+    def collect(self) -> dict:
+        """Snapshot of this process, merged with the other workers' latest snapshots if configured"""
+        if not self.multiprocess_dir:
+            return self.snapshot()
+        self.flush()
+        with open(os.path.join(self.multiprocess_dir, self.LOCK_FILE), 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            return self._collect_files(archive=fcntl is not None)
+
+    def _collect_files(self, archive: bool) -> dict:
+        archive_path = os.path.join(self.multiprocess_dir, self.ARCHIVE_FILE)
+        archived = _load(archive_path) or {}
+        merged = {}
+        _merge(merged, archived, live=False)
+        exited = []
+        for path in glob.glob(os.path.join(self.multiprocess_dir, "metrics-*-*.json")):
+            try:
+                pid = int(os.path.basename(path).split('-')[1])
+            except ValueError:
+                continue
+            snapshot = _load(path)
+            if snapshot is None:
+                continue
+            live = _pid_alive(pid)
+            _merge(merged, snapshot, live=live)
+            if not live:
+                exited.append((path, snapshot))
+
+        if archive and exited:
+            for _, snapshot in exited:
+                _merge(archived, snapshot, live=False)
+            self._write(archive_path, archived)
+            for path, _ in exited:
+                os.remove(path)
+        return merged
+
+    def render(self) -> str:
+        return render(self.collect())
+
+
+def _load(path: str) -> Optional[dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _merge(into: dict, snapshot: dict, live: bool):
+    for name, metric in snapshot.items():
+        if metric['type'] == 'gauge' and not live:
+            continue
+        target = into.setdefault(name, {**metric, 'samples': []})
+        samples = {tuple(labels): value for labels, value in target['samples']}
+        for labels, value in metric['samples']:
+            labels = tuple(labels)
+            current = samples.get(labels)
+            if current is None:
+                samples[labels] = value
+            elif metric['type'] == 'histogram':
+                samples[labels] = [[a + b for a, b in zip(current[0], value[0])], current[1] + value[1]]
+            else:
+                samples[labels] = current + value
+        target['samples'] = [[list(labels), value] for labels, value in samples.items()]
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _label_text(names: Iterable[str], values: Iterable, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(snapshot: dict) -> str:
+    """Prometheus text exposition format (0.0.4) for a registry snapshot"""
+    lines = []
+    for name in sorted(snapshot):
+        metric = snapshot[name]
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        labelnames = metric['labels']
+        for labels, value in sorted(metric['samples']):
+            if metric['type'] != 'histogram':
+                lines.append(f"{name}{_label_text(labelnames, labels)} {_number(value)}")
+                continue
+            counts, total = value
+            cumulative = 0
+            for bound, count in zip(list(metric['buckets']) + [float('inf')], counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{name}_bucket{_label_text(labelnames, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_label_text(labelnames, labels)} {_number(total)}")
+            lines.append(f"{name}_count{_label_text(labelnames, labels)} {cumulative}")
+    return '\n'.join(lines) + '\n'
+
+
+class AppMetrics:
+    """Request, database and cache metrics for one app"""
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+        self.requests = registry.counter(
+            'http_requests_total', 'Requests handled, by route and status', ('method', 'endpoint', 'status'))
+        self.latency = registry.histogram(
+            'http_request_duration_seconds', 'Request latency, by route', ('method', 'endpoint'))
+        self.in_flight = registry.gauge('http_requests_in_flight', 'Requests currently being handled')
+        self.request_statements = registry.histogram(
+            'http_request_db_statements', 'SQL statements executed per request, by route',
+            ('endpoint',), COUNT_BUCKETS)
+        self.request_db_time = registry.histogram(
+            'http_request_db_seconds', 'Cumulative SQL time per request, by route', ('endpoint',))
+        self.statements = registry.histogram(
+            'db_statement_duration_seconds', 'SQL statement execution time', (), STATEMENT_BUCKETS)
+        self.checkout = registry.histogram(
+            'db_pool_checkout_seconds', 'Time waiting for a pooled (or new) DB connection',
+            (), STATEMENT_BUCKETS)
+        registry.add_collector(self._cache_metrics)
+
+    # Request hooks
+
+    def before_request(self):
+        self.registry.ensure_flushing()
+        g._metrics_started = time.perf_counter()
+        g._metrics_db = [0, 0.0]
+        _request_db.set(g._metrics_db)
+        self.in_flight.inc()
+
+    def after_request(self, response):
+        g._metrics_status = response.status_code
+        return response
+
+    def teardown_request(self, exc):
+        started = g.pop('_metrics_started', None)
+        if started is None:
+            return
+        # Runs after streamed bodies finish, so latency covers the whole response
+        elapsed = time.perf_counter() - started
+        endpoint = request.endpoint or 'unmatched'
+        status = g.pop('_metrics_status', 500)
+        statements, db_time = g.pop('_metrics_db')
+        _request_db.set(None)
+        self.in_flight.dec()
+        self.requests.inc((request.method, endpoint, str(status)))
+        self.latency.observe(elapsed, (request.method, endpoint))
+        self.request_statements.observe(statements, (endpoint,))
+        self.request_db_time.observe(db_time, (endpoint,))
+
+    # Engine hooks
+
+    def instrument_engine(self, engine):
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+        # There's no pool event before a checkout, so time the engine's entry point to it
+        raw_connection = engine.raw_connection
+
+        def timed_raw_connection(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return raw_connection(*args, **kwargs)
+            finally:
+                self.checkout.observe(time.perf_counter() - started)
+
+        engine.raw_connection = timed_raw_connection
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info['metrics_started'] = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop('metrics_started', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        self.statements.observe(elapsed)
+        totals = _request_db.get()
+        if totals is not None:
+            totals[0] += 1
+            totals[1] += elapsed
+
+    # Scrape-time collectors
+
+    def _cache_metrics(self) -> List[Metric]:
+        hits = Counter('cache_hits_total', 'Cache lookups answered from the cache', ('cache',))
+        misses = Counter('cache_misses_total', 'Cache lookups that fell through', ('cache',))
+        entries = Gauge('cache_entries', 'Entries held in this worker', ('cache',))
+
+        cache = self.app.extensions.get('cache')
+        stats = cache.stats() if cache is not None else {}
+        if stats.get('local'):
+            hits.inc(('local',), stats['local']['hits'])
+            misses.inc(('local',), stats['local']['misses'])
+            entries.inc(('local',), stats['local']['size'])
+        if stats.get('shared'):
+            hits.inc(('shared',), stats['shared']['hits'])
+            misses.inc(('shared',), stats['shared']['misses'])
+
+        token_cache = self.app.extensions.get('jwt_token_cache')
+        if token_cache is not None:
+            token_stats = token_cache.stats()
+            hits.inc(('jwt',), token_stats['hits'])
+            misses.inc(('jwt',), token_stats['misses'])
+            entries.inc(('jwt',), token_stats['size'])
+        return [hits, misses, entries]
+
+
+def init_metrics(app):
+    """Record request/DB/cache metrics for the app when METRICS_ENABLED is on"""
+    if not app.config.get('METRICS_ENABLED', False):
+        return None
+    if not app.config.get('METRICS_TOKEN') and not (app.debug or app.testing):
+        logger.warning("METRICS_ENABLED is on without METRICS_TOKEN; /metrics is open to anyone who can reach it")
+    from app.extensions import db
+
+    registry = MetricsRegistry(app.config.get('METRICS_MULTIPROC_DIR') or None,
+                               app.config.get('METRICS_FLUSH_INTERVAL', 5))
+    metrics = AppMetrics(app, registry)
+    # Ahead of other hooks (e.g. the rate limiter) so requests they reject are counted too
+    app.before_request_funcs.setdefault(None, []).insert(0, metrics.before_request)
+    app.after_request(metrics.after_request)
+    app.teardown_request(metrics.teardown_request)
+    with app.app_context():
+        for engine in db.engines.values():
+            metrics.instrument_engine(engine)
+    app.extensions['metrics'] = metrics
+    return metrics
+
+
+def get_metrics() -> Optional[AppMetrics]:
+    """Return the current app's metrics, or None when METRICS_ENABLED is off"""
+    return current_app.extensions.get('metrics')
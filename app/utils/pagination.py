@@ -0,0 +1,37 @@
+# app/utils/pagination.py
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(created_at: datetime, row_id: int, score: Optional[float] = None) -> str:
+    """Build an opaque cursor token from a (created_at, id) keyset position, led by a search score if ranked"""
+    position = [created_at.isoformat(), row_id] + ([score] if score is not None else [])
+    payload = json.dumps(position, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, int, Optional[float]]:
+    """Decode a cursor token back into its (created_at, id, score) position; score is None if unranked"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, row_id, *score = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if len(score) > 1:
+            raise ValueError
+        return datetime.fromisoformat(created_at), int(row_id), float(score[0]) if score else None
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    """Clamp a requested page size into the allowed range"""
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    if limit < 1:
+        raise ValueError("limit must be a positive integer")
+    return min(limit, MAX_PAGE_SIZE)
@@ -0,0 +1,112 @@
+# app/utils/passwords.py
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from flask import current_app, has_app_context
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Werkzeug's default; existing hashes were created with it
+DEFAULT_METHOD = "scrypt:32768:8:1"
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Too many hash/verify jobs are already waiting for the pool, or one timed out"""
+
+
+@lru_cache(maxsize=None)
+def method_prefix(method: str) -> str:
+    """The method string Werkzeug writes into a hash, with its defaults filled in"""
+    return generate_password_hash("", method=method, salt_length=1).split("$", 1)[0]
+
+
+class PasswordHasher:
+    """
+    Runs Werkzeug hashing and verification on a bounded process pool.
+
+    At most max_pending jobs may be queued or running per worker process;
+    past that callers get PasswordHasherBusy instead of piling up request
+    threads. With workers=0 everything runs inline.
+    """
+
+    def __init__(self, method: str = DEFAULT_METHOD, workers: int = 0, max_pending: int = 32,
+                 timeout: float = 10):
+        self.method = method
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pool_pid = None
+
+    def hash(self, password: str) -> str:
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """True if a stored hash was made with a different algorithm or cost than configured"""
+        return password_hash.split("$", 1)[0] != method_prefix(self.method)
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy("Too many password operations in progress, retry shortly")
+        try:
+            future = self._executor().submit(fn, *args)
+        except BaseException as e:
+            self._slots.release()
+            self._forget_broken_pool(e)
+            raise
+        # The slot stays taken until the job is really over, even if this caller stops waiting
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError as e:
+            # Not the builtin TimeoutError before Python 3.11.
+            # Drops the job if it hasn't started; a running one still holds its slot until it ends
+            future.cancel()
+            raise PasswordHasherBusy("Password operation timed out, retry shortly") from e
+        except BrokenProcessPool as e:
+            self._forget_broken_pool(e)
+            raise
+
+    def _forget_broken_pool(self, error: BaseException):
+        # A pool worker died; start a fresh pool on the next call
+        if isinstance(error, BrokenProcessPool):
+            with self._lock:
+                self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            # A pool inherited across fork() (e.g. gunicorn --preload) can't be used by the child
+            if self._pool is None or self._pool_pid != os.getpid():
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+                self._pool_pid = os.getpid()
+            return self._pool
+
+
+_inline_hasher = PasswordHasher()
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Return the hasher for the current app, or an inline default-method one outside an app context"""
+    if not has_app_context():
+        return _inline_hasher
+    hasher = current_app.extensions.get('password_hasher')
+    if hasher is None:
+        config = current_app.config
+        hasher = PasswordHasher(
+            method=config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD),
+            workers=config.get('PASSWORD_HASH_WORKERS', 0),
+            max_pending=config.get('PASSWORD_HASH_MAX_PENDING', 32),
+            timeout=config.get('PASSWORD_HASH_TIMEOUT', 10)
+        )
+        current_app.extensions['password_hasher'] = hasher
+    return hasher
@@ -0,0 +1,171 @@
+# app/utils/profiler.py
+import hashlib
+import logging
+import os
+import random
+import re
+import time
+import traceback
+from contextvars import ContextVar
+from typing import Dict, Optional
+from flask import g, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Literals and expanded IN-lists vary between executions of the same statement
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+)(?:\s*,\s*(?:\?|%s|:\w+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_current: ContextVar[Optional['RequestProfile']] = ContextVar('sql_profile', default=None)
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so executions that differ only in values compare equal"""
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _PLACEHOLDER_LIST.sub("(...)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def parameter_shape(parameters, executemany: bool) -> str:
+    """Types of the bound parameters (never their values), e.g. '(int, str)' or '500 x (int, str)'"""
+    def shape(params):
+        if isinstance(params, dict):
+            return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in params.items()) + "}"
+        return "(" + ", ".join(type(value).__name__ for value in params or ()) + ")"
+
+    if executemany:
+        rows = list(parameters or ())
+        return f"{len(rows)} x {shape(rows[0]) if rows else '()'}"
+    return shape(parameters)
+
+
+def _app_caller() -> str:
+    """Innermost frame in this app's code outside the profiler, for pointing at an N+1's source"""
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(_APP_ROOT) and frame.filename != __file__:
+            return f"{os.path.relpath(frame.filename, os.path.dirname(_APP_ROOT))}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+class RequestProfile:
+    """Statements run while handling one sampled request"""
+
+    def __init__(self, n_plus_one_threshold: int):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.statements = 0
+        self.seconds = 0.0
+        self.counts: Dict[str, int] = {}
+        self.suspects: Dict[str, dict] = {}  # fingerprint -> {'count', 'statement', 'caller'}
+
+    def record(self, statement: str, elapsed: float):
+        self.statements += 1
+        self.seconds += elapsed
+        key = fingerprint(statement)
+        count = self.counts[key] = self.counts.get(key, 0) + 1
+        if count == self.n_plus_one_threshold:
+            # Only walk the stack once per suspect, when it crosses the threshold
+            self.suspects[key] = {'statement': key, 'caller': _app_caller()}
+
+    def n_plus_one(self):
+        return [{**suspect, 'count': self.counts[key]} for key, suspect in self.suspects.items()]
+
+    def header(self) -> str:
+        parts = [f"statements={self.statements}", f"db_ms={self.seconds * 1000:.1f}"]
+        repeated = sorted(((count, key) for key, count in self.counts.items() if count > 1), reverse=True)
+        if repeated:
+            parts.append("repeated=" + ",".join(
+                f"{hashlib.sha1(key.encode()).hexdigest()[:8]}x{count}" for count, key in repeated[:5]
+            ))
+        if self.suspects:
+            parts.append(f"n_plus_one={len(self.suspects)}")
+        return "; ".join(parts)
+
+
+class SQLProfiler:
+    """
+    Opt-in per-request SQL profiling.
+
+    A sample_rate share of requests get a profile: statement count, DB time
+    and how often each statement fingerprint ran. A fingerprint repeated
+    n_plus_one_threshold times in one request is logged as a likely N+1 with
+    the app code that issued it. Statements slower than slow_query_ms are
+    logged with their parameter types whether or not the request was sampled.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, slow_query_ms: float = 200,
+                 n_plus_one_threshold: int = 5, header: bool = False):
+        self.sample_rate = sample_rate
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.header = header
+
+    def before_request(self):
+        if self.sample_rate >= 1 or random.random() < self.sample_rate:
+            g._sql_profile = RequestProfile(self.n_plus_one_threshold)
+            _current.set(g._sql_profile)
+
+    def after_request(self, response):
+        profile = g.get('_sql_profile')
+        if profile is not None and self.header:
+            response.headers['X-SQL-Profile'] = profile.header()
+        return response
+
+    def teardown_request(self, exc):
+        profile = g.pop('_sql_profile', None)
+        if profile is None:
+            return
+        _current.set(None)
+        for suspect in profile.n_plus_one():
+            logger.warning("Possible N+1 in %s %s: %s statements like %r from %s",
+                           request.method, request.endpoint or request.path,
+                           suspect['count'], suspect['statement'][:300], suspect['caller'])
+        logger.debug("%s %s ran %s statements in %.1fms", request.method, request.path,
+                     profile.statements, profile.seconds * 1000)
+
+    def instrument_engine(self, engine):
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info['profiler_started'] = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop('profiler_started', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed >= self.slow_query_seconds:
+            logger.warning("Slow query (%.1fms) %s params=%s", elapsed * 1000,
+                           _WHITESPACE.sub(" ", statement)[:1000], parameter_shape(parameters, executemany))
+        profile = _current.get()
+        if profile is not None:
+            profile.record(statement, elapsed)
+
+
+def init_profiler(app):
+    """Profile SQL per request when SQL_PROFILER_ENABLED is on"""
+    if not app.config.get('SQL_PROFILER_ENABLED', False):
+        return None
+    from app.extensions import db
+
+    profiler = SQLProfiler(
+        sample_rate=app.config.get('SQL_PROFILER_SAMPLE_RATE', 1.0),
+        slow_query_ms=app.config.get('SQL_SLOW_QUERY_MS', 200),
+        n_plus_one_threshold=app.config.get('SQL_PROFILER_N_PLUS_ONE', 5),
+        header=app.config.get('SQL_PROFILER_HEADER', False)
+    )
+    app.before_request(profiler.before_request)
+    app.after_request(profiler.after_request)
+    app.teardown_request(profiler.teardown_request)
+    with app.app_context():
+        for engine in db.engines.values():
+            profiler.instrument_engine(engine)
+    app.extensions['sql_profiler'] = profiler
+    return profiler
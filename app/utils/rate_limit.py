@@ -0,0 +1,177 @@
+# app/utils/rate_limit.py
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from math import floor
+from flask import request
+from flask_jwt_extended import decode_token
+from flask_limiter.util import get_remote_address
+from limits.errors import ConfigurationError
+from limits.storage.base import Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow
+
+
+def identity_or_ip() -> str:
+    """
+    Rate-limit key: the JWT subject when a valid bearer token is sent, else the client IP.
+
+    Decoding goes through the verified-token cache, so keyed requests don't pay
+    for a second signature check. Invalid or expired tokens fall back to the IP.
+    """
+    header = request.headers.get("Authorization", "")
+    if header.startswith("Bearer "):
+        try:
+            return f"user:{decode_token(header[7:])['sub']}"
+        except Exception:
+            pass
+    return f"ip:{get_remote_address()}"
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """
+    Counter storage in a local SQLite file, shared by every worker on the host.
+
+    Use a path on tmpfs (e.g. sqlite:////dev/shm/ratelimit.sqlite) to keep it in
+    shared memory. Each process/thread opens its own connection; writes are
+    short IMMEDIATE transactions under WAL, so there's no network round trip.
+    Supports the fixed-window and sliding-window-counter strategies.
+
+    Built against limits' storage interface as of the version pinned in
+    requirements.txt. Needs SQLite 3.35+ (UPSERT ... RETURNING).
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+    MIN_SQLITE_VERSION = (3, 35, 0)
+
+    # Delete expired rows about once every this many increments
+    CLEANUP_EVERY = 1000
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        if sqlite3.sqlite_version_info < self.MIN_SQLITE_VERSION:
+            raise ConfigurationError(
+                f"SQLite rate-limit storage needs SQLite 3.35+, found {sqlite3.sqlite_version}"
+            )
+        # Same convention as SQLAlchemy: sqlite:///relative.db, sqlite:////absolute/path.db
+        self.path = uri.split("://", 1)[1][1:]
+        self._local = threading.local()
+        self._writes = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS counters "
+                "(key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections can't cross threads or survive fork()
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        # IMMEDIATE takes the write lock up front, so reads inside see no concurrent writes
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _incr(self, connection: sqlite3.Connection, key: str, expiry: float, amount: int, now: float) -> int:
+        connection.execute("DELETE FROM counters WHERE key = ? AND expires_at <= ?", (key, now))
+        value = connection.execute(
+            "INSERT INTO counters (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value RETURNING value",
+            (key, amount, now + expiry)
+        ).fetchone()[0]
+        self._writes += 1
+        if self._writes % self.CLEANUP_EVERY == 0:
+            connection.execute("DELETE FROM counters WHERE expires_at <= ?", (now,))
+        return value
+
+    def _get(self, connection: sqlite3.Connection, key: str, now: float) -> int:
+        row = connection.execute(
+            "SELECT value FROM counters WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        with self._transaction() as connection:
+            return self._incr(connection, key, expiry, amount, time.time())
+
+    def decr(self, key: str, amount: int = 1) -> int:
+        row = self._connection().execute(
+            "UPDATE counters SET value = max(value - ?, 0) WHERE key = ? AND expires_at > ? RETURNING value",
+            (amount, key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get(self, key: str) -> int:
+        return self._get(self._connection(), key, time.time())
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        row = self._connection().execute(
+            "SELECT expires_at FROM counters WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    def clear(self, key: str) -> None:
+        self._connection().execute("DELETE FROM counters WHERE key = ?", (key,))
+
+    def check(self) -> bool:
+        try:
+            self._connection().execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int:
+        return self._connection().execute("DELETE FROM counters").rowcount
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        # Same weighted two-window algorithm as limits' MemoryStorage. The check
+        # and the increment share one write transaction, so concurrent workers
+        # can't both pass the check on the last free entry.
+        if amount > limit:
+            return False
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        with self._transaction() as connection:
+            previous_count, previous_ttl, current_count, _ = self._sliding_window_info(
+                connection, previous_key, current_key, expiry, now
+            )
+            if floor(previous_count * previous_ttl / expiry + current_count) + amount > limit:
+                return False
+            self._incr(connection, current_key, 2 * expiry, amount, now)
+        return True
+
+    def get_sliding_window(self, key: str, expiry: int):
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        return self._sliding_window_info(self._connection(), previous_key, current_key, expiry, now)
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self.clear(previous_key)
+        self.clear(current_key)
+
+    def _sliding_window_info(self, connection: sqlite3.Connection, previous_key: str, current_key: str,
+                             expiry: int, now: float):
+        previous_count = self._get(connection, previous_key, now)
+        current_count = self._get(connection, current_key, now)
+        previous_ttl = 0.0 if previous_count == 0 else (1 - (((now - expiry) / expiry) % 1)) * expiry
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
@@ -0,0 +1,67 @@
+# app/utils/startup.py
+import gc
+import importlib
+import os
+import pkgutil
+from pydantic import BaseModel
+from sqlalchemy.orm import configure_mappers
+
+
+def running_cli() -> bool:
+    """
+    True while a `flask ...` management command loads the app (Flask sets
+    FLASK_RUN_FROM_CLI before calling the factory). `flask run` serves
+    requests like a web worker, so it doesn't count.
+    """
+    if os.environ.get("FLASK_RUN_FROM_CLI") != "true":
+        return False
+    import click
+    context = click.get_current_context(silent=True)
+    return context is None or context.command.name != "run"
+
+
+def warm_up(app) -> int:
+    """
+    Do the work create_app leaves to first use: build the deferred pydantic
+    validators and configure the ORM mappers. Returns the number of schemas built.
+    """
+    from app import schemas
+
+    built = 0
+    for module_info in pkgutil.iter_modules(schemas.__path__, schemas.__name__ + "."):
+        module = importlib.import_module(module_info.name)
+        for value in vars(module).values():
+            if (isinstance(value, type) and issubclass(value, BaseModel) and value is not BaseModel
+                    and not value.__pydantic_complete__):
+                value.model_rebuild()
+                built += 1
+    configure_mappers()
+    return built
+
+
+def prepare_fork(app):
+    """
+    Get a preloaded app ready to be forked into workers.
+
+    Warmed-up state is then shared copy-on-write, and frozen objects are left
+    out of later collections, which would otherwise write to (and so copy)
+    every page holding them in each worker.
+    """
+    from app.extensions import db
+
+    warm_up(app)
+    with app.app_context():
+        # Connections opened while loading must not be shared with the workers
+        for engine in db.engines.values():
+            engine.dispose()
+    gc.collect()
+    gc.freeze()
+
+
+def after_fork(app):
+    """Drop pooled connections a forked worker inherited, without closing the parent's sockets"""
+    from app.extensions import db
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
@@ -0,0 +1,36 @@
+# app/utils/streaming.py
+import logging
+from app.utils.codec import encode
+
+logger = logging.getLogger(__name__)
+
+# Flush to the client roughly every this many bytes
+CHUNK_SIZE = 64 * 1024
+
+
+def stream_json_list(key, items, serialize, chunk_size=CHUNK_SIZE):
+    """
+    Yield {"<key>": [...]} as JSON text chunks, serializing one item at a time.
+
+    Only the current chunk is held in memory. Errors after the first chunk
+    can't change the status code, so they are logged and the body is left
+    truncated (invalid JSON) rather than silently complete.
+    """
+    buffer = [f'{{"{key}":[']
+    size = 0
+    separator = ""
+    try:
+        for item in items:
+            encoded = separator + encode(serialize(item)).decode()
+            separator = ","
+            buffer.append(encoded)
+            size += len(encoded)
+            if size >= chunk_size:
+                yield "".join(buffer)
+                buffer, size = [], 0
+    except Exception:
+        logger.exception("Streaming %s failed mid-response", key)
+        yield "".join(buffer)
+        return
+    buffer.append("]}")
+    yield "".join(buffer)
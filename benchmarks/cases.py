@@ -0,0 +1,154 @@
+# benchmarks/cases.py
+import json
+import random
+from itertools import islice
+from typing import List
+from app.extensions import db
+from app.models.category import Category
+from app.models.product import Product
+from app.schemas.product_schemas import ProductCreateSchema
+from app.services.auth_service import AuthService
+from app.services.cache_service import get_cache
+from app.services.category_service import CategoryService
+from app.services.product_service import ProductService
+from app.utils.codec import encode
+from app.utils.pagination import encode_cursor
+from benchmarks.dataset import ADMIN_EMAIL, ADMIN_PASSWORD
+from benchmarks.harness import Case
+
+PAGE_SIZE = 50
+SERIALIZE_BATCH = 100
+# A full streamed/exported list, well past one page
+LARGE_BATCH = 1000
+# Password hashing dominates these; a few calls give stable percentiles
+AUTH_ITERATIONS = 10
+
+
+def build_cases(app, seed: int = 42) -> List[Case]:
+    """Service, serialization, route and auth cases against the catalog in the current app's database"""
+    rng = random.Random(seed)
+    client = app.test_client()
+
+    login = client.post("/api/v1/auth/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}).get_json()
+    headers = {"Authorization": f"Bearer {login['access_token']}"}
+    refresh_headers = {"Authorization": f"Bearer {login['refresh_token']}"}
+
+    low, high = db.session.query(db.func.min(Product.id), db.func.max(Product.id)).one()
+    product_ids = [rng.randint(low, high) for _ in range(64)]
+    total = db.session.query(db.func.count(Product.id)).scalar()
+    middle = db.session.query(Product.created_at, Product.id).filter_by(is_active=True).order_by(
+        Product.created_at.desc(), Product.id.desc()
+    ).offset(total // 2).first()
+    deep_cursor = encode_cursor(*middle)
+    category = db.session.query(Category.name).order_by(Category.id).first()[0]
+    category_id = db.session.query(Category.id).order_by(Category.id).first()[0]
+
+    serialized = ProductService.get_all_products(limit=SERIALIZE_BATCH)[0]
+    large = list(islice(ProductService.iter_products(), LARGE_BATCH))
+    large_payload = {"products": [product.to_dict() for product in large]}
+    db.session.expunge_all()
+    create_body = json.dumps({"name": "Benchmark Phone", "price": 499.0, "colors": ["Black", "Silver"],
+                              "tags": ["Budget", "5G"], "category_name": category}).encode()
+
+    products_etag = client.get(f"/api/v1/products/?limit={PAGE_SIZE}", headers=headers).headers.get("ETag")
+
+    def next_id():
+        return rng.choice(product_ids)
+
+    def fresh_session():
+        # Each call gets its own session, as a request would
+        db.session.remove()
+
+    def cold():
+        db.session.remove()
+        get_cache().clear()
+
+    return [
+        # Service layer (session reset per call, no app cache)
+        Case("service.get_all_products.first_page",
+             lambda: ProductService.get_all_products(limit=PAGE_SIZE), fresh_session),
+        Case("service.get_all_products.deep_page",
+             lambda: ProductService.get_all_products(cursor=deep_cursor, limit=PAGE_SIZE), fresh_session),
+        Case("service.get_all_products.tag_filter",
+             lambda: ProductService.get_all_products(limit=PAGE_SIZE, tags=["Flagship"]), fresh_session),
+        Case("service.get_products_by_category",
+             lambda: ProductService.get_products_by_category(category, limit=PAGE_SIZE), fresh_session),
+        Case("service.search_products",
+             lambda: ProductService.search_products("samsung ultra", limit=PAGE_SIZE), fresh_session),
+        Case("service.get_product_by_id",
+             lambda: ProductService.get_product_by_id(next_id()), fresh_session),
+        Case("service.list_products_data.cold",
+             lambda: ProductService.list_products_data(limit=PAGE_SIZE), cold),
+        Case("service.list_products_data.warm",
+             lambda: ProductService.list_products_data(limit=PAGE_SIZE), fresh_session),
+        Case("service.get_all_categories",
+             CategoryService.get_all_categories, fresh_session),
+        Case("service.get_category_by_id",
+             lambda: CategoryService.get_category_by_id(category_id), fresh_session),
+
+        # Serialization of already loaded rows
+        Case(f"serialize.to_dict.{SERIALIZE_BATCH}",
+             lambda: [product.to_dict() for product in serialized]),
+        Case(f"serialize.to_dict_json.{SERIALIZE_BATCH}",
+             lambda: json.dumps([product.to_dict() for product in serialized])),
+        Case(f"serialize.to_dict_codec.{SERIALIZE_BATCH}",
+             lambda: encode([product.to_dict() for product in serialized])),
+        Case(f"serialize.to_dict_json.{LARGE_BATCH}",
+             lambda: json.dumps([product.to_dict() for product in large])),
+        Case(f"serialize.to_dict_codec.{LARGE_BATCH}",
+             lambda: encode([product.to_dict() for product in large])),
+
+        # Encoding an already built (cached) list body: Flask's default provider vs the app's
+        Case(f"encode.cached_list.json.{LARGE_BATCH}",
+             lambda: json.dumps(large_payload, sort_keys=True, separators=(",", ":"))),
+        Case(f"encode.cached_list.codec.{LARGE_BATCH}",
+             lambda: app.json.dumps(large_payload)),
+
+        # Request body validation: via a parsed dict vs straight from the raw bytes
+        Case("decode.product_create.dict",
+             lambda: ProductCreateSchema(**json.loads(create_body))),
+        Case("decode.product_create.raw",
+             lambda: ProductCreateSchema.model_validate_json(create_body)),
+
+        # Routes through the test client
+        Case("route.products.list.cold",
+             lambda: _get(client, f"/api/v1/products/?limit={PAGE_SIZE}", headers), cold),
+        Case("route.products.list.warm",
+             lambda: _get(client, f"/api/v1/products/?limit={PAGE_SIZE}", headers)),
+        Case("route.products.list.not_modified",
+             lambda: _get(client, f"/api/v1/products/?limit={PAGE_SIZE}",
+                          {**headers, "If-None-Match": products_etag}, expect=304)),
+        Case("route.products.search.cold",
+             lambda: _get(client, f"/api/v1/products/?search=samsung+ultra&limit={PAGE_SIZE}", headers), cold),
+        Case("route.products.category.cold",
+             lambda: _get(client, f"/api/v1/products/?category={category}&limit={PAGE_SIZE}", headers), cold),
+        Case("route.products.detail.cold",
+             lambda: _get(client, f"/api/v1/products/{next_id()}", headers), cold),
+        Case("route.categories.list.cold",
+             lambda: _get(client, "/api/v1/categories/", headers), cold),
+
+        # Auth
+        Case("route.auth.login",
+             lambda: _post(client, "/api/v1/auth/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}),
+             iterations=AUTH_ITERATIONS),
+        Case("route.auth.me", lambda: _get(client, "/api/v1/auth/me", headers)),
+        Case("route.auth.refresh", lambda: _post(client, "/api/v1/auth/refresh", headers=refresh_headers)),
+        Case("service.authenticate",
+             lambda: AuthService.authenticate(ADMIN_EMAIL, ADMIN_PASSWORD), fresh_session,
+             iterations=AUTH_ITERATIONS),
+    ]
+
+
+def _get(client, url, headers, expect=200):
+    return _check(client.get(url, headers=headers), expect, url)
+
+
+def _post(client, url, expect=200, **kwargs):
+    return _check(client.post(url, **kwargs), expect, url)
+
+
+def _check(response, expect, url):
+    # A benchmark of an error page is worthless, so fail loudly
+    if response.status_code != expect:
+        raise RuntimeError(f"{url} returned {response.status_code}, expected {expect}: {response.get_data(as_text=True)[:200]}")
+    return response
@@ -0,0 +1,33 @@
+# benchmarks/dataset.py
+from app.extensions import db
+from app.models.product import Product
+from app.seed import CATEGORY_NAMES, seed_catalog
+from app.services.auth_service import AuthService
+
+ADMIN_EMAIL = "admin@gmail.com"
+ADMIN_PASSWORD = "123456"
+
+
+def build_catalog(size: int, seed: int = 42, echo=print) -> dict:
+    """
+    Create the schema and a catalog of exactly size products, unless the database already has it.
+
+    Rows come from the bulk seeder with a fixed seed, so the same size and
+    seed always give the same catalog.
+    """
+    db.create_all()
+    admin = AuthService.create_admin_user(email=ADMIN_EMAIL, password=ADMIN_PASSWORD)
+    if admin is None:
+        raise RuntimeError("Could not create the benchmark admin user")
+
+    existing = db.session.query(db.func.count(Product.id)).scalar()
+    if existing == size:
+        echo(f"Reusing catalog of {size} products")
+    elif existing:
+        raise RuntimeError(f"Database already holds {existing} products, not {size}; use a fresh database")
+    else:
+        echo(f"Building catalog of {size} products (seed {seed})...")
+        seed_catalog(products=size, categories=len(CATEGORY_NAMES), random_seed=seed,
+                     uploader_email=ADMIN_EMAIL, echo=echo)
+
+    return {'size': size, 'seed': seed, 'admin_id': admin.id}
@@ -0,0 +1,121 @@
+# benchmarks/harness.py
+import gc
+import math
+import time
+import tracemalloc
+from typing import Callable, List, Optional
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """Counts statements executed on an engine while active"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _count(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, 'before_cursor_execute', self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._count)
+
+
+class Case:
+    """
+    One benchmarked operation.
+
+    setup runs before every call, outside the timing (e.g. to clear a cache),
+    and iterations overrides the run-wide count for expensive cases.
+    """
+
+    def __init__(self, name: str, fn: Callable, setup: Optional[Callable] = None,
+                 iterations: Optional[int] = None):
+        self.name = name
+        self.fn = fn
+        self.setup = setup
+        self.iterations = iterations
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def measure(case: Case, engine, iterations: int, warmup: int = 3) -> dict:
+    """
+    Time a case and return its latency percentiles, queries per call and peak memory.
+
+    Timed calls run with tracemalloc off; peak memory comes from one extra
+    traced call, so tracing overhead never lands in the latencies.
+    """
+    iterations = case.iterations or iterations
+    for _ in range(min(warmup, iterations)):
+        _call(case)
+
+    timings = []
+    gc.collect()
+    with QueryCounter(engine) as queries:
+        for _ in range(iterations):
+            if case.setup:
+                case.setup()
+            started = time.perf_counter()
+            case.fn()
+            timings.append(time.perf_counter() - started)
+    statements = queries.count
+
+    if case.setup:
+        case.setup()
+    tracemalloc.start()
+    try:
+        case.fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        'name': case.name,
+        'iterations': iterations,
+        'p50_ms': round(percentile(timings, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(timings, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(timings, 0.99) * 1000, 3),
+        'mean_ms': round(sum(timings) / len(timings) * 1000, 3),
+        # setup() statements are included; the cases keep setup free of queries
+        'queries': round(statements / iterations, 2),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def _call(case: Case):
+    if case.setup:
+        case.setup()
+    case.fn()
+
+
+def compare(results: List[dict], baseline: List[dict], threshold: float) -> List[dict]:
+    """
+    Pair each result with its baseline entry.
+
+    A case regresses when its p50 grows by more than threshold (a fraction) or
+    it runs more queries than before.
+    """
+    previous = {entry['name']: entry for entry in baseline}
+    rows = []
+    for result in results:
+        before = previous.get(result['name'])
+        row = {'name': result['name'], 'before': before, 'after': result, 'p50_change': None, 'regressed': False}
+        if before:
+            if before['p50_ms']:
+                row['p50_change'] = (result['p50_ms'] - before['p50_ms']) / before['p50_ms']
+            row['regressed'] = ((row['p50_change'] or 0) > threshold
+                                or result['queries'] > before['queries'])
+        rows.append(row)
+    return rows
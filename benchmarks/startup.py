@@ -0,0 +1,243 @@
+# benchmarks/startup.py
+"""
+Report startup latency, import cost and per-worker memory.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --workers 8 --runs 10
+
+Every measurement runs in fresh interpreters. Boot times are medians over
+--runs processes, for a web worker and for a `flask` CLI process; worker
+memory comes from forking --workers children off a preloaded app (as
+gunicorn --preload does) and off a bare interpreter that builds the app per
+worker. Results are saved to benchmarks/results/startup.json and compared
+with the previous run.
+
+What create_app defers is limited: web workers skip Flask-Migrate/alembic,
+the CLI commands and, unless enabled, the metrics and SQL profiler modules,
+and pydantic validators are built on first use. Every blueprint, the
+services and schemas they import, and the models are still imported
+eagerly, since routes must be registered before serving. Most of the
+remaining boot time is SQLAlchemy, which any worker needs. The large win is
+per-worker memory when preloading, not import time.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+RESULTS_PATH = os.path.join(RESULTS_DIR, "startup.json")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per boot measurement.")
+    parser.add_argument("--workers", type=int, default=4, help="Forked workers per memory measurement.")
+    parser.add_argument("--requests", type=int, default=20, help="Requests each worker serves before measuring.")
+    parser.add_argument("--top", type=int, default=12, help="Packages to list in the import report.")
+    parser.add_argument("--no-save", action="store_true", help="Don't write the results file.")
+    parser.add_argument("--child", choices=["boot", "workers"], help=argparse.SUPPRESS)
+    parser.add_argument("--preload", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def child_environment(cli: bool = False) -> dict:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URI", "sqlite:///" + os.path.join(tempfile.gettempdir(), "im-startup.sqlite"))
+    # Measure the app, not an unreachable Redis from .env
+    env.setdefault("CACHE_SHARED_URL", "")
+    env.setdefault("BLOCKLIST_URL", "memory://")
+    env.pop("FLASK_RUN_FROM_CLI", None)
+    if cli:
+        env["FLASK_RUN_FROM_CLI"] = "true"
+    return env
+
+
+def run_child(args, cli: bool = False) -> dict:
+    output = subprocess.run([sys.executable, "-m", "benchmarks.startup", *args], cwd=ROOT,
+                            env=child_environment(cli), capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def memory() -> dict:
+    """This process's RSS, PSS and private (USS) memory in KiB"""
+    try:
+        with open(f"/proc/{os.getpid()}/smaps_rollup") as f:
+            fields = {line.split(':')[0]: int(line.split()[1]) for line in f if line.split()[-1] == 'kB'}
+        return {'rss_kib': fields['Rss'], 'pss_kib': fields['Pss'],
+                'uss_kib': fields['Private_Clean'] + fields['Private_Dirty']}
+    except (OSError, KeyError):
+        import resource
+        # Peak RSS only: KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak = peak // 1024 if sys.platform == "darwin" else peak
+        return {'rss_kib': peak, 'pss_kib': None, 'uss_kib': None}
+
+
+def serve(app, count: int):
+    """Push requests through the app that touch routing, JWT checks and request validation"""
+    from app.extensions import limiter
+    # Repeated runs from one client would otherwise end up measuring 429s
+    limiter.enabled = False
+    client = app.test_client()
+    for _ in range(count):
+        client.get("/api/v1/categories/")
+        client.post("/api/v1/auth/login", json={})
+
+
+def child_boot():
+    started = time.perf_counter()
+    import app as package
+    imported = time.perf_counter()
+    app = package.create_app()
+    created = time.perf_counter()
+    from app.utils.startup import warm_up
+    warm_up(app)
+    warmed = time.perf_counter()
+    print(json.dumps({
+        'import_ms': (imported - started) * 1000,
+        'create_app_ms': (created - imported) * 1000,
+        'warm_up_ms': (warmed - created) * 1000,
+        'modules': len(sys.modules),
+        **memory(),
+    }))
+
+
+def child_workers(count: int, requests: int, preload: bool):
+    app = None
+    if preload:
+        from app import create_app
+        from app.utils.startup import prepare_fork
+        app = create_app()
+        prepare_fork(app)
+
+    pipes = []
+    for _ in range(count):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            if app is None:
+                from app import create_app
+                worker_app = create_app()
+            else:
+                from app.utils.startup import after_fork
+                worker_app = app
+                after_fork(worker_app)
+            serve(worker_app, requests)
+            with os.fdopen(write_fd, 'w') as f:
+                json.dump(memory(), f)
+            os._exit(0)
+        os.close(write_fd)
+        pipes.append((pid, read_fd))
+
+    workers = []
+    for pid, read_fd in pipes:
+        with os.fdopen(read_fd) as f:
+            workers.append(json.load(f))
+        os.waitpid(pid, 0)
+    print(json.dumps({'parent': memory(), 'workers': workers}))
+
+
+def boot_times(runs: int, cli: bool) -> dict:
+    samples = [run_child(["--child", "boot"], cli=cli) for _ in range(runs)]
+    return {key: round(statistics.median(sample[key] for sample in samples), 1) for key in samples[0]
+            if samples[0][key] is not None}
+
+
+def cli_latency(runs: int) -> float:
+    """Median wall time of `flask --app manage --help`, which loads the app and every command"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "flask", "--app", "manage", "--help"], cwd=ROOT,
+                       env=child_environment(), capture_output=True, check=True)
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 1)
+
+
+def import_profile(top: int) -> list:
+    """Self import time summed per top-level package for importing the app and calling create_app"""
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app; app.create_app()"],
+                            cwd=ROOT, env=child_environment(), capture_output=True, text=True, check=True)
+    totals = defaultdict(int)
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        totals[name.strip().split(".")[0]] += int(self_us)
+    ranked = sorted(totals.items(), key=lambda item: -item[1])[:top]
+    return [{'package': name, 'ms': round(us / 1000, 1)} for name, us in ranked]
+
+
+def worker_memory(count: int, requests: int, preload: bool) -> dict:
+    args = ["--child", "workers", "--workers", str(count), "--requests", str(requests)]
+    result = run_child(args + (["--preload"] if preload else []))
+    summary = {'parent_rss_kib': result['parent']['rss_kib']}
+    for key in ('rss_kib', 'pss_kib', 'uss_kib'):
+        values = [worker[key] for worker in result['workers'] if worker[key] is not None]
+        if values:
+            summary[f"worker_{key}"] = round(statistics.mean(values))
+    return summary
+
+
+def print_section(title: str, current: dict, previous: dict):
+    print(title)
+    for key, value in current.items():
+        before = previous.get(key)
+        change = f"   (was {before:g})" if before is not None and before != value else ""
+        print(f"  {key:<20}{value:>10g}{change}")
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.child == "boot":
+        child_boot()
+        return 0
+    if args.child == "workers":
+        child_workers(args.workers, args.requests, args.preload)
+        return 0
+
+    results = {
+        'python': sys.version.split()[0],
+        'web': boot_times(args.runs, cli=False),
+        'cli': boot_times(args.runs, cli=True),
+        'flask_help_ms': cli_latency(args.runs),
+        'workers_preloaded': worker_memory(args.workers, args.requests, preload=True),
+        'workers_fresh': worker_memory(args.workers, args.requests, preload=False),
+        'imports': import_profile(args.top),
+    }
+
+    previous = {}
+    if os.path.exists(RESULTS_PATH):
+        with open(RESULTS_PATH) as f:
+            previous = json.load(f)
+
+    print_section("Web worker boot (median ms, KiB)", results['web'], previous.get('web', {}))
+    print_section("CLI process boot (median ms, KiB)", results['cli'], previous.get('cli', {}))
+    print_section("flask --help", {'wall_ms': results['flask_help_ms']},
+                  {'wall_ms': previous['flask_help_ms']} if 'flask_help_ms' in previous else {})
+    print_section(f"{args.workers} workers forked from a preloaded app (mean KiB)",
+                  results['workers_preloaded'], previous.get('workers_preloaded', {}))
+    print_section(f"{args.workers} workers building their own app (mean KiB)",
+                  results['workers_fresh'], previous.get('workers_fresh', {}))
+    print("Import time by package (self ms)")
+    for entry in results['imports']:
+        print(f"  {entry['package']:<20}{entry['ms']:>10g}")
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        with open(RESULTS_PATH, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved {RESULTS_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+# gunicorn.conf.py
+# gunicorn -c gunicorn.conf.py
+import multiprocessing
+import os
+
+wsgi_app = "run:app"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# Import and build the app once in the master; workers fork from it and share its pages
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() in ("true", "1", "yes")
+accesslog = "-"
+
+
+def when_ready(server):
+    # Runs in the master after the app is loaded and before the first worker is forked
+    if preload_app:
+        from app.utils.startup import prepare_fork
+        prepare_fork(server.app.wsgi())
+
+
+def post_fork(server, worker):
+    if preload_app:
+        from app.utils.startup import after_fork
+        after_fork(worker.app.wsgi())
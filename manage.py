@@ -1,10 +1,7 @@
+# manage.py
+# CLI entry point, e.g. `flask --app manage db upgrade`: Flask finds the
+# create_app factory and calls it once, only for commands that need the app.
 from app import create_app
-from app.extensions import db
-from flask_migrate import Migrate
 
-app = create_app()
-migrate = Migrate(app, db)
-
-# Only needed so Flask CLI can discover `app`
 if __name__ == "__main__":
-    app.run()
+    create_app().run()
@@ -51,6 +51,22 @@ def get_metadata():
     return target_db.metadata
 
 
+def include_name(name, type_, parent_names):
+    # The product search index (and its FTS5 shadow tables) is managed outside
+    # the models, so keep autogenerate from proposing to drop it.
+    if type_ == "table":
+        return not name.startswith("product_search")
+    return True
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Only compare the variant of a lower(name) index this backend actually builds
+    if type_ == "index" and not reflected and "functional" in object.info:
+        from app.models.indexes import supports_functional_indexes
+        return object.info["functional"] == supports_functional_indexes(get_engine().dialect)
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -93,6 +109,8 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_name", include_name)
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
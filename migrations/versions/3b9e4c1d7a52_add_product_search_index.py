@@ -0,0 +1,54 @@
+"""Add product full-text search index
+
+Revision ID: 3b9e4c1d7a52
+Revises: 072dfc0650ad
+Create Date: 2026-10-18 09:12:40.118532
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b9e4c1d7a52'
+down_revision = '072dfc0650ad'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite gets an FTS5 virtual table, MySQL an InnoDB FULLTEXT table;
+    # other backends fall back to LIKE search and need no index.
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE product_search "
+            "USING fts5(name, tags, category, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "INSERT INTO product_search (rowid, name, tags, category) "
+            "SELECT p.id, p.name, p.tags_json, c.name FROM products p "
+            "JOIN categories c ON c.id = p.category_id WHERE p.is_active = 1"
+        )
+    elif dialect == 'mysql':
+        op.execute(
+            "CREATE TABLE product_search ("
+            "product_id INT NOT NULL PRIMARY KEY, "
+            "name VARCHAR(200) NOT NULL, "
+            "tags TEXT, "
+            "category VARCHAR(100), "
+            "FULLTEXT KEY ft_product_search (name, tags, category)"
+            ") ENGINE=InnoDB"
+        )
+        op.execute(
+            "INSERT INTO product_search (product_id, name, tags, category) "
+            "SELECT p.id, p.name, p.tags_json, c.name FROM products p "
+            "JOIN categories c ON c.id = p.category_id WHERE p.is_active = 1"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect in ('sqlite', 'mysql'):
+        op.execute("DROP TABLE product_search")
@@ -0,0 +1,57 @@
+"""Add composite and normalized-name indexes for products and categories
+
+Revision ID: 5c2d8e9f0b14
+Revises: a4f81c27e9d3
+Create Date: 2026-10-18 13:02:51.774310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c2d8e9f0b14'
+down_revision = 'a4f81c27e9d3'
+branch_labels = None
+depends_on = None
+
+
+def _create_lower_name_index(index_name, table_name):
+    # MySQL gained functional key parts in 8.0.13 and MariaDB has none; those get
+    # a plain index instead, usable by their case-insensitive collations
+    dialect = op.get_bind().dialect
+    functional = dialect.name != 'mysql' or (
+        not getattr(dialect, 'is_mariadb', False)
+        and (dialect.server_version_info or (0,)) >= (8, 0, 13)
+    )
+    if functional:
+        # A functional key part must sit in its own parentheses on MySQL
+        op.create_index(index_name, table_name, [sa.text('(lower(name))')], unique=False)
+    else:
+        op.create_index(index_name, table_name, ['name'], unique=False)
+
+
+def upgrade():
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.create_index('ix_products_is_active_created_at', ['is_active', 'created_at'], unique=False)
+        batch_op.create_index('ix_products_category_id_is_active_created_at', ['category_id', 'is_active', 'created_at'], unique=False)
+        batch_op.create_index('ix_products_uploader_id', ['uploader_id'], unique=False)
+
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.create_index('ix_categories_is_active_name', ['is_active', 'name'], unique=False)
+
+    _create_lower_name_index('ix_products_name_lower', 'products')
+    _create_lower_name_index('ix_categories_name_lower', 'categories')
+
+
+def downgrade():
+    op.drop_index('ix_categories_name_lower', table_name='categories')
+    op.drop_index('ix_products_name_lower', table_name='products')
+
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.drop_index('ix_categories_is_active_name')
+
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_index('ix_products_uploader_id')
+        batch_op.drop_index('ix_products_category_id_is_active_created_at')
+        batch_op.drop_index('ix_products_is_active_created_at')
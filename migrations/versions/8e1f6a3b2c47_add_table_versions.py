@@ -0,0 +1,36 @@
+"""Add per-table change versions for conditional GETs
+
+Revision ID: 8e1f6a3b2c47
+Revises: 5c2d8e9f0b14
+Create Date: 2026-10-18 14:25:17.903216
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e1f6a3b2c47'
+down_revision = '5c2d8e9f0b14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    table_versions = op.create_table('table_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    now = datetime.utcnow()
+    op.bulk_insert(table_versions, [
+        {'name': 'products', 'version': 1, 'updated_at': now},
+        {'name': 'categories', 'version': 1, 'updated_at': now},
+    ])
+
+
+def downgrade():
+    op.drop_table('table_versions')
@@ -0,0 +1,200 @@
+"""Normalize product tags and colors into link tables
+
+Revision ID: a4f81c27e9d3
+Revises: 3b9e4c1d7a52
+Create Date: 2026-10-18 11:40:05.532917
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4f81c27e9d3'
+down_revision = '3b9e4c1d7a52'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+# The search index of 3b9e4c1d7a52 was filled from the raw tags_json text;
+# it is refilled from the link tables, tags space-separated
+SEARCH_BACKFILL_SQL = {
+    'sqlite': (
+        "INSERT INTO product_search (rowid, name, tags, category) "
+        "SELECT p.id, p.name, (SELECT group_concat(t.name, ' ') FROM product_tags pt "
+        "JOIN tags t ON t.id = pt.tag_id WHERE pt.product_id = p.id), c.name FROM products p "
+        "JOIN categories c ON c.id = p.category_id WHERE p.is_active = 1"
+    ),
+    'mysql': (
+        "INSERT INTO product_search (product_id, name, tags, category) "
+        "SELECT p.id, p.name, (SELECT GROUP_CONCAT(t.name SEPARATOR ' ') FROM product_tags pt "
+        "JOIN tags t ON t.id = pt.tag_id WHERE pt.product_id = p.id), c.name FROM products p "
+        "JOIN categories c ON c.id = p.category_id WHERE p.is_active = 1"
+    ),
+}
+
+products = sa.table(
+    'products',
+    sa.column('id', sa.Integer),
+    sa.column('colors_json', sa.Text),
+    sa.column('tags_json', sa.Text),
+)
+tags = sa.table('tags', sa.column('id', sa.Integer), sa.column('name', sa.String))
+colors = sa.table('colors', sa.column('id', sa.Integer), sa.column('name', sa.String))
+product_tags = sa.table(
+    'product_tags',
+    sa.column('product_id', sa.Integer),
+    sa.column('tag_id', sa.Integer),
+    sa.column('position', sa.Integer),
+)
+product_colors = sa.table(
+    'product_colors',
+    sa.column('product_id', sa.Integer),
+    sa.column('color_id', sa.Integer),
+    sa.column('position', sa.Integer),
+)
+
+
+def _names(raw):
+    try:
+        values = json.loads(raw) if raw else []
+    except ValueError:
+        return []
+    # Drop duplicates (case-insensitively, to suit MySQL collations) but keep order
+    seen, names = set(), []
+    for value in values if isinstance(values, list) else []:
+        name = str(value).strip()
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+
+def _backfill(bind, json_column, name_table, link_table, fk_column):
+    """Copy one JSON list column into its name and link tables in id-ordered batches"""
+    ids_by_name = {}
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(products.c.id, products.c[json_column])
+            .where(products.c.id > last_id)
+            .order_by(products.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        parsed = [(product_id, _names(raw)) for product_id, raw in rows]
+        new_names = list({
+            name.lower(): name for _, names in parsed for name in names
+            if name.lower() not in ids_by_name
+        }.values())
+        if new_names:
+            bind.execute(name_table.insert(), [{'name': name} for name in new_names])
+            for row_id, name in bind.execute(
+                sa.select(name_table.c.id, name_table.c.name).where(name_table.c.name.in_(new_names))
+            ):
+                ids_by_name[name.lower()] = row_id
+
+        links = [
+            {'product_id': product_id, fk_column: ids_by_name[name.lower()], 'position': position}
+            for product_id, names in parsed
+            for position, name in enumerate(names)
+        ]
+        if links:
+            bind.execute(link_table.insert(), links)
+
+
+def _restore(bind, json_column, name_table, link_table, fk_column):
+    """Rebuild one JSON list column from its link table"""
+    rows = bind.execute(
+        sa.select(link_table.c.product_id, name_table.c.name)
+        .select_from(link_table.join(name_table, name_table.c.id == link_table.c[fk_column]))
+        .order_by(link_table.c.product_id, link_table.c.position)
+    )
+    values = {}
+    for product_id, name in rows:
+        values.setdefault(product_id, []).append(name)
+    for product_id, names in values.items():
+        bind.execute(
+            products.update().where(products.c.id == product_id).values({json_column: json.dumps(names)})
+        )
+
+
+def _rebuild_search_index(bind):
+    """Refill product_search (SQLite and MySQL only) from the link tables"""
+    backfill_sql = SEARCH_BACKFILL_SQL.get(bind.dialect.name)
+    if backfill_sql is None:
+        return
+    bind.execute(sa.text("DELETE FROM product_search"))
+    bind.execute(sa.text(backfill_sql))
+
+
+def upgrade():
+    op.create_table('tags',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('colors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('product_tags',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ),
+    sa.PrimaryKeyConstraint('product_id', 'tag_id')
+    )
+    with op.batch_alter_table('product_tags', schema=None) as batch_op:
+        batch_op.create_index('ix_product_tags_tag_id_product_id', ['tag_id', 'product_id'], unique=False)
+
+    op.create_table('product_colors',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('color_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['color_id'], ['colors.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('product_id', 'color_id')
+    )
+    with op.batch_alter_table('product_colors', schema=None) as batch_op:
+        batch_op.create_index('ix_product_colors_color_id_product_id', ['color_id', 'product_id'], unique=False)
+
+    bind = op.get_bind()
+    _backfill(bind, 'tags_json', tags, product_tags, 'tag_id')
+    _backfill(bind, 'colors_json', colors, product_colors, 'color_id')
+    _rebuild_search_index(bind)
+
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_column('tags_json')
+        batch_op.drop_column('colors_json')
+
+
+def downgrade():
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('colors_json', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('tags_json', sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    _restore(bind, 'tags_json', tags, product_tags, 'tag_id')
+    _restore(bind, 'colors_json', colors, product_colors, 'color_id')
+
+    with op.batch_alter_table('product_colors', schema=None) as batch_op:
+        batch_op.drop_index('ix_product_colors_color_id_product_id')
+
+    op.drop_table('product_colors')
+    with op.batch_alter_table('product_tags', schema=None) as batch_op:
+        batch_op.drop_index('ix_product_tags_tag_id_product_id')
+
+    op.drop_table('product_tags')
+    op.drop_table('colors')
+    op.drop_table('tags')
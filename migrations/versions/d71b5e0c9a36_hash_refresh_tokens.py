@@ -0,0 +1,85 @@
+"""Store refresh tokens as jti hashes, one row per session
+
+Revision ID: d71b5e0c9a36
+Revises: 8e1f6a3b2c47
+Create Date: 2026-10-18 16:02:44.381905
+
+"""
+import base64
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd71b5e0c9a36'
+down_revision = '8e1f6a3b2c47'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+refresh_tokens = sa.table(
+    'refresh_tokens',
+    sa.column('id', sa.Integer),
+    sa.column('token', sa.String),
+    sa.column('token_hash', sa.CHAR),
+)
+
+
+def _jti_hash(token):
+    """sha256 of the jti in a stored JWT, read without verifying (the row is trusted)"""
+    try:
+        payload = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return hashlib.sha256(claims['jti'].encode()).hexdigest()
+    except (IndexError, KeyError, TypeError, ValueError, AttributeError):
+        return None
+
+
+def upgrade():
+    with op.batch_alter_table('refresh_tokens', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_hash', sa.CHAR(length=64), nullable=True))
+
+    # Existing sessions keep working: key each row by its token's jti
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(refresh_tokens.c.id, refresh_tokens.c.token)
+            .where(refresh_tokens.c.id > last_id)
+            .order_by(refresh_tokens.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        for row_id, token in rows:
+            bind.execute(
+                refresh_tokens.update().where(refresh_tokens.c.id == row_id)
+                .values(token_hash=_jti_hash(token))
+            )
+    bind.execute(refresh_tokens.delete().where(refresh_tokens.c.token_hash.is_(None)))
+
+    with op.batch_alter_table('refresh_tokens', schema=None) as batch_op:
+        batch_op.drop_index('ix_refresh_tokens_token')
+        batch_op.drop_column('token')
+        batch_op.alter_column('token_hash', existing_type=sa.CHAR(length=64), nullable=False)
+        batch_op.create_index(batch_op.f('ix_refresh_tokens_token_hash'), ['token_hash'], unique=True)
+        batch_op.create_index(batch_op.f('ix_refresh_tokens_user_id'), ['user_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_refresh_tokens_expires_at'), ['expires_at'], unique=False)
+
+
+def downgrade():
+    # Raw tokens can't be recovered from their hashes, so every session is dropped
+    op.execute(refresh_tokens.delete())
+
+    with op.batch_alter_table('refresh_tokens', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_refresh_tokens_expires_at'))
+        batch_op.drop_index(batch_op.f('ix_refresh_tokens_user_id'))
+        batch_op.drop_index(batch_op.f('ix_refresh_tokens_token_hash'))
+        batch_op.add_column(sa.Column('token', sa.String(length=500), nullable=False))
+        batch_op.drop_column('token_hash')
+        batch_op.create_index(batch_op.f('ix_refresh_tokens_token'), ['token'], unique=True)
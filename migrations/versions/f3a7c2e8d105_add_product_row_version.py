@@ -0,0 +1,26 @@
+"""Add a per-row change counter to products
+
+Revision ID: f3a7c2e8d105
+Revises: d71b5e0c9a36
+Create Date: 2026-10-18 18:04:51.220734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a7c2e8d105'
+down_revision = 'd71b5e0c9a36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,65 @@
+# tests/conftest.py
+import os
+
+# Keep the suite off the MySQL, Redis and SMTP servers configured in .env
+# (app.config reads the environment once, on import, and dotenv won't override these)
+os.environ.update({
+    "FLASK_ENV": "testing",
+    "DATABASE_URI": "sqlite://",
+    "CACHE_SHARED_URL": "",
+    "BLOCKLIST_URL": "memory://",
+    "MAIL_ASYNC": "false",
+    "PASSWORD_HASH_WORKERS": "0",
+    "PASSWORD_HASH_METHOD": "pbkdf2:sha256:1000",
+})
+
+import pytest
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.seed import seed_default_data
+
+ADMIN_EMAIL = "admin@gmail.com"
+ADMIN_PASSWORD = "123456"
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """
+    Factory for app instances sharing one SQLite database, like the workers
+    of one deployment. The schema and default data are created once.
+    """
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'app.sqlite'}")
+    monkeypatch.setattr(Config, "RATELIMIT_ENABLED", False, raising=False)
+    created = []
+
+    def make(**config):
+        for name, value in config.items():
+            monkeypatch.setattr(Config, name, value, raising=False)
+        app = create_app()
+        if not created:
+            with app.app_context():
+                db.create_all()
+                seed_default_data()
+        created.append(app)
+        return app
+
+    yield make
+    for app in created:
+        with app.app_context():
+            db.engine.dispose()
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def login():
+    """Returns a helper giving the Authorization header for a fresh access token"""
+    def login(client, email: str = ADMIN_EMAIL, password: str = ADMIN_PASSWORD) -> dict:
+        response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+        assert response.status_code == 200, response.get_json()
+        return {"Authorization": "Bearer " + response.get_json()["access_token"]}
+    return login
@@ -0,0 +1,78 @@
+# tests/test_benchmarks.py
+import pytest
+from sqlalchemy import create_engine, text
+from app.extensions import db
+from app.models.product import Product
+from benchmarks.dataset import build_catalog
+from benchmarks.harness import Case, QueryCounter, compare, measure, percentile
+
+
+def result(name: str, p50_ms: float, queries: float) -> dict:
+    return {'name': name, 'p50_ms': p50_ms, 'queries': queries}
+
+
+def test_percentile_is_nearest_rank():
+    ordered = [float(n) for n in range(1, 101)]
+    assert percentile(ordered, 0.50) == 50.0
+    assert percentile(ordered, 0.95) == 95.0
+    assert percentile(ordered, 0.99) == 99.0
+    assert percentile(ordered, 1.0) == 100.0
+    assert percentile([7.0], 0.99) == 7.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_compare_flags_slower_cases_and_extra_queries():
+    baseline = [result("steady", 10.0, 2), result("slower", 10.0, 2), result("chattier", 10.0, 2)]
+    results = [result("steady", 10.5, 2), result("slower", 12.0, 2), result("chattier", 9.0, 3),
+               result("new", 50.0, 9)]
+    rows = {row['name']: row for row in compare(results, baseline, threshold=0.10)}
+
+    assert not rows["steady"]['regressed']
+    assert rows["steady"]['p50_change'] == pytest.approx(0.05)
+    assert rows["slower"]['regressed']
+    assert rows["chattier"]['regressed']
+    # Nothing to compare a new case with
+    assert rows["new"]['before'] is None and not rows["new"]['regressed']
+
+
+def test_measure_counts_queries_per_call_and_runs_setup_each_time():
+    engine = create_engine("sqlite://")
+    setups = []
+
+    def run():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+
+    stats = measure(Case("two-queries", run, setup=lambda: setups.append(1)), engine, iterations=20, warmup=2)
+    assert stats['name'] == "two-queries"
+    assert stats['iterations'] == 20
+    assert stats['queries'] == 2
+    assert 0 <= stats['p50_ms'] <= stats['p95_ms'] <= stats['p99_ms']
+    assert stats['peak_kib'] >= 0
+    # Warmup, timed calls and the traced call
+    assert len(setups) == 2 + 20 + 1
+
+    assert measure(Case("override", run, iterations=3), engine, iterations=20)['iterations'] == 3
+
+
+def test_query_counter_stops_counting_on_exit():
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        with QueryCounter(engine) as counter:
+            connection.execute(text("SELECT 1"))
+        connection.execute(text("SELECT 1"))
+    assert counter.count == 1
+
+
+def test_build_catalog_reuses_a_matching_database_only(app):
+    messages = []
+    with app.app_context():
+        existing = db.session.query(db.func.count(Product.id)).scalar()
+        info = build_catalog(existing, echo=messages.append)
+        assert info['size'] == existing and info['admin_id']
+        assert messages == [f"Reusing catalog of {existing} products"]
+
+        with pytest.raises(RuntimeError, match="fresh database"):
+            build_catalog(existing + 10, echo=messages.append)
+        assert db.session.query(db.func.count(Product.id)).scalar() == existing
@@ -0,0 +1,69 @@
+# tests/test_blocklist.py
+import time
+from app.services.blocklist_service import BloomFilter, MemoryBlocklistStore, TokenBlocklist, get_blocklist
+
+
+def test_logout_revokes_the_access_token(app, login):
+    client = app.test_client()
+    revoked, other = login(client), login(client)
+
+    assert client.post("/api/v1/auth/logout", headers=revoked).status_code == 200
+    assert client.get("/api/v1/auth/me", headers=revoked).status_code == 401
+    assert client.get("/api/v1/auth/me", headers=other).status_code == 200
+
+
+def test_unrevoked_tokens_never_reach_the_store(app, login):
+    client = app.test_client()
+    headers = login(client)
+    for _ in range(5):
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    with app.app_context():
+        stats = get_blocklist().stats()
+    assert stats["prefilter_negatives"] >= 5
+    assert stats["store_lookups"] == 0
+
+
+def test_revocations_reach_other_workers_on_sync():
+    store = MemoryBlocklistStore()
+    here, there = TokenBlocklist(store, sync_interval=0), TokenBlocklist(store, sync_interval=0)
+    assert not there.is_revoked("jti-1")
+
+    here.revoke("jti-1", time.time() + 60)
+    assert here.is_revoked("jti-1")
+    assert there.is_revoked("jti-1")
+    assert not there.is_revoked("jti-2")
+
+
+def test_entries_last_only_as_long_as_the_token():
+    store = MemoryBlocklistStore()
+    blocklist = TokenBlocklist(store, sync_interval=0)
+    blocklist.revoke("expired", time.time() - 1)
+    blocklist.revoke("short", time.time() + 0.05)
+    assert not blocklist.is_revoked("expired")
+    assert blocklist.is_revoked("short")
+
+    time.sleep(0.1)
+    assert not blocklist.is_revoked("short")
+    assert store.active() == []
+
+
+def test_store_errors_reject_only_filter_hits():
+    class BrokenStore(MemoryBlocklistStore):
+        def contains(self, jti):
+            raise ConnectionError("store down")
+
+    blocklist = TokenBlocklist(BrokenStore(), sync_interval=0)
+    blocklist.revoke("revoked", time.time() + 60)
+    assert blocklist.is_revoked("revoked")
+    assert not blocklist.is_revoked("never-revoked")
+    assert blocklist.stats()["store_errors"] == 1
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for number in range(1000):
+        bloom.add(f"in-{number}")
+    assert all(f"in-{number}" in bloom for number in range(1000))
+    false_positives = sum(f"out-{number}" in bloom for number in range(10000))
+    assert false_positives < 300
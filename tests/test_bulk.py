@@ -0,0 +1,116 @@
+# tests/test_bulk.py
+import pytest
+from app.extensions import db
+from app.models.product import Product
+from app.models.user import User
+from app.services.category_service import CategoryService
+from app.services.product_service import ProductService
+
+CATEGORY = "Widgets"
+
+
+@pytest.fixture
+def products(app):
+    """Name -> id of products in a fresh category; the seeded ones are hidden"""
+    with app.app_context():
+        Product.query.update({'is_active': False})
+        db.session.commit()
+        CategoryService.create_category(CATEGORY)
+        uploader_id = User.query.filter_by(email="admin@gmail.com").one().id
+        specs = [
+            ("Red gadget", 10.00, ["Red"], ["gadget", "sale"], CATEGORY),
+            ("Blue gadget", 20.00, ["Blue"], ["gadget"], CATEGORY),
+            ("Red phone", 30.00, ["Red"], ["sale"], "Mobiles"),
+            ("Cheap gadget", 0.02, ["Red"], ["gadget"], CATEGORY),
+        ]
+        return {
+            name: ProductService.create_product(
+                name=name, price=price, colors=colors, tags=tags,
+                category_name=category, uploader_id=uploader_id
+            ).id
+            for name, price, colors, tags, category in specs
+        }
+
+
+def bulk(client, headers, **body):
+    return client.post("/api/v1/products/bulk", json=body, headers=headers)
+
+
+def get_product(client, headers, product_id):
+    response = client.get(f"/api/v1/products/{product_id}", headers=headers)
+    return response.get_json()["product"] if response.status_code == 200 else None
+
+
+def test_bulk_update_changes_only_products_matching_every_filter(app, products, login):
+    client = app.test_client()
+    headers = login(client)
+
+    response = bulk(client, headers, filter={"tags": ["gadget"], "colors": ["Red"], "category_name": CATEGORY},
+                    update={"price": 5, "add_tags": ["clearance"], "remove_tags": ["gadget"]})
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()["affected"] == 2
+
+    for name in ("Red gadget", "Cheap gadget"):
+        product = get_product(client, headers, products[name])
+        assert product["price"] == 5
+        assert "gadget" not in product["tags"] and "clearance" in product["tags"]
+    for name in ("Blue gadget", "Red phone"):
+        product = get_product(client, headers, products[name])
+        assert product["price"] != 5
+        assert "clearance" not in product["tags"]
+
+
+def test_bulk_update_moves_products_and_counts(app, products, login):
+    client = app.test_client()
+    headers = login(client)
+
+    response = bulk(client, headers, filter={"ids": [products["Red phone"]]}, update={"category_name": CATEGORY})
+    assert response.get_json()["affected"] == 1
+
+    assert get_product(client, headers, products["Red phone"])["category"] == CATEGORY
+    listed = client.get(f"/api/v1/products/?category={CATEGORY}", headers=headers).get_json()["products"]
+    assert {product["id"] for product in listed} == {
+        products[name] for name in ("Red gadget", "Blue gadget", "Red phone", "Cheap gadget")
+    }
+
+
+def test_bulk_price_cut_never_leaves_a_non_positive_price(app, products, login):
+    client = app.test_client()
+    headers = login(client)
+
+    response = bulk(client, headers, filter={"category_name": CATEGORY}, update={"price_change_percent": -90})
+    assert response.get_json()["affected"] == 3
+
+    assert get_product(client, headers, products["Red gadget"])["price"] == 1.0
+    assert get_product(client, headers, products["Blue gadget"])["price"] == 2.0
+    assert get_product(client, headers, products["Cheap gadget"])["price"] == ProductService.MIN_PRICE
+    assert get_product(client, headers, products["Red phone"])["price"] == 30.0
+
+
+def test_bulk_delete_hides_only_matching_products(app, products, login):
+    client = app.test_client()
+    headers = login(client)
+
+    response = bulk(client, headers, filter={"tags": ["sale"]}, delete=True)
+    assert response.get_json()["affected"] == 2
+
+    assert get_product(client, headers, products["Red gadget"]) is None
+    assert get_product(client, headers, products["Red phone"]) is None
+    assert get_product(client, headers, products["Blue gadget"]) is not None
+    searched = client.get("/api/v1/products/?search=red", headers=headers).get_json()["products"]
+    assert searched == []
+
+    response = bulk(client, headers, filter={"tags": ["sale"]}, delete=True)
+    assert response.get_json()["affected"] == 0
+
+
+@pytest.mark.parametrize("body", [
+    {"filter": {}, "delete": True},
+    {"filter": {"tags": ["sale"]}},
+    {"filter": {"tags": ["sale"]}, "update": {"price": 1, "price_change_percent": 10}},
+    {"filter": {"tags": ["sale"]}, "update": {"price_change_percent": -100}},
+])
+def test_bulk_rejects_invalid_requests(app, products, login, body):
+    client = app.test_client()
+    response = client.post("/api/v1/products/bulk", json=body, headers=login(client))
+    assert response.status_code == 400
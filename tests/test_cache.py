@@ -0,0 +1,74 @@
+# tests/test_cache.py
+from app.services.cache_service import LocalCache, MemorySharedCache, TwoTierCache
+
+
+def two_workers():
+    shared = MemorySharedCache()
+    return shared, TwoTierCache(LocalCache(ttl=60), shared), TwoTierCache(LocalCache(ttl=60), shared)
+
+
+def test_load_racing_another_workers_invalidation_is_not_shared():
+    shared, first, second = two_workers()
+    rows = {'key': 'old'}
+
+    def slow_load():
+        value = rows['key']
+        # Another worker commits a write and invalidates while this load runs
+        rows['key'] = 'new'
+        second.invalidate(keys=['key'])
+        return value
+
+    assert first.get_or_load('key', slow_load) == 'old'
+    assert shared.get('key') is None
+    assert second.get_or_load('key', lambda: rows['key']) == 'new'
+
+
+def test_missed_shared_invalidations_are_replayed_before_reads():
+    class FlakyShared(MemorySharedCache):
+        down = False
+
+        def invalidate(self, keys=(), tags=()):
+            if self.down:
+                raise ConnectionError("shared tier down")
+            super().invalidate(keys, tags)
+
+    shared = FlakyShared()
+    cache = TwoTierCache(LocalCache(ttl=0), shared)
+    cache.get_or_load('list', lambda: 'v1', tags=['lists'])
+
+    shared.down = True
+    cache.invalidate(tags=['lists'])
+    assert cache.stats()['shared']['pending_invalidations'] == 1
+
+    shared.down = False
+    cache._shared_down_until = 0  # backoff over
+    assert cache.get_or_load('list', lambda: 'v2') == 'v2'
+    assert cache.stats()['shared']['pending_invalidations'] == 0
+
+
+def test_versioned_entries_need_no_invalidation():
+    _, cache, _ = two_workers()
+    assert cache.get_or_load('product:1', lambda: 'v1', version=1) == 'v1'
+    assert cache.get_or_load('product:1', lambda: 'stale', version=1) == 'v1'
+    assert cache.get_or_load('product:1', lambda: 'v2', version=2) == 'v2'
+
+
+def test_writes_show_up_in_cached_reads(app, login):
+    client = app.test_client()
+    headers = login(client)
+    before = client.get("/api/v1/categories/", headers=headers).get_json()
+    mobiles = next(category for category in before["categories"] if category["name"] == "Mobiles")
+    product = {"name": "Cached Phone", "price": 10, "colors": ["Black"], "category_name": "Mobiles"}
+    product_id = client.post("/api/v1/products/", headers=headers, json=product).get_json()["product"]["id"]
+    client.get(f"/api/v1/products/{product_id}", headers=headers)
+
+    client.put(f"/api/v1/products/{product_id}", headers=headers, json={"name": "Renamed Phone"})
+    assert client.get(f"/api/v1/products/{product_id}",
+                      headers=headers).get_json()["product"]["name"] == "Renamed Phone"
+    names = [p["name"] for p in client.get("/api/v1/products/", headers=headers).get_json()["products"]]
+    assert "Renamed Phone" in names and "Cached Phone" not in names
+
+    client.delete(f"/api/v1/products/{product_id}", headers=headers)
+    assert client.get(f"/api/v1/products/{product_id}", headers=headers).status_code == 404
+    after = client.get("/api/v1/categories/", headers=headers).get_json()
+    assert next(c for c in after["categories"] if c["name"] == "Mobiles")["productCount"] == mobiles["productCount"]
@@ -0,0 +1,94 @@
+# tests/test_categories.py
+from app.extensions import db
+from app.models.product import Product
+from app.models.table_version import TableVersion
+from app.models.user import User
+from app.services.category_service import CategoryService
+from app.services.product_service import ProductService
+
+
+class EngineLog:
+    """Records the statements and commits sent to the database while active"""
+
+    def __enter__(self):
+        self.entries = []
+        db.event.listen(db.engine, "before_cursor_execute", self._statement)
+        db.event.listen(db.engine, "commit", self._commit)
+        return self
+
+    def __exit__(self, *exc):
+        db.event.remove(db.engine, "before_cursor_execute", self._statement)
+        db.event.remove(db.engine, "commit", self._commit)
+
+    def _statement(self, conn, cursor, statement, *args):
+        self.entries.append(statement)
+
+    def _commit(self, conn):
+        self.entries.append("COMMIT")
+
+    def index(self, fragment: str) -> int:
+        return next(i for i, entry in enumerate(self.entries) if fragment in entry)
+
+
+def categories_read():
+    db.session.remove()
+    with EngineLog() as log:
+        categories = [category.to_dict() for category in CategoryService.get_all_categories()]
+    return len(log.entries), {category["name"]: category["productCount"] for category in categories}
+
+
+def test_listing_counts_products_in_constant_statements(app):
+    with app.app_context():
+        uploader_id = User.query.filter_by(email="admin@gmail.com").one().id
+        active = Product.query.filter_by(is_active=True).count()
+        few, counts = categories_read()
+        assert sum(counts.values()) == active
+
+        for number in range(10):
+            CategoryService.create_category(f"Extra {number}")
+            ProductService.create_product(name=f"Extra product {number}", price=1, colors=[], tags=[],
+                                          category_name=f"Extra {number}", uploader_id=uploader_id)
+        product_id = ProductService.create_product(name="Gone", price=1, colors=[], tags=[],
+                                                   category_name="Extra 0", uploader_id=uploader_id).id
+        ProductService.delete_product(product_id)
+
+        many, counts = categories_read()
+        assert many == few
+        assert all(counts[f"Extra {number}"] == 1 for number in range(10))
+
+
+def versions():
+    # Through a connection of its own, as another worker would see them
+    with db.engine.connect() as connection:
+        return dict(connection.execute(db.select(TableVersion.name, TableVersion.version)).all())
+
+
+def test_versions_move_only_after_commit(app):
+    with app.app_context():
+        before = versions()
+
+        TableVersion.bump('products')
+        db.session.execute(db.select(Product.id)).all()
+        assert versions() == before
+        db.session.rollback()
+        db.session.commit()
+        assert versions() == before
+
+        TableVersion.bump('products', 'categories', 'brand-new')
+        db.session.commit()
+        after = versions()
+        assert after['products'] == before.get('products', 0) + 1
+        assert after['categories'] == before.get('categories', 0) + 1
+        assert after['brand-new'] == 1
+
+
+def test_writes_bump_versions_after_their_transaction(app):
+    with app.app_context():
+        uploader_id = User.query.filter_by(email="admin@gmail.com").one().id
+        with EngineLog() as log:
+            ProductService.create_product(name="Counted", price=1, colors=[], tags=[],
+                                          category_name="Mobiles", uploader_id=uploader_id)
+
+    insert = log.index("INSERT INTO products")
+    committed = insert + log.entries[insert:].index("COMMIT")
+    assert log.index("table_versions") > committed
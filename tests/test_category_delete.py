@@ -0,0 +1,28 @@
+# tests/test_category_delete.py
+import pytest
+from sqlalchemy import text
+from app.extensions import db
+from app.models.category import Category
+from app.models.product import Product
+from app.services.category_service import CategoryService
+from app.services.product_service import ProductService
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1])
+def test_delete_category_deactivates_and_unindexes_its_products(app, chunk_size):
+    with app.app_context():
+        category_id = Category.query.filter_by(name="Mobiles").one().id
+        assert ProductService.search_products("mobiles")
+        others = db.session.query(Product.id).filter(Product.category_id != category_id,
+                                                     Product.is_active == True).count()
+
+        assert CategoryService.delete_category(category_id, chunk_size=chunk_size)
+
+        assert not Product.query.filter_by(category_id=category_id, is_active=True).count()
+        assert db.session.query(Product.id).filter(Product.is_active == True).count() == others
+        assert not ProductService.search_products("mobiles")
+        assert not db.session.execute(text(
+            "SELECT COUNT(*) FROM product_search WHERE rowid IN (SELECT id FROM products WHERE category_id = :id)"
+        ), {'id': category_id}).scalar()
+        assert [category["name"] for category in CategoryService.list_categories_data()] == ["Accessories",
+                                                                                          "Laptops"]
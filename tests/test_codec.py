@@ -0,0 +1,65 @@
+# tests/test_codec.py
+import json
+from datetime import datetime
+import pytest
+from app.extensions import db
+from app.models.product import Product
+from app.utils.codec import decode, encode
+
+
+@pytest.mark.parametrize("body", [b"", b"{not json", b"[1, 2]", b'"a string"', b'{"name": "Phone"'])
+def test_malformed_bodies_get_a_validation_error(app, login, body):
+    client = app.test_client()
+    headers = {**login(client), "Content-Type": "application/json"}
+    for path in ("/api/v1/products/", "/api/v1/categories/", "/api/v1/auth/login"):
+        response = client.post(path, data=body, headers=headers)
+        assert response.status_code == 400, (path, response.get_data(as_text=True))
+        assert response.get_json()["error"] == "Validation failed"
+
+
+def test_validation_details_drop_urls_and_encode_validator_messages(app):
+    client = app.test_client()
+    response = client.post("/api/v1/auth/register", json={
+        "name": "Test", "email": "codec@example.com", "password": "123456", "confirm_password": "654321"
+    })
+    assert response.status_code == 400
+    details = response.get_json()["details"]
+    assert "do not match" in details[0]["msg"]
+    assert all("url" not in detail for detail in details)
+
+    response = client.post("/api/v1/auth/register", json={"name": "Test", "email": "codec@example.com",
+                                                           "password": "123456", "admin": True})
+    assert response.status_code == 400
+    assert response.get_json()["details"][0]["loc"] == ["admin"]
+
+
+def test_product_responses_match_to_dict(app, login):
+    client = app.test_client()
+    headers = login(client)
+    created = client.post("/api/v1/products/", headers=headers, json={
+        "name": "Codec Phone", "price": 499.5, "colors": ["Black", "Silver"], "tags": ["Budget", "5G"],
+        "category_name": "Mobiles"
+    })
+    assert created.status_code == 201, created.get_json()
+    product_id = created.get_json()["product"]["id"]
+
+    fetched = client.get(f"/api/v1/products/{product_id}", headers=headers)
+    listed = client.get("/api/v1/products/", headers=headers).get_json()["products"]
+    with app.app_context():
+        expected = db.session.get(Product, product_id).to_dict()
+
+    for body in (created.get_data(), fetched.get_data()):
+        product = json.loads(body)["product"]
+        assert product == expected
+        # Keys keep the model's order rather than being sorted
+        assert list(product) == list(expected)
+    assert next(product for product in listed if product["id"] == product_id) == expected
+
+
+def test_encode_and_decode_round_trip():
+    value = {"b": 1, "a": [1.5, None, "é"], "nested": {"ok": True}}
+    assert encode(value) == json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+    assert decode(encode(value)) == value
+    assert decode(encode(value).decode()) == value
+    assert encode(datetime(2024, 5, 1, 12, 30, 0, 250)) == b'"2024-05-01T12:30:00.000250"'
+    assert json.loads(encode(value, indent=2)) == value
@@ -0,0 +1,50 @@
+# tests/test_conditional_get.py
+import pytest
+
+
+@pytest.fixture
+def admin(app, login):
+    client = app.test_client()
+    return client, login(client)
+
+
+def create_product(client, headers, name="Etag Phone"):
+    response = client.post("/api/v1/products/", headers=headers, json={
+        "name": name, "price": 10, "colors": ["Black"], "tags": ["one"], "category_name": "Mobiles"
+    })
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()["product"]["id"]
+
+
+def test_product_etag_changes_on_every_update(admin):
+    client, headers = admin
+    product_id = create_product(client, headers)
+    url = f"/api/v1/products/{product_id}"
+
+    first = client.get(url, headers=headers)
+    assert first.status_code == 200
+    assert client.get(url, headers={**headers, "If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    client.put(url, headers=headers, json={"price": 11})
+    second = client.get(url, headers={**headers, "If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert second.get_json()["product"]["price"] == 11
+
+    # Right after, and touching only the tag links
+    client.put(url, headers=headers, json={"tags": ["two"]})
+    response = client.get(url, headers={**headers, "If-None-Match": second.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.get_json()["product"]["tags"] == ["two"]
+    assert client.get(url, headers={**headers, "If-None-Match": response.headers["ETag"]}).status_code == 304
+
+
+def test_list_etag_changes_after_a_write(admin):
+    client, headers = admin
+    first = client.get("/api/v1/products/", headers=headers)
+    assert client.get("/api/v1/products/",
+                      headers={**headers, "If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    create_product(client, headers, name="Listed Phone")
+    response = client.get("/api/v1/products/", headers={**headers, "If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 200
+    assert "Listed Phone" in [product["name"] for product in response.get_json()["products"]]
@@ -0,0 +1,15 @@
+# tests/test_forgot_password.py
+from app.services.auth_service import AuthService
+from app.services.mail_service import MailQueueFull
+
+
+def test_full_mail_queue_does_not_reveal_registered_emails(app, monkeypatch):
+    def queue_full(user, token):
+        raise MailQueueFull("Mail queue is full")
+    monkeypatch.setattr(AuthService, "send_reset_email", staticmethod(queue_full))
+
+    client = app.test_client()
+    registered = client.post("/api/v1/auth/forgot-password", json={"email": "admin@gmail.com"})
+    unknown = client.post("/api/v1/auth/forgot-password", json={"email": "nobody@example.com"})
+    assert registered.status_code == unknown.status_code == 200
+    assert registered.get_json() == unknown.get_json()
@@ -0,0 +1,34 @@
+# tests/test_import.py
+from app.extensions import db
+from app.models.product import Product
+from app.services.import_service import ProductImportService
+
+
+def rows(count: int, start: int = 1):
+    for line in range(start, start + count):
+        yield line, {"name": f"Imported {line}", "price": 5, "colors": ["Black"], "category_name": "Mobiles"}, None
+
+
+def test_failed_batch_returns_partial_report(app, monkeypatch, login):
+    import_batch = ProductImportService._import_batch
+    calls = []
+
+    def failing_second_batch(batch, uploader_id, report):
+        calls.append(batch[0][0])
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        return import_batch(batch, uploader_id, report)
+
+    client = app.test_client()
+    headers = login(client)
+    listed = len(client.get("/api/v1/products/", headers=headers).get_json()["products"])
+
+    monkeypatch.setattr(ProductImportService, "_import_batch", staticmethod(failing_second_batch))
+    with app.app_context():
+        report = ProductImportService.import_products(rows(5), uploader_id=1, batch_size=2)
+        assert db.session.query(Product).filter(Product.name.like("Imported %")).count() == 2
+
+    assert report["imported"] == 2 and report["failed"] == 2 and report["total"] == 4
+    assert report["aborted"]["line"] == 3
+    # The committed batch is visible right away
+    assert len(client.get("/api/v1/products/", headers=headers).get_json()["products"]) == listed + 2
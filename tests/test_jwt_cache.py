@@ -0,0 +1,47 @@
+# tests/test_jwt_cache.py
+from app.utils.jwt_cache import CachingJWTManager, VerifiedTokenCache, get_token_cache
+
+
+def test_protected_requests_decode_through_the_cache(app, login, monkeypatch):
+    """Fails if Flask-JWT-Extended stops routing decodes through _decode_jwt_from_config"""
+    calls = []
+    original = CachingJWTManager._decode_jwt_from_config
+
+    def spy(self, *args, **kwargs):
+        calls.append(args[0])
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(CachingJWTManager, "_decode_jwt_from_config", spy)
+    client = app.test_client()
+    headers = login(client)
+
+    for _ in range(3):
+        assert client.get("/api/v1/categories/", headers=headers).status_code == 200
+
+    token = headers["Authorization"][7:]
+    assert calls.count(token) == 3
+    with app.app_context():
+        stats = get_token_cache().stats()
+    assert stats["misses"] >= 1 and stats["hits"] >= 2
+
+
+def test_tampered_tokens_are_still_rejected(app, login):
+    client = app.test_client()
+    headers = login(client)
+    assert client.get("/api/v1/categories/", headers=headers).status_code == 200
+
+    header, payload, signature = headers["Authorization"][7:].split(".")
+    forged = {"Authorization": f"Bearer {header}.{payload}.{signature[:-4]}AAAA"}
+    assert client.get("/api/v1/categories/", headers=forged).status_code in (401, 422)
+
+
+def test_entries_expire_with_the_token(monkeypatch):
+    cache = VerifiedTokenCache(maxsize=2)
+    monkeypatch.setattr("app.utils.jwt_cache.time.time", lambda: 1000.0)
+    cache.set("expired", {"sub": "1", "exp": 1000})
+    cache.set("live", {"sub": "2", "exp": 1001})
+    cache.set("no-exp", {"sub": "3"})
+
+    assert cache.get("expired") is None
+    assert cache.get("live") == {"sub": "2", "exp": 1001}
+    assert cache.get("no-exp") is None
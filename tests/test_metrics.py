@@ -0,0 +1,68 @@
+# tests/test_metrics.py
+import json
+import os
+import subprocess
+import sys
+from app.utils.metrics import MetricsRegistry
+
+
+def exited_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def worker_file(directory, pid: int, nonce: str, requests: int, in_flight: int):
+    snapshot = {
+        "requests_total": {"type": "counter", "help": "Requests", "labels": [], "samples": [[[], requests]]},
+        "in_flight": {"type": "gauge", "help": "In flight", "labels": [], "samples": [[[], in_flight]]},
+    }
+    (directory / f"metrics-{pid}-{nonce}.json").write_text(json.dumps(snapshot))
+
+
+def value(snapshot: dict, name: str):
+    samples = snapshot.get(name, {"samples": []})["samples"]
+    return sum(sample for _, sample in samples)
+
+
+def test_metrics_are_off_by_default(app):
+    assert app.test_client().get("/metrics").status_code == 404
+
+
+def test_metrics_need_the_token(make_app):
+    app = make_app(METRICS_ENABLED=True, METRICS_TOKEN="scrape-secret")
+    client = app.test_client()
+    client.get("/api/v1/categories/")
+
+    assert client.get("/metrics").status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert 'http_requests_total{method="GET",endpoint="categories.get_categories",status="401"} 1' in response.text
+
+
+def test_exited_workers_are_archived_once(tmp_path):
+    registry = MetricsRegistry(str(tmp_path))
+    requests = registry.counter("requests_total", "Requests")
+    requests.inc()
+    dead = exited_pid()
+    worker_file(tmp_path, dead, "a" * 32, requests=5, in_flight=2)
+    # A live pid with someone else's nonce: an earlier process the pid was reused from
+    worker_file(tmp_path, os.getpid(), "b" * 32, requests=7, in_flight=1)
+
+    first = registry.collect()
+    assert value(first, "requests_total") == 1 + 5 + 7
+    assert value(first, "in_flight") == 1
+    assert not (tmp_path / f"metrics-{dead}-{'a' * 32}.json").exists()
+    assert (tmp_path / MetricsRegistry.ARCHIVE_FILE).exists()
+
+    requests.inc()
+    second = registry.collect()
+    assert value(second, "requests_total") == 2 + 5 + 7
+
+
+def test_forked_process_gets_its_own_file(tmp_path, monkeypatch):
+    registry = MetricsRegistry(str(tmp_path))
+    parent_file = registry.file_name()
+    monkeypatch.setattr(os, "getpid", lambda: 999999)
+    assert registry.file_name() != parent_file
+    assert registry.file_name().startswith("metrics-999999-")
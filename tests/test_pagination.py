@@ -0,0 +1,128 @@
+# tests/test_pagination.py
+from datetime import datetime
+import pytest
+from app.extensions import db
+from app.models.product import Product
+from app.models.user import User
+from app.services.category_service import CategoryService
+from app.services.product_service import ProductService
+from app.utils.pagination import MAX_PAGE_SIZE, encode_cursor
+
+CATEGORY = "Widgets"
+
+
+@pytest.fixture
+def create(app):
+    """Returns create(name, tags) adding a product to a fresh category; the seeded ones are hidden"""
+    with app.app_context():
+        Product.query.update({'is_active': False})
+        db.session.commit()
+        CategoryService.create_category(CATEGORY)
+        uploader_id = User.query.filter_by(email="admin@gmail.com").one().id
+
+        def create(name, tags=()):
+            return ProductService.create_product(
+                name=name, price=10, colors=["Black"], tags=list(tags),
+                category_name=CATEGORY, uploader_id=uploader_id
+            ).id
+
+        yield create
+
+
+def walk(client, headers, limit, **params):
+    """Every page of a listing as a list of id lists"""
+    pages, cursor = [], None
+    while True:
+        query = {**params, "limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/products/", query_string=query, headers=headers)
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        pages.append([product["id"] for product in body["products"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("limit", [1, 3, 5, 10, 11])
+def test_pages_cover_every_product_once_in_order(app, create, login, limit):
+    ids = [create(f"Widget {number}") for number in range(10)]
+    with app.app_context():
+        # Ties on created_at are broken by id
+        Product.query.filter(Product.id.in_(ids[3:7])).update(
+            {'created_at': datetime(2024, 1, 1)}, synchronize_session=False)
+        db.session.commit()
+        expected = [product.id for product in ProductService.get_all_products()]
+
+    client = app.test_client()
+    pages = walk(client, login(client), limit, category=CATEGORY)
+
+    assert [product_id for page in pages for product_id in page] == expected
+    assert sorted(expected) == sorted(ids)
+    assert all(len(page) == limit for page in pages[:-1])
+    assert 0 < len(pages[-1]) <= limit
+
+
+def test_products_added_between_pages_do_not_shift_rows(app, create, login):
+    first_ids = [create(f"Widget {number}") for number in range(4)]
+    client = app.test_client()
+    headers = login(client)
+
+    first = client.get("/api/v1/products/", query_string={"limit": 2}, headers=headers).get_json()
+    create("Newest widget")
+    second = client.get("/api/v1/products/", query_string={"limit": 2, "cursor": first["next_cursor"]},
+                        headers=headers).get_json()
+
+    seen = [product["id"] for product in first["products"] + second["products"]]
+    assert seen == sorted(first_ids, reverse=True)
+
+
+@pytest.mark.parametrize("query", [
+    {"limit": 0},
+    {"limit": "many"},
+    {"cursor": "not-a-cursor"},
+])
+def test_bad_paging_parameters_are_rejected(app, create, login, query):
+    create("Widget")
+    client = app.test_client()
+    response = client.get("/api/v1/products/", query_string=query, headers=login(client))
+    assert response.status_code == 400
+
+
+def test_page_size_is_capped(app, create, login):
+    for number in range(MAX_PAGE_SIZE + 1):
+        create(f"Widget {number}")
+    client = app.test_client()
+    body = client.get("/api/v1/products/", query_string={"limit": 1000}, headers=login(client)).get_json()
+    assert len(body["products"]) == MAX_PAGE_SIZE
+    assert body["next_cursor"] is not None
+
+
+def test_unranked_cursor_is_rejected_by_search(app, create, login):
+    create("Widget")
+    client = app.test_client()
+    response = client.get("/api/v1/products/", headers=login(client), query_string={
+        "search": "widget", "cursor": encode_cursor(datetime(2024, 1, 1), 1)
+    })
+    assert response.status_code == 400
+
+
+def test_paginated_search_keeps_relevance_order(app, create, login):
+    names = {
+        create("Phone stand", tags=["phone"]): "name and tag",
+        create("Case", tags=["phone"]): "tag",
+        create("Phone", tags=["spare"]): "name",
+        create("Charger", tags=["phone"]): "tag",
+        create("Phone grip", tags=["phone"]): "name and tag",
+        create("Lamp", tags=["desk"]): None,
+    }
+    client = app.test_client()
+    headers = login(client)
+
+    ranked = [product["id"] for product in client.get(
+        "/api/v1/products/", query_string={"search": "phone"}, headers=headers).get_json()["products"]]
+    assert [names[product_id] for product_id in ranked][:2] == ["name and tag", "name and tag"]
+    assert [names[product_id] for product_id in ranked][-2:] == ["tag", "tag"]
+
+    for limit in (1, 2, 4):
+        pages = walk(client, headers, limit, search="phone")
+        assert [product_id for page in pages for product_id in page] == ranked
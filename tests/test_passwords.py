@@ -0,0 +1,22 @@
+# tests/test_passwords.py
+import pytest
+from app.utils.passwords import PasswordHasher, PasswordHasherBusy
+
+METHOD = "pbkdf2:sha256:1000"
+
+
+def test_inline_hash_round_trip():
+    hasher = PasswordHasher(method=METHOD)
+    password_hash = hasher.hash("secret")
+    assert hasher.verify(password_hash, "secret")
+    assert not hasher.verify(password_hash, "wrong")
+    assert not hasher.needs_rehash(password_hash)
+    assert PasswordHasher().needs_rehash(password_hash)
+
+
+def test_pool_timeout_reports_busy():
+    # The pool can't even start within the timeout
+    hasher = PasswordHasher(method=METHOD, workers=1, timeout=0.001)
+    with pytest.raises(PasswordHasherBusy):
+        hasher.hash("secret")
+    hasher._pool.shutdown(cancel_futures=True)
@@ -0,0 +1,90 @@
+# tests/test_product_queries.py
+import pytest
+from sqlalchemy import event
+from app.extensions import db
+from app.models.product import Product
+from app.models.user import User
+from app.services.category_service import CategoryService
+from app.services.product_service import ProductService
+
+CATEGORY = "Widgets"
+MANY = 25
+
+
+class StatementCounter:
+    """Counts statements sent to the database while active"""
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(db.engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(db.engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def count_statements(read) -> tuple:
+    """(statements, rows) for a read including serialization, starting from an empty session"""
+    db.session.remove()
+    with StatementCounter() as counter:
+        result = read()
+        products = result[0] if isinstance(result, tuple) else result
+        products = [product.to_dict() for product in products]
+    return counter.count, len(products)
+
+
+@pytest.fixture
+def add_products(app):
+    """Returns add(count) creating tagged, coloured products in a fresh category; the seeded ones are hidden"""
+    with app.app_context():
+        Product.query.update({'is_active': False})
+        db.session.commit()
+        CategoryService.create_category(CATEGORY)
+        uploader_id = User.query.filter_by(email="admin@gmail.com").one().id
+        created = []
+
+        def add(count: int, tags_per_product: int = 2):
+            for _ in range(count):
+                number = len(created)
+                created.append(ProductService.create_product(
+                    name=f"Widget {number}", price=10 + number, colors=["Black", "Blue"],
+                    tags=["gadget"] + [f"tag{number}-{i}" for i in range(tags_per_product - 1)],
+                    category_name=CATEGORY, uploader_id=uploader_id
+                ).id)
+            return created
+
+        yield add
+
+
+LIST_READS = {
+    "get_all_products": lambda: ProductService.get_all_products(),
+    "get_all_products_page": lambda: ProductService.get_all_products(limit=MANY),
+    "get_products_by_category": lambda: ProductService.get_products_by_category(CATEGORY),
+    "get_products_by_category_page": lambda: ProductService.get_products_by_category(CATEGORY, limit=MANY),
+    "search_products": lambda: ProductService.search_products("widget"),
+    "search_products_page": lambda: ProductService.search_products("widget", limit=MANY),
+}
+
+
+@pytest.mark.parametrize("read", LIST_READS.values(), ids=LIST_READS.keys())
+def test_list_statements_do_not_grow_with_rows(app, add_products, read):
+    with app.app_context():
+        add_products(1)
+        single, rows = count_statements(read)
+        assert rows == 1
+
+        add_products(MANY - 1)
+        many, rows = count_statements(read)
+        assert rows == MANY
+        assert many == single
+
+
+def test_get_product_by_id_statements_do_not_grow_with_tags(app, add_products):
+    with app.app_context():
+        few_tags, many_tags = add_products(1, tags_per_product=1)[0], add_products(1, tags_per_product=MANY)[1]
+        single, _ = count_statements(lambda: [ProductService.get_product_by_id(few_tags)])
+        many, _ = count_statements(lambda: [ProductService.get_product_by_id(many_tags)])
+        assert many == single
@@ -0,0 +1,57 @@
+# tests/test_profiler.py
+import logging
+from app.utils.profiler import RequestProfile, fingerprint, parameter_shape
+
+
+def test_fingerprint_ignores_values():
+    first = fingerprint("SELECT * FROM products WHERE id IN (?, ?, ?) AND name = 'a' AND price > 10")
+    second = fingerprint("SELECT *  FROM products\n WHERE id IN (?) AND name = 'b''s' AND price > 2.5")
+    assert first == second == "SELECT * FROM products WHERE id IN (...) AND name = ? AND price > ?"
+
+
+def test_parameter_shape_never_includes_values():
+    assert parameter_shape(("secret", 42), False) == "(str, int)"
+    assert parameter_shape({"email": "a@b.c"}, False) == "{email: str}"
+    assert parameter_shape([(1, "x"), (2, "y")], True) == "2 x (int, str)"
+    assert "secret" not in parameter_shape(("secret",), False)
+
+
+def test_repeated_statements_are_flagged_once_past_the_threshold():
+    profile = RequestProfile(n_plus_one_threshold=3)
+    for product_id in range(5):
+        profile.record(f"SELECT * FROM categories WHERE id = {product_id}", 0.001)
+    profile.record("SELECT 1", 0.001)
+
+    suspects = profile.n_plus_one()
+    assert len(suspects) == 1
+    assert suspects[0]["count"] == 5
+    assert suspects[0]["statement"] == "SELECT * FROM categories WHERE id = ?"
+    assert profile.statements == 6
+    assert "n_plus_one=1" in profile.header()
+
+
+def test_profile_header_and_slow_query_log(make_app, login, caplog):
+    app = make_app(SQL_PROFILER_ENABLED=True, SQL_PROFILER_HEADER=True, SQL_SLOW_QUERY_MS=0)
+    client = app.test_client()
+    headers = login(client)
+
+    with caplog.at_level(logging.WARNING, logger="app.utils.profiler"):
+        response = client.get("/api/v1/categories/", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["X-SQL-Profile"].startswith("statements=")
+    slow = [record.getMessage() for record in caplog.records if record.getMessage().startswith("Slow query")]
+    assert slow and all("params=" in message for message in slow)
+
+
+def test_unsampled_requests_get_no_profile(make_app, login):
+    app = make_app(SQL_PROFILER_ENABLED=True, SQL_PROFILER_HEADER=True, SQL_PROFILER_SAMPLE_RATE=0.0)
+    client = app.test_client()
+    response = client.get("/api/v1/categories/", headers=login(client))
+    assert "X-SQL-Profile" not in response.headers
+
+
+def test_profiler_is_off_by_default(app, login):
+    client = app.test_client()
+    response = client.get("/api/v1/categories/", headers=login(client))
+    assert "X-SQL-Profile" not in response.headers
+    assert "sql_profiler" not in app.extensions
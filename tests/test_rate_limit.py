@@ -0,0 +1,88 @@
+# tests/test_rate_limit.py
+import threading
+from types import SimpleNamespace
+import pytest
+from limits.errors import ConfigurationError
+from app.utils import rate_limit
+from app.utils.rate_limit import SQLiteStorage
+
+WINDOW = 10
+
+
+class Clock:
+    """Stands in for the time module inside app.utils.rate_limit"""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return SQLiteStorage(f"sqlite:///{tmp_path / 'ratelimit.sqlite'}")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock(1000.0)
+    monkeypatch.setattr(rate_limit, "time", clock)
+    return clock
+
+
+def test_fixed_window_counter_expires(storage, clock):
+    assert storage.incr("key", WINDOW) == 1
+    assert storage.incr("key", WINDOW, amount=2) == 3
+    assert storage.get("key") == 3
+    assert storage.get_expiry("key") == 1000.0 + WINDOW
+
+    clock.now += WINDOW
+    assert storage.get("key") == 0
+    assert storage.incr("key", WINDOW) == 1
+
+
+def test_sliding_window_weights_the_previous_window(storage, clock):
+    assert storage.acquire_sliding_window_entry("key", 2, WINDOW)
+    assert storage.acquire_sliding_window_entry("key", 2, WINDOW)
+    assert not storage.acquire_sliding_window_entry("key", 2, WINDOW)
+
+    # Start of the next window: the previous one still counts in full
+    clock.now = 1000.0 + WINDOW
+    assert not storage.acquire_sliding_window_entry("key", 2, WINDOW)
+
+    # Halfway through it counts for half
+    clock.now = 1000.0 + WINDOW * 1.5
+    assert storage.acquire_sliding_window_entry("key", 2, WINDOW)
+    assert not storage.acquire_sliding_window_entry("key", 2, WINDOW)
+    assert storage.get_sliding_window("key", WINDOW)[::2] == (2, 1)
+
+    clock.now = 1000.0 + WINDOW * 3
+    assert storage.acquire_sliding_window_entry("key", 2, WINDOW)
+    storage.clear_sliding_window("key", WINDOW)
+    assert storage.get_sliding_window("key", WINDOW)[::2] == (0, 0)
+
+
+def test_sliding_window_never_admits_more_than_the_limit(storage):
+    limit, contenders = 5, 20
+    start = threading.Barrier(contenders)
+    results = []
+
+    def hit():
+        start.wait()
+        results.append(storage.acquire_sliding_window_entry("key", limit, 3600))
+
+    threads = [threading.Thread(target=hit) for _ in range(contenders)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(True) == limit
+    assert storage.get_sliding_window("key", 3600)[2] == limit
+
+
+def test_old_sqlite_is_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr(rate_limit.sqlite3, "sqlite_version_info", (3, 34, 1))
+    with pytest.raises(ConfigurationError):
+        SQLiteStorage(f"sqlite:///{tmp_path / 'ratelimit.sqlite'}")
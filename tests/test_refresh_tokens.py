@@ -0,0 +1,90 @@
+# tests/test_refresh_tokens.py
+from datetime import datetime, timedelta
+from flask_jwt_extended import decode_token
+from app.extensions import db
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.services.token_service import RefreshTokenService
+
+ADMIN = {"email": "admin@gmail.com", "password": "123456"}
+
+
+def login(client) -> str:
+    response = client.post("/api/v1/auth/login", json=ADMIN)
+    assert response.status_code == 200
+    return response.get_json()["refresh_token"]
+
+
+def refresh(client, refresh_token: str):
+    return client.post("/api/v1/auth/refresh", headers={"Authorization": f"Bearer {refresh_token}"})
+
+
+def test_sessions_are_stored_as_jti_hashes(app):
+    client = app.test_client()
+    first, second = login(client), login(client)
+
+    assert refresh(client, first).status_code == 200
+    assert refresh(client, second).status_code == 200
+    with app.app_context():
+        hashes = {token.token_hash for token in RefreshToken.query}
+        for token in (first, second):
+            assert RefreshToken.hash_token(decode_token(token)["jti"]) in hashes
+        assert all(len(token_hash) == 64 for token_hash in hashes)
+        assert not any(first in token_hash or second in token_hash for token_hash in hashes)
+
+
+def test_logout_ends_only_the_given_session(app):
+    client = app.test_client()
+    phone, laptop = login(client), login(client)
+
+    response = client.post("/api/v1/auth/logout", headers={"Authorization": f"Bearer {phone}"})
+    assert response.status_code == 200
+
+    assert refresh(client, phone).status_code == 401
+    assert refresh(client, laptop).status_code == 200
+
+
+def test_password_change_ends_every_session(app):
+    client = app.test_client()
+    sessions = [login(client) for _ in range(3)]
+    access = client.post("/api/v1/auth/login", json=ADMIN).get_json()["access_token"]
+
+    response = client.post("/api/v1/auth/change-password", headers={"Authorization": f"Bearer {access}"},
+                           json={"current_password": "123456", "new_password": "654321"})
+    assert response.status_code == 200, response.get_json()
+    assert all(refresh(client, token).status_code == 401 for token in sessions)
+
+
+def test_revocation_state_is_cached_between_refreshes(app):
+    client = app.test_client()
+    token = login(client)
+    assert refresh(client, token).status_code == 200
+
+    statements = []
+    with app.app_context():
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        db.event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            assert refresh(client, token).status_code == 200
+        finally:
+            db.event.remove(db.engine, "before_cursor_execute", listener)
+    assert not [statement for statement in statements if "refresh_tokens" in statement]
+
+
+def test_purge_deletes_only_expired_and_revoked_rows(app):
+    with app.app_context():
+        user_id = User.query.filter_by(email=ADMIN["email"]).one().id
+        now = datetime.utcnow()
+        RefreshToken.query.delete()
+        for jti, expires_at in [("live", now + timedelta(days=1)), ("expired-1", now - timedelta(seconds=1)),
+                                ("expired-2", now - timedelta(days=3)), ("revoked", now + timedelta(days=1))]:
+            RefreshTokenService.add(user_id, jti, expires_at)
+        db.session.commit()
+        assert RefreshTokenService.revoke("revoked")
+        assert not RefreshTokenService.revoke("revoked")
+
+        assert RefreshTokenService.purge(batch_size=1) == 3
+        remaining = [token.token_hash for token in RefreshToken.query]
+        assert remaining == [RefreshToken.hash_token("live")]
+        assert RefreshTokenService.is_active("live", user_id)
+        assert not RefreshTokenService.is_active("expired-1", user_id)
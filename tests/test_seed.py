@@ -0,0 +1,96 @@
+# tests/test_seed.py
+import pytest
+from app.extensions import db
+from app.models.category import Category
+from app.models.product import Product
+from app.models.table_version import TableVersion
+from app.models.user import User
+from app.seed import parse_range, seed_data
+
+
+def seed(app, *args):
+    # Commands are registered only under the flask CLI, so invoke it directly
+    result = app.test_cli_runner().invoke(seed_data, list(args))
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def generated(first_id: int) -> list:
+    """What a seeded run drew for each product, leaving out the id-derived name and the clock"""
+    rows = Product.query.filter(Product.id >= first_id).order_by(Product.id)
+    return [(product.price, product.rating_rate, product.rating_count, product.category_id,
+             product.tags[1:], product.colors) for product in rows]
+
+
+def index_names():
+    return set(db.session.execute(db.text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars())
+
+
+def test_seed_data_adds_products_categories_and_users(app):
+    with app.app_context():
+        products, categories = Product.query.count(), Category.query.count()
+        users, indexes = User.query.count(), index_names()
+
+    output = seed(app, "--products", "250", "--categories", "3", "--users", "4", "--chunk-size", "100",
+                  "--seed", "1")
+    assert "Seeded 250 products, 3 categories and 4 users" in output
+
+    with app.app_context():
+        assert Product.query.count() == products + 250
+        assert Category.query.count() == categories + 3
+        assert User.query.count() == users + 4
+        # Indexes dropped for the load are all rebuilt
+        assert index_names() == indexes
+        newest = Product.query.order_by(Product.id.desc()).first()
+        assert newest.tags and newest.colors
+        assert User.query.filter_by(email=f"seed{users + 1}@example.com").one().check_password("password123")
+
+
+def test_the_same_seed_generates_the_same_catalog(app):
+    with app.app_context():
+        first = (db.session.query(db.func.max(Product.id)).scalar() or 0) + 1
+    seed(app, "--products", "40", "--seed", "7")
+    with app.app_context():
+        second = db.session.query(db.func.max(Product.id)).scalar() + 1
+    seed(app, "--products", "40", "--seed", "7")
+    seed(app, "--products", "40", "--seed", "8")
+
+    with app.app_context():
+        runs = [generated(start)[:40] for start in (first, second, second + 40)]
+    assert runs[0] == runs[1]
+    assert runs[0] != runs[2]
+
+
+def test_seeded_products_are_searchable_and_listed(app, login):
+    client = app.test_client()
+    headers = login(client)
+    with app.app_context():
+        before = TableVersion.current("products", "categories")
+    # Cached before the load, so a stale list would show up below
+    listed = len(client.get("/api/v1/products/", headers=headers).get_json()["products"])
+
+    seed(app, "--products", "30", "--seed", "3")
+
+    with app.app_context():
+        after = TableVersion.current("products", "categories")
+        assert all(after[name][0] > before[name][0] for name in after)
+        newest = db.session.get(Product, db.session.query(db.func.max(Product.id)).scalar())
+        newest_id, newest_name = newest.id, newest.name
+    assert len(client.get("/api/v1/products/", headers=headers).get_json()["products"]) == listed + 30
+    found = client.get("/api/v1/products/", query_string={"search": newest_name}, headers=headers)
+    assert newest_id in [product["id"] for product in found.get_json()["products"]]
+
+
+def test_default_seed_is_idempotent(app):
+    with app.app_context():
+        products = Product.query.count()
+    assert "Default data seeded" in seed(app)
+    with app.app_context():
+        assert Product.query.count() == products
+
+
+def test_parse_range():
+    assert parse_range("1-4") == (1, 4)
+    assert parse_range("2") == (2, 2)
+    with pytest.raises(ValueError):
+        parse_range("4-1")
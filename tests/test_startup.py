@@ -0,0 +1,29 @@
+# tests/test_startup.py
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OPTIONAL = ["alembic", "flask_migrate", "app.utils.metrics", "app.utils.profiler", "app.blueprints.metrics"]
+
+
+def loaded_modules(**env) -> list:
+    """The OPTIONAL modules a fresh interpreter has imported after create_app()"""
+    code = (
+        "import json, sys, app; app.create_app(); "
+        f"print(json.dumps([name for name in {OPTIONAL!r} if name in sys.modules]))"
+    )
+    environment = {key: value for key, value in os.environ.items() if key != "FLASK_RUN_FROM_CLI"}
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env={**environment, **env},
+                            capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def test_web_worker_skips_optional_modules():
+    assert loaded_modules() == []
+
+
+def test_enabled_features_are_loaded():
+    loaded = loaded_modules(METRICS_ENABLED="true", SQL_PROFILER_ENABLED="true")
+    assert loaded == ["app.utils.metrics", "app.utils.profiler", "app.blueprints.metrics"]
@@ -0,0 +1,73 @@
+# tests/test_streaming.py
+import json
+import pytest
+from app.extensions import db
+from app.models.product import Product
+from app.models.user import User
+from app.services.product_service import ProductService
+from app.utils.streaming import stream_json_list
+
+
+@pytest.fixture
+def many_products(app):
+    with app.app_context():
+        uploader_id = User.query.filter_by(email="admin@gmail.com").one().id
+        for number in range(12):
+            ProductService.create_product(
+                name=f"Streamed {number}", price=1 + number, colors=["Black"],
+                tags=["streamed"] if number % 2 else [], category_name="Laptops", uploader_id=uploader_id
+            )
+
+
+@pytest.mark.parametrize("filters", [{}, {"category": "Laptops"}, {"tag": "streamed"}, {"search": "streamed"}])
+def test_streamed_list_matches_the_buffered_one(app, many_products, login, filters):
+    client = app.test_client()
+    headers = login(client)
+
+    buffered = client.get("/api/v1/products/", query_string=filters, headers=headers).get_json()
+    response = client.get("/api/v1/products/", query_string={**filters, "stream": "true"}, headers=headers)
+    assert response.status_code == 200
+    streamed = json.loads(response.get_data())
+
+    if "search" in filters:
+        # Streams are newest-first rather than relevance-ranked
+        key = lambda product: product["id"]
+        assert sorted(streamed["products"], key=key) == sorted(buffered["products"], key=key)
+    else:
+        assert streamed == buffered
+    assert streamed["products"]
+
+
+def test_iter_products_reads_in_batches(app, many_products):
+    with app.app_context():
+        expected = [product.id for product in ProductService.get_all_products()]
+        db.session.expunge_all()
+        seen = []
+        for product in ProductService.iter_products(batch_size=5):
+            seen.append(product.id)
+            # Earlier batches have been released from the session
+            held = [row for row in db.session.identity_map.values() if isinstance(row, Product)]
+            assert len(held) <= 5
+        assert seen == expected
+        assert len(seen) > 5
+
+
+def test_stream_rejects_paging(app, login):
+    client = app.test_client()
+    response = client.get("/api/v1/products/", query_string={"stream": "true", "limit": 5},
+                          headers=login(client))
+    assert response.status_code == 400
+
+
+def test_stream_json_list_chunks_and_truncates_on_error():
+    chunks = list(stream_json_list("items", range(100), lambda item: {"n": item}, chunk_size=64))
+    assert len(chunks) > 1
+    assert json.loads("".join(chunks)) == {"items": [{"n": item} for item in range(100)]}
+
+    def failing():
+        yield 1
+        raise RuntimeError("lost the connection")
+
+    body = "".join(stream_json_list("items", failing(), lambda item: item))
+    with pytest.raises(ValueError):
+        json.loads(body)
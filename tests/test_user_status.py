@@ -0,0 +1,31 @@
+# tests/test_user_status.py
+import time
+from app.services.auth_service import AuthService
+from app.services.cache_service import LocalCache, MemorySharedCache, TwoTierCache, user_key
+
+LOCAL_TTL = 0.05
+
+
+def test_deactivation_applies_on_another_app_instance(make_app, login):
+    # Two workers of one deployment: same database, same shared cache tier
+    shared = MemorySharedCache()
+    first, second = make_app(), make_app()
+    for app in (first, second):
+        app.extensions['cache'] = TwoTierCache(LocalCache(ttl=LOCAL_TTL), shared)
+
+    with first.app_context():
+        user_id = AuthService.register_user("Jane", "jane@example.com", "secret123").id
+    user_headers = login(second.test_client(), "jane@example.com", "secret123")
+    assert second.test_client().get("/api/v1/auth/me", headers=user_headers).status_code == 200
+    stale = second.extensions['cache'].local.get(user_key(user_id))
+    assert stale is not None and stale['user']['is_active']
+
+    admin_headers = login(first.test_client())
+    response = first.test_client().post(f"/api/v1/auth/users/{user_id}/deactivate", headers=admin_headers)
+    assert response.status_code == 200
+
+    # A worker that loaded the status just before the write puts it back in the
+    # shared tier; status must not be read from there
+    shared.set(user_key(user_id), stale)
+    time.sleep(LOCAL_TTL * 2)
+    assert second.test_client().get("/api/v1/auth/me", headers=user_headers).status_code == 401